@@ -0,0 +1,5 @@
+"""
+Benchmark suite for the skeleton project.
+
+Run ``python -m benchmarks --help`` (or ``make bench``) for usage.
+"""
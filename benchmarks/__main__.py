@@ -0,0 +1,103 @@
+"""
+Command-line entry point: ``python -m benchmarks``.
+"""
+
+import argparse
+import fnmatch
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from . import (  # noqa: F401
+    bench_cli,
+    bench_config,
+    bench_core,
+    bench_logging,
+    bench_project_generator,
+)
+from .runner import (
+    BENCHMARKS,
+    compare_reports,
+    format_report,
+    load_report,
+    run_benchmarks,
+    save_report,
+)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the benchmark argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run the skeleton project benchmarks",
+    )
+    parser.add_argument(
+        "-k",
+        dest="patterns",
+        action="append",
+        metavar="PATTERN",
+        help="Only run benchmarks matching this glob (repeatable)",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=3, help="Untimed calls per benchmark (default: 3)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Timed calls per benchmark (default: 20)"
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write the JSON report to this file"
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        type=Path,
+        metavar=("OLD", "NEW"),
+        help="Compare two saved reports instead of running benchmarks",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List available benchmarks and exit"
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run or compare benchmarks."""
+    args = create_parser().parse_args(argv)
+
+    if args.compare:
+        old, new = (load_report(path) for path in args.compare)
+        print(compare_reports(old, new))
+        return 0
+
+    names = sorted(BENCHMARKS)
+    if args.patterns:
+        names = [
+            name for name in names
+            if any(fnmatch.fnmatch(name, pattern) for pattern in args.patterns)
+        ]
+
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    if bench_project_generator.ProjectGenerator is None:
+        print(
+            "skeleton.project_generator is not available; "
+            "skipping project_generator benchmarks",
+            file=sys.stderr,
+        )
+
+    if not names:
+        print("No benchmarks selected", file=sys.stderr)
+        return 1
+
+    report = run_benchmarks(names, warmup=args.warmup, repeat=args.repeat)
+    print(format_report(report))
+    if args.output:
+        save_report(report, args.output)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
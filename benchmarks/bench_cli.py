@@ -0,0 +1,26 @@
+"""
+Benchmarks for the command-line interface.
+"""
+
+import contextlib
+import logging
+import os
+from typing import Any, Callable, Iterator
+
+from skeleton.cli import main
+
+from .runner import benchmark
+
+
+@benchmark("cli.main")
+def bench_main() -> Iterator[Callable[[], Any]]:
+    """Run cli.main([]) end to end with console output discarded."""
+    with open(os.devnull, "w") as devnull:
+        def run() -> int:
+            with contextlib.redirect_stdout(devnull):
+                return main([])
+
+        try:
+            yield run
+        finally:
+            logging.getLogger().handlers.clear()
@@ -0,0 +1,58 @@
+"""
+Benchmarks for configuration loading.
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+from skeleton.config import load_config_file
+
+from .runner import benchmark
+
+# Number of sections in the generated config (about 2 MiB of JSON)
+_SECTIONS = 2000
+
+
+def _write_large_config(directory: Path) -> Path:
+    """Write a config shaped like a large real-world settings file."""
+    config: Dict[str, Any] = {
+        f"section_{i}": {
+            "enabled": i % 2 == 0,
+            "name": f"Section number {i}",
+            "weight": i / 7,
+            "tags": [f"tag-{i}-{j}" for j in range(10)],
+            "limits": {"min": i, "max": i * 10, "step": 0.5},
+            "description": "x" * 800,
+        }
+        for i in range(_SECTIONS)
+    }
+    path = directory / "config.json"
+    path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+    return path
+
+
+@benchmark("config.load_cold", number=5)
+def bench_load_cold() -> Iterator[Callable[[], Any]]:
+    """Parse a large JSON config without the parsed-config cache."""
+    directory = Path(tempfile.mkdtemp(prefix="bench-config-"))
+    try:
+        path = _write_large_config(directory)
+        yield lambda: load_config_file(path, use_cache=False)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@benchmark("config.load_warm", number=5)
+def bench_load_warm() -> Iterator[Callable[[], Any]]:
+    """Load an unchanged large JSON config from the parsed-config cache."""
+    directory = Path(tempfile.mkdtemp(prefix="bench-config-"))
+    try:
+        path = _write_large_config(directory)
+        cache_dir = directory / "cache"
+        load_config_file(path, cache_dir)
+        yield lambda: load_config_file(path, cache_dir)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,31 @@
+"""
+Benchmarks for SkeletonApp.
+"""
+
+from typing import Any, Callable, Iterator
+
+from skeleton.config import LayeredConfig
+from skeleton.core import SkeletonApp
+
+from .runner import benchmark
+
+
+@benchmark("core.construct", number=1000)
+def bench_construct() -> Iterator[Callable[[], Any]]:
+    """Construct an app from a plain dictionary."""
+    config = {"app_name": "Bench", "debug": False}
+    yield lambda: SkeletonApp(config)
+
+
+@benchmark("core.construct_shared_config", number=1000)
+def bench_construct_shared() -> Iterator[Callable[[], Any]]:
+    """Construct an app from a shared LayeredConfig."""
+    config = LayeredConfig.from_layers(cli={"app_name": "Bench"})
+    yield lambda: SkeletonApp(config)
+
+
+@benchmark("core.run", number=100)
+def bench_run() -> Iterator[Callable[[], Any]]:
+    """Run the default main logic."""
+    app = SkeletonApp()
+    yield app.run
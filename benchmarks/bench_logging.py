@@ -0,0 +1,102 @@
+"""
+Benchmarks for log record formatting.
+
+Each call handles one record, so records per second is the ops/s
+column of the report.
+"""
+
+import contextlib
+import io
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from skeleton.flight_recorder import FlightRecorder
+from skeleton.log_limits import RateLimitFilter, gate_log_calls
+from skeleton.utils import DEFAULT_FORMAT, JsonFormatter, log_context
+
+from .runner import benchmark
+
+
+def _record() -> logging.LogRecord:
+    """Build a record like the ones SkeletonApp.run() logs."""
+    return logging.LogRecord(
+        "skeleton.core", logging.INFO, __file__, 1,
+        "Starting %s v%s", ("Skeleton Project", "0.1.0"), None,
+    )
+
+
+@benchmark("logging.format_text", number=10000)
+def bench_format_text() -> Iterator[Callable[[], Any]]:
+    """Format a record with the default text format."""
+    formatter = logging.Formatter(DEFAULT_FORMAT)
+    record = _record()
+    yield lambda: formatter.format(record)
+
+
+@benchmark("logging.format_json", number=10000)
+def bench_format_json() -> Iterator[Callable[[], Any]]:
+    """Format a record as JSON with static and per-run context fields."""
+    formatter = JsonFormatter({"host": "bench"})
+    record = _record()
+    with log_context(app="Skeleton Project", version="0.1.0", run_id=1):
+        yield lambda: formatter.format(record)
+
+
+@contextlib.contextmanager
+def _hot_logger(rate_filter: Optional[RateLimitFilter]) -> Iterator[logging.Logger]:
+    """Logger writing to a discarded stream, optionally rate limited."""
+    logger = logging.getLogger("bench.hot_loop")
+    handler = logging.StreamHandler(io.StringIO())
+    if rate_filter is not None:
+        handler.addFilter(rate_filter)
+    gate_log_calls(rate_filter)
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    try:
+        yield logger
+    finally:
+        gate_log_calls(None)
+        logger.removeHandler(handler)
+        logger.propagate = True
+        logger.setLevel(logging.NOTSET)
+
+
+@benchmark("logging.disabled_call", number=10000)
+def bench_disabled_call() -> Iterator[Callable[[], Any]]:
+    """Log below the logger level: the floor for a suppressed call."""
+    with _hot_logger(None) as logger:
+        yield lambda: logger.debug("tick %d", 1)
+
+
+@benchmark("logging.suppressed_call", number=10000)
+def bench_suppressed_call() -> Iterator[Callable[[], Any]]:
+    """Log from a call site whose rate limit is exhausted."""
+    rate_filter = RateLimitFilter(rate=1e-9, burst=1)
+    with _hot_logger(rate_filter) as logger:
+        logger.info("tick %d", 0)
+        yield lambda: logger.info("tick %d", 1)
+
+
+@benchmark("logging.written_call", number=10000)
+def bench_written_call() -> Iterator[Callable[[], Any]]:
+    """Log a record that is formatted and written."""
+    with _hot_logger(None) as logger:
+        yield lambda: logger.info("tick %d", 1)
+
+
+@benchmark("logging.flight_recorded_call", number=10000)
+def bench_flight_recorded_call() -> Iterator[Callable[[], Any]]:
+    """Log a DEBUG record that only the flight recorder keeps."""
+    with tempfile.TemporaryDirectory() as tmp, _hot_logger(None) as logger:
+        recorder = FlightRecorder(Path(tmp) / "flight-recorder.bin")
+        logger.addHandler(recorder)
+        logger.setLevel(logging.DEBUG)
+        logger.handlers[0].setLevel(logging.WARNING)
+        try:
+            yield lambda: logger.debug("tick %d", 1)
+        finally:
+            logger.removeHandler(recorder)
+            recorder.close()
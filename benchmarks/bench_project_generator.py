@@ -0,0 +1,78 @@
+"""
+Benchmarks for ProjectGenerator.generate_project.
+
+The feature combinations mirror tests/test_project_generator.py.
+"""
+
+import itertools
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator
+
+from .runner import benchmark
+
+try:
+    from skeleton.project_generator import ProjectGenerator
+except ImportError:
+    # The generator is optional; its benchmarks are skipped without it
+    ProjectGenerator = None
+
+_NO_FEATURES = {
+    "cli": False,
+    "gui": False,
+    "tests": False,
+    "executable": False,
+    "pypi_packaging": False,
+    "dev_requirements": False,
+    "license": False,
+    "readme": False,
+    "makefile": False,
+    "gitignore": False,
+    "github_actions": False,
+}
+
+FEATURE_SETS: Dict[str, Dict[str, bool]] = {
+    "minimal": {**_NO_FEATURES, "pypi_packaging": True},
+    "cli": {**_NO_FEATURES, "cli": True},
+    "gui": {**_NO_FEATURES, "gui": True},
+    "tests": {**_NO_FEATURES, "tests": True},
+    "license": {**_NO_FEATURES, "license": True},
+    "readme": {**_NO_FEATURES, "cli": True, "gui": True, "tests": True, "readme": True},
+}
+
+METADATA = {
+    "description": "A benchmark project",
+    "author": "Bench Author",
+    "email": "bench@example.com",
+    "version": "0.1.0",
+    "url": "https://github.com/bench/bench_project",
+    "license_type": "MIT",
+}
+
+
+def _register(label: str, features: Dict[str, bool]) -> None:
+    """Register a generate_project benchmark for one feature set."""
+    @benchmark(f"project_generator.{label}")
+    def bench_generate() -> Iterator[Callable[[], Any]]:
+        generator = ProjectGenerator()
+        output_dir = Path(tempfile.mkdtemp())
+        counter = itertools.count()
+
+        def generate() -> Any:
+            return generator.generate_project(
+                project_name=f"bench_project_{next(counter)}",
+                output_dir=output_dir,
+                features=features,
+                metadata=METADATA,
+            )
+
+        try:
+            yield generate
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if ProjectGenerator is not None:
+    for _label, _features in FEATURE_SETS.items():
+        _register(_label, _features)
@@ -0,0 +1,236 @@
+"""
+Benchmark registry, timing and reporting.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import (
+    Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+)
+
+# A benchmark is a generator function: it performs its setup, yields the
+# callable to time, and cleans up after the yield when it is closed.
+BenchmarkFactory = Callable[[], Iterator[Callable[[], Any]]]
+
+
+class Benchmark(NamedTuple):
+    """A registered benchmark."""
+
+    factory: BenchmarkFactory
+    number: int
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+PERCENTILES = (50, 90, 99)
+
+
+def benchmark(
+    name: str, number: int = 1
+) -> Callable[[BenchmarkFactory], BenchmarkFactory]:
+    """
+    Register a benchmark under ``name``.
+
+    Args:
+        name: Dotted benchmark name, e.g. ``core.run``
+        number: Calls per timed sample; raise it for operations too
+            fast to time individually
+
+    Returns:
+        Decorator registering the benchmark factory
+    """
+    def register(factory: BenchmarkFactory) -> BenchmarkFactory:
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        BENCHMARKS[name] = Benchmark(factory, number)
+        return factory
+    return register
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """
+    Compute a percentile with linear interpolation.
+
+    Args:
+        samples: Non-empty sequence of samples
+        q: Percentile between 0 and 100
+
+    Returns:
+        Interpolated percentile value
+    """
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure(
+    func: Callable[[], Any], warmup: int = 3, repeat: int = 20, number: int = 1
+) -> Dict[str, Any]:
+    """
+    Time repeated calls of ``func``.
+
+    Args:
+        func: Callable to time
+        warmup: Untimed samples taken first
+        repeat: Timed samples
+        number: Calls per sample
+
+    Returns:
+        Dictionary of per-call timing statistics in seconds plus the
+        raw samples
+    """
+    if repeat < 1:
+        raise ValueError(f"Invalid repeat count: {repeat}")
+
+    calls = range(number)
+    for _ in range(warmup):
+        for _ in calls:
+            func()
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in calls:
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    stats: Dict[str, Any] = {
+        "repeat": repeat,
+        "number": number,
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if repeat > 1 else 0.0,
+    }
+    for q in PERCENTILES:
+        stats[f"p{q}"] = percentile(samples, q)
+    stats["samples"] = samples
+    return stats
+
+
+def run_benchmarks(
+    names: Optional[Sequence[str]] = None, warmup: int = 3, repeat: int = 20
+) -> Dict[str, Any]:
+    """
+    Run registered benchmarks.
+
+    Args:
+        names: Benchmarks to run (defaults to all registered ones)
+        warmup: Untimed calls per benchmark
+        repeat: Timed calls per benchmark
+
+    Returns:
+        Report with environment metadata and per-benchmark statistics
+    """
+    results: Dict[str, Any] = {}
+    for name in names if names is not None else sorted(BENCHMARKS):
+        factory, number = BENCHMARKS[name]
+        bench = factory()
+        try:
+            func = next(bench)
+            results[name] = measure(
+                func, warmup=warmup, repeat=repeat, number=number
+            )
+        finally:
+            bench.close()
+    return {"meta": _metadata(warmup, repeat), "results": results}
+
+
+def save_report(report: Dict[str, Any], path: Path) -> None:
+    """Write a benchmark report as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    """Read a benchmark report written by save_report()."""
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Format a report as a table of percentiles in milliseconds and the
+    median rate in calls per second.
+
+    Args:
+        report: Report from run_benchmarks()
+
+    Returns:
+        Table text
+    """
+    header = (
+        f"{'benchmark':<40} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} "
+        f"{'ops/s':>12}"
+    )
+    lines = [header, "-" * len(header)]
+    for name, stats in report["results"].items():
+        rate = 1 / stats["p50"] if stats["p50"] > 0 else float("inf")
+        lines.append(
+            f"{name:<40} {stats['p50'] * 1e3:>10.3f} "
+            f"{stats['p90'] * 1e3:>10.3f} {stats['p99'] * 1e3:>10.3f} "
+            f"{rate:>12,.0f}"
+        )
+    return "\n".join(lines)
+
+
+def compare_reports(old: Dict[str, Any], new: Dict[str, Any]) -> str:
+    """
+    Compare the median timings of two reports.
+
+    Args:
+        old: Baseline report
+        new: Report to compare against the baseline
+
+    Returns:
+        Table with the relative change of every common benchmark
+    """
+    header = f"{'benchmark':<40} {'old p50 ms':>11} {'new p50 ms':>11} {'change':>9}"
+    lines = [
+        f"old: {old['meta'].get('commit') or 'unknown'}  "
+        f"new: {new['meta'].get('commit') or 'unknown'}",
+        header,
+        "-" * len(header),
+    ]
+    for name in sorted(set(old["results"]) & set(new["results"])):
+        before = old["results"][name]["p50"]
+        after = new["results"][name]["p50"]
+        change = (after - before) / before * 100 if before else 0.0
+        lines.append(
+            f"{name:<40} {before * 1e3:>11.3f} {after * 1e3:>11.3f} "
+            f"{change:>+8.1f}%"
+        )
+    return "\n".join(lines)
+
+
+def _metadata(warmup: int, repeat: int) -> Dict[str, Any]:
+    """Describe the environment a report was produced in."""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "commit": _git_commit(),
+        "warmup": warmup,
+        "repeat": repeat,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current git commit, if available."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
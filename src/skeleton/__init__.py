@@ -4,11 +4,58 @@ Python Skeleton Project
 A template Python project ready for PyPI distribution and executable packaging.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .core import SkeletonApp
-from .utils import get_version, setup_logging
+# Public names and the submodules defining them. They are imported on
+# first access (PEP 562), so ``import skeleton`` and ``skeleton-cli
+# --version`` do not pay for asyncio, logging and the rest of core.
+_LAZY_EXPORTS = {
+    "BlobCache": "cache",
+    "LayeredConfig": "config",
+    "Pipeline": "pipeline",
+    "ResultCache": "result_cache",
+    "RunResult": "core",
+    "SkeletonApp": "core",
+    "gather_runs": "core",
+    "get_version": "utils",
+    "setup_logging": "utils",
+}
+
+if TYPE_CHECKING:
+    from .cache import BlobCache
+    from .config import LayeredConfig
+    from .core import RunResult, SkeletonApp, gather_runs
+    from .pipeline import Pipeline
+    from .result_cache import ResultCache
+    from .utils import get_version, setup_logging
+
+__all__ = [
+    "BlobCache",
+    "LayeredConfig",
+    "Pipeline",
+    "ResultCache",
+    "RunResult",
+    "SkeletonApp",
+    "gather_runs",
+    "get_version",
+    "setup_logging",
+]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["SkeletonApp", "get_version", "setup_logging"] 
\ No newline at end of file
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,102 @@
+"""
+Streaming batch mode: NDJSON job configs in, NDJSON results out.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, TextIO, Type
+
+from .config import LayeredConfig
+from .core import SkeletonApp
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(
+    lines: Iterable[str],
+    output: TextIO,
+    base_config: Optional[Mapping[str, Any]] = None,
+    jobs: Optional[int] = None,
+    ordered: bool = False,
+    app_cls: Type[SkeletonApp] = SkeletonApp,
+) -> int:
+    """
+    Run one job per input line and write one result line per job.
+
+    Every non-blank line must be a JSON object; it becomes the ``job``
+    layer on top of ``base_config``. Jobs run on app_cls.run_many(), so
+    input is read lazily and only a bounded window of jobs is in flight
+    or held back for ordering, however long the input is.
+
+    Each result is written and flushed as soon as it is available::
+
+        {"line": 3, "exit_code": 0, "result": "..."}
+
+    Lines that are not JSON objects are reported right away as
+    ``{"line": 4, "error": "..."}`` and not run. Line numbers start at 1
+    and count every input line. Results that JSON cannot represent are
+    written with ``repr()``. A job whose outcome could not be received
+    from its worker, e.g. because its result cannot be pickled, gets an
+    ``"error"`` key as well, and the other jobs carry on.
+
+    Args:
+        lines: Input lines, typically sys.stdin
+        output: Stream receiving the result lines
+        base_config: Configuration shared by every job
+        jobs: Number of worker processes (defaults to CPU count)
+        ordered: Write results in input order instead of completion
+            order
+        app_cls: Application class running the jobs
+
+    Returns:
+        0 if every line was valid and every job succeeded, 1 otherwise
+    """
+    base = base_config
+    if not isinstance(base, LayeredConfig):
+        base = LayeredConfig({"config": base or {}})
+
+    # Input line of each job that has been read but not written yet;
+    # bounded by the run_many() window
+    line_numbers: Dict[int, int] = {}
+    failed = False
+
+    def configs() -> Iterator[LayeredConfig]:
+        nonlocal failed
+        index = 0
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job config must be a JSON object")
+            except ValueError as e:
+                failed = True
+                logger.warning(
+                    "Skipping invalid job on line %d: %s", line_number, e
+                )
+                _write(output, {"line": line_number, "error": str(e)})
+                continue
+            line_numbers[index] = line_number
+            index += 1
+            yield base.with_layer("job", job)
+
+    for run_result in app_cls.run_many(configs(), workers=jobs, ordered=ordered):
+        line_number = line_numbers.pop(run_result.index)
+        if run_result.exit_code != 0:
+            failed = True
+        record = {
+            "line": line_number,
+            "exit_code": run_result.exit_code,
+            "result": run_result.result,
+        }
+        if run_result.error is not None:
+            record["error"] = run_result.error
+        _write(output, record)
+    return 1 if failed else 0
+
+
+def _write(output: TextIO, record: Dict[str, Any]) -> None:
+    """Write one NDJSON record and flush it."""
+    output.write(json.dumps(record, default=repr) + "\n")
+    output.flush()
@@ -0,0 +1,374 @@
+"""
+Content-addressed blob store under the application data directory.
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import REGISTRY
+from .utils import get_app_data_dir, write_atomic
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Store metrics, shared by every BlobCache in the process
+CACHE_HITS_TOTAL = REGISTRY.counter(
+    "skeleton_blob_cache_hits_total", "Number of blob cache lookups that hit"
+)
+CACHE_MISSES_TOTAL = REGISTRY.counter(
+    "skeleton_blob_cache_misses_total", "Number of blob cache lookups that missed"
+)
+CACHE_EVICTED_BYTES_TOTAL = REGISTRY.counter(
+    "skeleton_blob_cache_evicted_bytes_total",
+    "Number of bytes removed from the blob cache by eviction sweeps",
+)
+CACHE_BYTES = REGISTRY.gauge(
+    "skeleton_blob_cache_bytes", "Size of the blob cache after the last sweep"
+)
+
+# Lock stripes serializing get_or_compute() for the same key
+_KEY_LOCKS = 64
+# Temporary files older than this are left over from crashed writers
+_STALE_TMP_SECONDS = 3600.0
+
+
+class BlobCache:
+    """
+    Content-addressed store of byte blobs, shared between processes.
+
+    Blobs are stored once under the SHA-256 digest of their contents, in
+    ``objects/ab/cdef...``; keys map to digests through small files in
+    ``refs/``, so equal results stored under different keys take up the
+    space of one. Every file is written to a temporary name and renamed
+    into place, so readers never see a partial blob and need no locks.
+
+    When the store grows past ``max_bytes``, a sweep deletes the least
+    recently read blobs until it is below ``low_water`` of that size.
+    Writers hold a shared lock and the sweep an exclusive one, so a blob
+    is never deleted between being written and being referenced. File
+    locks use flock(2); on platforms without it, only the rename
+    guarantees hold.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+        low_water: float = 0.9,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Store directory (defaults to ``blob-cache`` under
+                the application data directory)
+            max_bytes: Size above which a put() starts an eviction sweep
+            low_water: Fraction of ``max_bytes`` a sweep shrinks the
+                store to, so that not every put() sweeps
+        """
+        if max_bytes < 1:
+            raise ValueError(f"Invalid cache size: {max_bytes}")
+        if not 0 < low_water <= 1:
+            raise ValueError(f"Invalid cache low water mark: {low_water}")
+        if directory is None:
+            directory = get_app_data_dir() / "blob-cache"
+
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.logger = logging.getLogger(__name__)
+        for name in ("objects", "refs", "locks", "tmp"):
+            (self.directory / name).mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Estimate of the store size; other processes write too, so a
+        # sweep recounts it
+        self._bytes: Optional[int] = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "puts": 0,
+            "evictions": 0,
+            "bytes_evicted": 0,
+        }
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get the blob stored under a key.
+
+        Args:
+            key: Any string, e.g. from make_cache_key()
+
+        Returns:
+            Blob contents, or None on a miss
+        """
+        data = self._lookup(key)
+        self._count(data is not None)
+        return data
+
+    def put(self, key: str, data: bytes) -> str:
+        """
+        Store a blob under a key, replacing what the key referred to.
+
+        Args:
+            key: Any string, e.g. from make_cache_key()
+            data: Blob contents
+
+        Returns:
+            Hex SHA-256 digest of the blob
+        """
+        with self._locked(self.directory / "locks" / "store", shared=True):
+            digest, written = self._store_blob(data)
+            write_atomic(
+                self._ref_path(key), digest.encode("ascii"), self.directory / "tmp"
+            )
+        # A blob that was already stored takes up no more space
+        self._after_put(len(data) if written else 0)
+        return digest
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> bytes:
+        """
+        Get the blob stored under a key, computing and storing it on a miss.
+
+        Concurrent callers for the same key, in this or other processes,
+        wait for the first one instead of all computing the blob.
+
+        Args:
+            key: Any string, e.g. from make_cache_key()
+            compute: Function producing the blob
+
+        Returns:
+            Blob contents
+        """
+        data = self._lookup(key)
+        if data is None:
+            with self._locked(self._key_lock_path(key)):
+                data = self._lookup(key)
+                if data is None:
+                    self._count(False)
+                    data = compute()
+                    self.put(key, data)
+                    return data
+        self._count(True)
+        return data
+
+    def get_blob(self, digest: str) -> Optional[bytes]:
+        """
+        Get a blob by its digest.
+
+        Args:
+            digest: Hex SHA-256 digest returned by put()
+
+        Returns:
+            Blob contents, or None if it is not (or no longer) stored
+        """
+        data = self._read_blob(digest)
+        self._count(data is not None)
+        return data
+
+    def sweep(self) -> int:
+        """
+        Delete least recently read blobs until the store fits.
+
+        Also removes references to deleted blobs and temporary files
+        left behind by crashed writers.
+
+        Returns:
+            Number of bytes evicted
+        """
+        with self._locked(self.directory / "locks" / "store"):
+            blobs = []
+            for path in self._blob_paths():
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((st.st_atime, st.st_size, path))
+            blobs.sort()
+
+            total = sum(size for _, size, _ in blobs)
+            target = total
+            if total > self.max_bytes:
+                target = int(self.max_bytes * self.low_water)
+            evicted = count = 0
+            for _, size, path in blobs:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += size
+                count += 1
+            if count:
+                self._prune_refs()
+            self._prune_tmp()
+
+        with self._lock:
+            self._bytes = total
+            self._stats["evictions"] += count
+            self._stats["bytes_evicted"] += evicted
+        CACHE_EVICTED_BYTES_TOTAL.inc(evicted)
+        CACHE_BYTES.set(total)
+        if count:
+            self.logger.debug(
+                "Evicted %d blobs (%d bytes) from the cache", count, evicted
+            )
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every blob and reference."""
+        with self._locked(self.directory / "locks" / "store"):
+            for path in list(self._blob_paths()) + list(self._ref_paths()):
+                path.unlink(missing_ok=True)
+        with self._lock:
+            self._bytes = 0
+        CACHE_BYTES.set(0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics of this instance.
+
+        Returns:
+            Dictionary with hit, miss and eviction counts, the hit rate
+            and the bytes evicted
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _count(self, hit: bool) -> None:
+        """Record the outcome of a lookup."""
+        with self._lock:
+            self._stats["hits" if hit else "misses"] += 1
+        (CACHE_HITS_TOTAL if hit else CACHE_MISSES_TOTAL).inc()
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        """Resolve a key and read its blob without counting the lookup."""
+        ref_path = self._ref_path(key)
+        try:
+            digest = ref_path.read_text("ascii").strip()
+        except FileNotFoundError:
+            return None
+        data = self._read_blob(digest)
+        if data is None:
+            # The blob was evicted, but a put() may have pointed the key
+            # at a new blob since; look again while no put() is running
+            with self._locked(self.directory / "locks" / "store"):
+                try:
+                    digest = ref_path.read_text("ascii").strip()
+                except FileNotFoundError:
+                    return None
+                data = self._read_blob(digest)
+                if data is None:
+                    ref_path.unlink(missing_ok=True)
+        return data
+
+    def _read_blob(self, digest: str) -> Optional[bytes]:
+        """Read and verify a blob, marking it as recently used."""
+        path = self._blob_path(digest)
+        try:
+            data = path.read_bytes()
+            # Reading counts as a use for LRU eviction
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except FileNotFoundError:
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            self.logger.warning("Discarding corrupted cache blob %s", digest)
+            path.unlink(missing_ok=True)
+            return None
+        return data
+
+    def _store_blob(self, data: bytes) -> Tuple[str, bool]:
+        """Write a blob unless already stored; get its digest and if it was new."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(exist_ok=True)
+            write_atomic(path, data, self.directory / "tmp")
+            return digest, True
+        return digest, False
+
+    def _after_put(self, size: int) -> None:
+        """Update the size estimate and sweep if the store is too big."""
+        with self._lock:
+            self._stats["puts"] += 1
+            if self._bytes is None:
+                self._bytes = self._scan_bytes()
+            else:
+                self._bytes += size
+            too_big = self._bytes > self.max_bytes
+        if too_big:
+            self.sweep()
+
+    def _scan_bytes(self) -> int:
+        """Sum the size of all blobs."""
+        total = 0
+        for path in self._blob_paths():
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _prune_refs(self) -> None:
+        """Remove references to blobs that no longer exist."""
+        for ref_path in self._ref_paths():
+            try:
+                digest = ref_path.read_text("ascii").strip()
+            except FileNotFoundError:
+                continue
+            if not self._blob_path(digest).exists():
+                ref_path.unlink(missing_ok=True)
+
+    def _prune_tmp(self) -> None:
+        """Remove temporary files of writers that died mid-write."""
+        cutoff = time.time() - _STALE_TMP_SECONDS
+        for path in (self.directory / "tmp").iterdir():
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _blob_path(self, digest: str) -> Path:
+        """Get the path of a blob."""
+        return self.directory / "objects" / digest[:2] / digest[2:]
+
+    def _ref_path(self, key: str) -> Path:
+        """Get the path of the reference file of a key."""
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / "refs" / name
+
+    def _key_lock_path(self, key: str) -> Path:
+        """Get the lock file guarding computation of a key."""
+        stripe = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16)
+        return self.directory / "locks" / f"key-{stripe % _KEY_LOCKS}"
+
+    def _blob_paths(self) -> Iterator[Path]:
+        """Iterate over all blob files."""
+        return (self.directory / "objects").glob("??/*")
+
+    def _ref_paths(self) -> List[Path]:
+        """List all reference files."""
+        return list((self.directory / "refs").iterdir())
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _locked(path: Path, shared: bool = False) -> Iterator[None]:
+        """Hold a shared or exclusive lock on a lock file."""
+        with open(path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+
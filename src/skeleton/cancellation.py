@@ -0,0 +1,110 @@
+"""
+Cooperative cancellation and deadlines for application runs.
+"""
+
+import threading
+import time
+from typing import Optional
+
+# Exit codes of runs that did not finish, following the conventions of
+# timeout(1) and of shells for SIGINT
+EXIT_TIMEOUT = 124
+EXIT_CANCELLED = 130
+
+
+class RunCancelled(Exception):
+    """Raised inside a run that was cancelled."""
+
+    exit_code = EXIT_CANCELLED
+
+
+class RunTimedOut(RunCancelled):
+    """Raised inside a run whose deadline has passed."""
+
+    exit_code = EXIT_TIMEOUT
+
+
+class CancellationToken:
+    """
+    Flag shared between a run and whoever may want to stop it.
+
+    Cancellation is cooperative: long-running code calls
+    raise_if_cancelled() (or SkeletonApp.check_cancelled()) at safe
+    points, or waits on wait() instead of sleeping. A token created with
+    a timeout also counts as cancelled once its deadline passes.
+    """
+
+    __slots__ = ("_event", "_reason", "deadline")
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        """
+        Initialize the token.
+
+        Args:
+            timeout: Optional number of seconds until the deadline
+        """
+        self._event = threading.Event()
+        self._reason = "Run cancelled"
+        self.deadline: Optional[float] = (
+            None if timeout is None else time.monotonic() + timeout
+        )
+
+    def cancel(self, reason: str = "Run cancelled") -> None:
+        """
+        Request cancellation.
+
+        Args:
+            reason: Message of the RunCancelled raised in the run
+        """
+        self._reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called or the deadline has passed."""
+        return self._event.is_set() or self.timed_out
+
+    @property
+    def timed_out(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """
+        Get the time left until the deadline.
+
+        Returns:
+            Seconds left (never negative), or None without a deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raise if the run should stop.
+
+        Raises:
+            RunCancelled: If cancel() was called
+            RunTimedOut: If the deadline has passed
+        """
+        if self._event.is_set():
+            raise RunCancelled(self._reason)
+        if self.timed_out:
+            raise RunTimedOut("Run timed out")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep until cancelled, the deadline passes or ``timeout`` expires.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if the run should stop
+        """
+        remaining = self.remaining()
+        if remaining is not None and (timeout is None or remaining < timeout):
+            timeout = remaining
+        self._event.wait(timeout)
+        return self.cancelled
@@ -3,37 +3,76 @@ Command-line interface for the skeleton project.
 """
 
 import argparse
+import contextlib
+import importlib
+import os
+import signal
 import sys
+import threading
 from pathlib import Path
-from typing import List, Optional
+from types import FrameType
+from typing import TYPE_CHECKING, Any, Iterator, List, Mapping, Optional, Type
 
 # Handle both relative and absolute imports
 try:
-    from .core import SkeletonApp
-    from .utils import setup_logging, get_version, get_app_data_dir
+    from . import __version__
+    from .profiling import PROFILE_MODES, RunProfiler
 except ImportError:
     # If running as __main__, try absolute imports
     try:
-        from skeleton.core import SkeletonApp
-        from skeleton.utils import setup_logging, get_version, get_app_data_dir
+        from skeleton import __version__
+        from skeleton.profiling import PROFILE_MODES, RunProfiler
     except ImportError:
         # Last resort - add parent directory to path
         import os
         parent_dir = Path(__file__).parent.parent.parent / "src"
         sys.path.insert(0, str(parent_dir))
         
-        from skeleton.core import SkeletonApp
-        from skeleton.utils import setup_logging, get_version, get_app_data_dir
+        from skeleton import __version__
+        from skeleton.profiling import PROFILE_MODES, RunProfiler
+
+if TYPE_CHECKING:
+    from .cancellation import CancellationToken
+    from .config import LayeredConfig, env_layer, load_config_file
+    from .flight_recorder import FLIGHT_RECORDER_FILE
+    from .core import SkeletonApp
+    from .progress import TerminalProgressLine
+    from .utils import setup_logging, get_app_data_dir, get_console_handlers
+
+# Names imported on first use, by defining module. Parsing arguments
+# (including --version and --help) must not import logging or core, so
+# these are loaded by _load_deferred() once a run is actually needed.
+_DEFERRED = {
+    "CancellationToken": "cancellation",
+    "FLIGHT_RECORDER_FILE": "flight_recorder",
+    "LayeredConfig": "config",
+    "env_layer": "config",
+    "load_config_file": "config",
+    "SkeletonApp": "core",
+    "TerminalProgressLine": "progress",
+    "setup_logging": "utils",
+    "get_app_data_dir": "utils",
+    "get_console_handlers": "utils",
+}
+
+# Size at which the default --debug log file is rotated unless
+# --log-max-bytes or --log-max-age is given
+DEBUG_LOG_MAX_BYTES = 10 * 1024 * 1024
 
 
-def create_parser() -> argparse.ArgumentParser:
+def create_parser(
+    parser_class: Type[argparse.ArgumentParser] = argparse.ArgumentParser,
+) -> argparse.ArgumentParser:
     """
     Create and configure the argument parser.
     
+    Args:
+        parser_class: ArgumentParser subclass to instantiate
+    
     Returns:
         Configured ArgumentParser instance
     """
-    parser = argparse.ArgumentParser(
+    parser = parser_class(
         prog="skeleton-cli",
         description="A skeleton Python project CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -42,13 +81,19 @@ Examples:
   skeleton-cli --version
   skeleton-cli --debug
   skeleton-cli --log-file /path/to/logfile.log
+  skeleton-cli --profile both
+  skeleton-cli --timeout 30
+  skeleton-cli serve &
+  skeleton-cli batch --jobs 8 < jobs.ndjson > results.ndjson
+  skeleton-cli --flight-recorder && skeleton-cli flight
+  skeleton-cli --connect --timeout 30
         """
     )
     
     parser.add_argument(
         "--version",
         action="version",
-        version=f"%(prog)s {get_version()}"
+        version=f"%(prog)s {__version__}"
     )
     
     parser.add_argument(
@@ -70,21 +115,214 @@ Examples:
         help="Log to specified file instead of console"
     )
     
+    parser.add_argument(
+        "--log-max-bytes",
+        type=int,
+        metavar="N",
+        help="Rotate the log file before it grows past N bytes "
+             f"(default for the --debug log: {DEBUG_LOG_MAX_BYTES})"
+    )
+    
+    parser.add_argument(
+        "--log-max-age",
+        type=float,
+        metavar="SECONDS",
+        help="Rotate the log file after this many seconds"
+    )
+    
+    parser.add_argument(
+        "--log-backups",
+        type=int,
+        default=5,
+        metavar="N",
+        help="Number of rotated log files to keep (default: 5)"
+    )
+    
+    parser.add_argument(
+        "--log-compress",
+        choices=["gzip", "zstd"],
+        help="Compress rotated log files in the background"
+    )
+    
+    parser.add_argument(
+        "--log-rate-limit",
+        type=float,
+        metavar="PER_SECOND",
+        help="Let each logging call site write at most this many INFO/DEBUG "
+             "records per second; the rest are counted and summarized"
+    )
+    
+    parser.add_argument(
+        "--log-burst",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Records a call site may log at once under --log-rate-limit "
+             "(default: 10)"
+    )
+    
+    parser.add_argument(
+        "--log-sample",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Keep only every Nth INFO/DEBUG record from each call site"
+    )
+    
+    parser.add_argument(
+        "--flight-recorder",
+        action="store_true",
+        help="Keep recent DEBUG records in a ring buffer in the application "
+             "data directory and dump it when a run fails"
+    )
+    
+    parser.add_argument(
+        "--flight-records",
+        type=int,
+        default=4096,
+        metavar="N",
+        help="Number of records the flight recorder keeps (default: 4096)"
+    )
+    
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default="text",
+        help="Write log records as text lines or as one JSON object per "
+             "line (default: text)"
+    )
+    
+    parser.add_argument(
+        "--log-async",
+        action="store_true",
+        help="Write log records on a background thread so logging never "
+             "waits for console or disk I/O"
+    )
+    
+    parser.add_argument(
+        "--log-queue-size",
+        type=int,
+        default=10000,
+        metavar="N",
+        help="Maximum number of queued records with --log-async (default: 10000)"
+    )
+    
+    parser.add_argument(
+        "--log-overflow",
+        choices=["block", "drop"],
+        default="block",
+        help="What a full log queue does with new records: wait for room "
+             "or drop them (default: block)"
+    )
+    
     parser.add_argument(
         "--config-file",
         type=Path,
-        help="Path to configuration file"
+        help="Path to configuration file; 'serve' reloads it for later jobs "
+             "whenever it changes"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the run after this many seconds (exit code 124); "
+             "Ctrl-C cancels it (exit code 130)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Profile the run with cProfile (cpu), tracemalloc (mem) or both; "
+             "reports are written to the application data directory"
+    )
+    
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Number of entries in profile reports (default: 20)"
+    )
+    
+    parser.add_argument(
+        "--connect",
+        action="store_true",
+        help="Run this invocation on a daemon started with 'skeleton-cli serve'"
+    )
+    
+    parser.add_argument(
+        "--daemon-socket",
+        type=Path,
+        metavar="SOCKET",
+        help="Daemon socket for --connect "
+             "(default: skeleton.sock in the application data directory)"
+    )
+    
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Run a resident daemon accepting jobs over a Unix socket"
+    )
+    serve_parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Socket path (default: skeleton.sock in the application data directory)"
+    )
+    serve_parser.add_argument(
+        "--max-jobs",
+        type=int,
+        metavar="N",
+        help="Number of jobs running at once; more wait for a slot "
+             "(default: CPU count)"
+    )
+    
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Run newline-delimited JSON job configs from stdin, "
+             "writing NDJSON results to stdout"
+    )
+    batch_parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Number of worker processes (default: CPU count)"
+    )
+    batch_parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Write results in input order instead of completion order"
+    )
+    
+    flight_parser = subparsers.add_parser(
+        "flight",
+        help="Print the records of a flight recorder dump"
+    )
+    flight_parser.add_argument(
+        "path",
+        nargs="?",
+        type=Path,
+        help="Dump or ring buffer file (default: the latest dump, or the "
+             "most recently written ring buffer if there is none)"
     )
     
     return parser
 
 
-def load_config(config_file: Optional[Path] = None) -> dict:
+def load_config(
+    config_file: Optional[Path] = None, cache_dir: Optional[Path] = None
+) -> dict:
     """
     Load configuration from file.
     
+    JSON and TOML files are supported. The parsed result is cached in
+    the application data directory and reused while the file is
+    unchanged.
+    
     Args:
         config_file: Path to configuration file
+        cache_dir: Directory for parsed-config caches
         
     Returns:
         Configuration dictionary
@@ -92,13 +330,46 @@ def load_config(config_file: Optional[Path] = None) -> dict:
     config = {}
     
     if config_file and config_file.exists():
-        # In a real application, you might use JSON, YAML, or TOML
-        # For this skeleton, we'll just return an empty dict
-        pass
+        _load_deferred()
+        config = load_config_file(config_file, cache_dir)
     
     return config
 
 
+def build_config(
+    args: argparse.Namespace,
+    log_file: Optional[Path],
+    env: Optional[Mapping[str, Any]] = None,
+) -> "LayeredConfig":
+    """
+    Build the application configuration for parsed arguments.
+    
+    CLI arguments override SKELETON_* environment variables, which
+    override the config file and the defaults.
+    
+    Args:
+        args: Parsed command-line arguments
+        log_file: Effective log file, if any
+        env: Environment layer (read from os.environ if not given)
+        
+    Returns:
+        Layered configuration
+    """
+    _load_deferred()
+    cli_config = {
+        "log_level": args.log_level,
+        "log_file": str(log_file) if log_file else None,
+    }
+    if args.debug:
+        cli_config["debug"] = True
+    
+    return LayeredConfig.from_layers(
+        file=load_config(args.config_file),
+        env=env_layer() if env is None else env,
+        cli=cli_config,
+    )
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     """
     Main entry point for the CLI application.
@@ -109,33 +380,236 @@ def main(argv: Optional[List[str]] = None) -> int:
     Returns:
         Exit code (0 for success, non-zero for error)
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    
     parser = create_parser()
     args = parser.parse_args(argv)
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    if getattr(args, "jobs", None) is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if getattr(args, "max_jobs", None) is not None and args.max_jobs < 1:
+        parser.error("--max-jobs must be at least 1")
+    if args.log_queue_size < 1:
+        parser.error("--log-queue-size must be at least 1")
+    if args.log_max_bytes is not None and args.log_max_bytes < 1:
+        parser.error("--log-max-bytes must be at least 1")
+    if args.log_max_age is not None and args.log_max_age <= 0:
+        parser.error("--log-max-age must be positive")
+    if args.log_backups < 0:
+        parser.error("--log-backups must not be negative")
+    if args.log_rate_limit is not None and args.log_rate_limit <= 0:
+        parser.error("--log-rate-limit must be positive")
+    if args.log_burst < 1:
+        parser.error("--log-burst must be at least 1")
+    if args.log_sample < 1:
+        parser.error("--log-sample must be at least 1")
+    if args.flight_records < 1:
+        parser.error("--flight-records must be at least 1")
+    
+    if args.daemon_socket is not None and not args.connect:
+        parser.error("--daemon-socket requires --connect")
+    if args.connect and args.command is not None:
+        parser.error("--connect cannot be combined with a subcommand")
+    
+    if args.connect:
+        # Thin client: the daemon does all the work
+        from .client import default_socket_path, run_remote
+        socket_path = args.daemon_socket or default_socket_path()
+        return run_remote(socket_path, _strip_connect(argv))
+    
+    _load_deferred()
+    
+    if args.command == "flight":
+        try:
+            return print_flight_records(args.path)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not read flight recorder: {e}")
     
     # Set up logging
     log_file = args.log_file
+    max_bytes = args.log_max_bytes
     if log_file is None and args.debug:
         # Use default log file in debug mode
         log_file = get_app_data_dir() / "debug.log"
+        if max_bytes is None and args.log_max_age is None:
+            max_bytes = DEBUG_LOG_MAX_BYTES
     
-    setup_logging(
-        level=args.log_level,
-        log_file=log_file
-    )
+    # Batch mode owns stdout for its results
+    try:
+        setup_logging(
+            level=args.log_level,
+            log_file=log_file,
+            stream=sys.stderr if args.command == "batch" else None,
+            fmt=args.log_format,
+            max_bytes=max_bytes or 0,
+            max_age=args.log_max_age,
+            backup_count=args.log_backups,
+            compression=args.log_compress,
+            rate_limit=args.log_rate_limit,
+            rate_burst=args.log_burst,
+            sample_every=args.log_sample,
+            flight_recorder=(
+                get_app_data_dir() / FLIGHT_RECORDER_FILE
+                if args.flight_recorder else None
+            ),
+            flight_records=args.flight_records,
+            async_mode=args.log_async,
+            queue_size=args.log_queue_size,
+            overflow=args.log_overflow
+        )
+    except ValueError as e:
+        parser.error(str(e))
     
-    # Load configuration
-    config = load_config(args.config_file)
+    if args.command == "serve":
+        from .client import default_socket_path
+        from .daemon import serve
+        return serve(
+            args.socket or default_socket_path(), args.max_jobs, args.config_file
+        )
     
-    # Add CLI arguments to config
-    config.update({
-        "debug": args.debug,
-        "log_level": args.log_level,
-        "log_file": str(log_file) if log_file else None,
-    })
+    try:
+        config = build_config(args, log_file)
+    except (OSError, ValueError) as e:
+        parser.error(f"could not load config file {args.config_file}: {e}")
+    
+    if args.command == "batch":
+        from .batch import run_batch
+        try:
+            return run_batch(
+                sys.stdin, sys.stdout, config, jobs=args.jobs, ordered=args.ordered
+            )
+        except BrokenPipeError:
+            # The reader went away (e.g. "| head"); keep the interpreter
+            # from failing again when it flushes stdout at exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
     
     # Create and run the application
     app = SkeletonApp(config)
-    return app.run()
+    token = CancellationToken(args.timeout)
+    # Progress is shown on a terminal only
+    progress_line = TerminalProgressLine(sys.stderr)
+    console_handlers = get_console_handlers()
+    if progress_line.enabled:
+        app.set_progress_listener(progress_line)
+        # Clear the line before each console log line instead of
+        # writing the log line over it
+        for handler in console_handlers:
+            handler.addFilter(progress_line)
+    with _cancel_on_interrupt(token):
+        try:
+            if not args.profile:
+                return app.run(token)
+            
+            profiler = RunProfiler(
+                args.profile, get_app_data_dir(), top_n=args.profile_top
+            )
+            with profiler:
+                exit_code = app.run(token)
+        finally:
+            for handler in console_handlers:
+                handler.removeFilter(progress_line)
+            progress_line.close()
+    print(profiler.summary(), file=sys.stderr)
+    return exit_code
+
+
+def print_flight_records(path: Optional[Path] = None) -> int:
+    """
+    Print the records of a flight recorder file in the console format.
+    
+    Args:
+        path: Dump or ring buffer file (defaults to the latest dump in
+            the application data directory, or the most recently written
+            ring buffer, including those of concurrent processes)
+        
+    Returns:
+        Exit code (0 for success)
+    """
+    import logging
+    from .flight_recorder import (
+        find_flight_buffers, find_flight_dumps, read_flight_records
+    )
+    from .utils import DEFAULT_FORMAT
+    
+    _load_deferred()
+    if path is None:
+        data_dir = get_app_data_dir()
+        candidates = find_flight_dumps(data_dir) or find_flight_buffers(data_dir)
+        path = candidates[-1] if candidates else data_dir / FLIGHT_RECORDER_FILE
+    
+    formatter = logging.Formatter(DEFAULT_FORMAT)
+    for record in read_flight_records(path):
+        print(formatter.format(record.to_log_record()))
+    return 0
+
+
+@contextlib.contextmanager
+def _cancel_on_interrupt(token: "CancellationToken") -> Iterator[None]:
+    """
+    Cancel ``token`` on the first Ctrl-C instead of raising.
+    
+    A second Ctrl-C falls back to the previous handler, so a run that
+    never checks its token can still be interrupted.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    
+    previous = signal.getsignal(signal.SIGINT)
+    if previous is None:
+        previous = signal.default_int_handler
+    
+    def handler(signum: int, frame: Optional[FrameType]) -> None:
+        token.cancel("Interrupted")
+        signal.signal(signal.SIGINT, previous)
+    
+    signal.signal(signal.SIGINT, handler)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+
+def __getattr__(name: str) -> Any:
+    # Lets callers (and mock.patch) reach deferred names as attributes
+    if name not in _DEFERRED:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    package = __package__ or "skeleton"
+    module = importlib.import_module(f"{package}.{_DEFERRED[name]}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def _load_deferred() -> None:
+    """Import the deferred names that are not loaded (or patched) yet."""
+    namespace = globals()
+    for name in _DEFERRED:
+        if name not in namespace:
+            __getattr__(name)
+
+
+def _strip_connect(argv: List[str]) -> List[str]:
+    """
+    Remove --connect and --daemon-socket from an argument list.
+    
+    The options are matched by argparse, so abbreviations and the
+    ``--option=value`` form are removed as well.
+    
+    Args:
+        argv: Arguments accepted by the full parser, without a subcommand
+    
+    Returns:
+        The remaining arguments, in their original order
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--connect", action="store_true")
+    parser.add_argument("--daemon-socket")
+    _, remaining = parser.parse_known_args(argv)
+    return remaining
 
 
 if __name__ == "__main__":
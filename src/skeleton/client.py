@@ -0,0 +1,83 @@
+"""
+Thin client forwarding CLI invocations to a running daemon.
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import List, Optional, TextIO
+
+from .utils import get_app_data_dir
+
+# Name of the daemon socket inside the application data directory
+SOCKET_NAME = "skeleton.sock"
+
+
+def default_socket_path() -> Path:
+    """
+    Get the default daemon socket path.
+    
+    Returns:
+        Path to the socket in the application data directory
+    """
+    return get_app_data_dir() / SOCKET_NAME
+
+
+def run_remote(
+    socket_path: Path,
+    argv: List[str],
+    stdout: Optional[TextIO] = None,
+    stderr: Optional[TextIO] = None,
+) -> int:
+    """
+    Run a CLI invocation on a daemon started with ``skeleton-cli serve``.
+    
+    Log lines produced by the job are streamed to ``stdout`` as they
+    arrive.
+    
+    Args:
+        socket_path: Path of the daemon socket
+        argv: Command-line arguments for the job
+        stdout: Stream for job output (defaults to sys.stdout)
+        stderr: Stream for errors (defaults to sys.stderr)
+        
+    Returns:
+        Exit code of the job, or 1 if the daemon could not be reached
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(str(socket_path))
+    except OSError as e:
+        print(
+            f"Error: cannot connect to daemon at {socket_path}: {e}", file=stderr
+        )
+        return 1
+    
+    with sock, sock.makefile("rwb") as stream:
+        # Relative paths in argv are resolved against our directory
+        request = {"argv": argv, "cwd": os.getcwd()}
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        
+        for raw in stream:
+            message = json.loads(raw)
+            kind = message.get("type")
+            if kind == "log":
+                print(message["line"], file=stdout, flush=True)
+            elif kind == "output":
+                print(message["message"], file=stdout)
+            elif kind == "error":
+                print(message["message"], file=stderr)
+            elif kind == "exit":
+                return int(message["code"])
+    
+    print(
+        "Error: daemon closed the connection before the job finished",
+        file=stderr,
+    )
+    return 1
@@ -0,0 +1,398 @@
+"""
+Layered configuration for the skeleton project.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from .utils import get_app_data_dir, write_atomic
+
+# Default configuration values, shared by every application instance
+DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType({
+    "app_name": "Skeleton Project",
+    "version": "0.1.0",
+    "debug": False,
+})
+
+# Prefix of environment variables read by env_layer()
+ENV_PREFIX = "SKELETON_"
+
+# Layers of from_layers(), from lowest to highest priority
+STANDARD_LAYERS = ("defaults", "file", "env", "cli")
+
+# Configuration file formats by suffix
+CONFIG_FORMATS = {".json": "json", ".toml": "toml"}
+
+# Bumped whenever the layout of parsed-config cache files changes
+_CACHE_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+def freeze(mapping: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Get a read-only view of a mapping.
+
+    Read-only mappings are returned as they are, so layers that are
+    already frozen can be shared between configurations without
+    copying. Anything else is copied once so later changes by the
+    caller cannot leak into the configuration.
+
+    Args:
+        mapping: Mapping to freeze
+
+    Returns:
+        Read-only mapping
+    """
+    if isinstance(mapping, (MappingProxyType, LayeredConfig)):
+        return mapping
+    return MappingProxyType(dict(mapping))
+
+
+def env_layer(
+    prefix: str = ENV_PREFIX, environ: Optional[Mapping[str, str]] = None
+) -> Mapping[str, Any]:
+    """
+    Build a configuration layer from environment variables.
+
+    ``SKELETON_DEBUG=true`` becomes ``{"debug": True}``: the prefix is
+    stripped, the key lowercased and the value parsed as JSON, falling
+    back to the raw string.
+
+    Args:
+        prefix: Prefix of the variables to read
+        environ: Environment to read (defaults to os.environ)
+
+    Returns:
+        Read-only configuration layer
+    """
+    if environ is None:
+        environ = os.environ
+
+    layer: Dict[str, Any] = {}
+    for name, raw in environ.items():
+        if not name.startswith(prefix) or name == prefix:
+            continue
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        layer[name[len(prefix):].lower()] = value
+    return MappingProxyType(layer)
+
+
+def load_config_file(
+    path: Path, cache_dir: Optional[Path] = None, use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Load a JSON or TOML configuration file.
+
+    Parsing large files on every invocation is slow, so the parsed
+    result is cached in ``cache_dir`` in pickle format and
+    reused as long as the file's path, size and modification time are
+    unchanged. Unreadable cache files are ignored and rewritten.
+
+    Args:
+        path: Configuration file, ``.json`` or ``.toml``
+        cache_dir: Directory for parsed-config caches (defaults to
+            ``config-cache`` under the application data directory)
+        use_cache: Read and write the parsed-config cache
+
+    Returns:
+        Configuration dictionary
+
+    Raises:
+        ValueError: If the format is not supported or the file does not
+            hold a table/object at the top level
+    """
+    format_name = CONFIG_FORMATS.get(path.suffix.lower())
+    if format_name is None:
+        raise ValueError(f"Unsupported config file format: {path}")
+
+    stat = path.stat()
+    if not use_cache:
+        return _parse_config(path, format_name)
+
+    if cache_dir is None:
+        cache_dir = get_app_data_dir() / "config-cache"
+    source = str(path.resolve())
+    cache_path = cache_dir / (hashlib.sha256(source.encode()).hexdigest() + ".bin")
+    signature = (_CACHE_VERSION, source, stat.st_mtime_ns, stat.st_size)
+
+    cached = _read_config_cache(cache_path, signature)
+    if cached is not None:
+        return cached
+
+    config = _parse_config(path, format_name)
+    _write_config_cache(cache_path, signature, config)
+    return config
+
+
+def validate_config(config: Mapping[str, Any]) -> None:
+    """
+    Check that known settings have the type of their default.
+
+    Args:
+        config: Configuration values to check
+
+    Raises:
+        ValueError: If a setting has the wrong type
+    """
+    for key, default in DEFAULT_CONFIG.items():
+        if key in config and not isinstance(config[key], type(default)):
+            raise ValueError(
+                f"Setting {key!r} must be a {type(default).__name__}, "
+                f"got {config[key]!r}"
+            )
+
+
+def _parse_config(path: Path, format_name: str) -> Dict[str, Any]:
+    """Parse a configuration file in the given format."""
+    if format_name == "toml":
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib  # type: ignore[no-redef]
+            except ImportError:
+                raise ValueError(
+                    f"Reading {path} requires Python 3.11+ or the tomli package"
+                ) from None
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    with open(path, "rb") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"Config file {path} must contain a JSON object")
+    return config
+
+
+def _read_config_cache(
+    cache_path: Path, signature: Tuple[Any, ...]
+) -> Optional[Dict[str, Any]]:
+    """Get the cached config if it was parsed from the same file state."""
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        cached_signature, config = pickle.loads(data)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug("Ignoring unreadable config cache %s: %s", cache_path, e)
+        return None
+    if tuple(cached_signature) != signature:
+        return None
+    return config
+
+
+def _write_config_cache(
+    cache_path: Path, signature: Tuple[Any, ...], config: Dict[str, Any]
+) -> None:
+    """Write a parsed config to its cache file atomically."""
+    # Faster to load than marshal here, and it handles TOML dates too
+    data = pickle.dumps((signature, config), protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(cache_path, data)
+    except OSError as e:
+        logger.warning("Could not write config cache %s: %s", cache_path, e)
+
+
+class LayeredConfig(Mapping[str, Any]):
+    """
+    Immutable configuration made of named layers.
+
+    Lookups search the layers from highest to lowest priority like
+    ``collections.ChainMap``, but the configuration itself never
+    changes: with_layer() and with_defaults() return new configurations
+    that share every untouched layer with the original. One base
+    configuration can therefore back any number of application
+    instances without copies or aliasing bugs.
+    """
+
+    __slots__ = ("_names", "_maps")
+
+    def __init__(
+        self, layers: Optional[Mapping[str, Mapping[str, Any]]] = None
+    ) -> None:
+        """
+        Initialize the configuration.
+
+        Args:
+            layers: Layers by name, ordered from lowest to highest
+                priority; plain dictionaries are copied once
+        """
+        names: Tuple[str, ...] = ()
+        maps: Tuple[Mapping[str, Any], ...] = ()
+        for name, mapping in (layers or {}).items():
+            names = (name,) + names
+            maps = (freeze(mapping),) + maps
+        self._names = names
+        self._maps = maps
+
+    @classmethod
+    def from_layers(
+        cls,
+        defaults: Optional[Mapping[str, Any]] = DEFAULT_CONFIG,
+        file: Optional[Mapping[str, Any]] = None,
+        env: Optional[Mapping[str, Any]] = None,
+        cli: Optional[Mapping[str, Any]] = None,
+    ) -> "LayeredConfig":
+        """
+        Build a configuration from the standard layers.
+
+        Later layers take priority: command-line values override the
+        environment, which overrides the file, which overrides the
+        defaults. Layers passed as None are left out.
+
+        Args:
+            defaults: Default values
+            file: Values loaded from a configuration file
+            env: Values from the environment, see env_layer()
+            cli: Values from command-line arguments
+
+        Returns:
+            New configuration
+        """
+        candidates = zip(STANDARD_LAYERS, (defaults, file, env, cli))
+        return cls({name: layer for name, layer in candidates if layer is not None})
+
+    @classmethod
+    def _from_frozen(
+        cls, names: Tuple[str, ...], maps: Tuple[Mapping[str, Any], ...]
+    ) -> "LayeredConfig":
+        """Build a configuration from already frozen layers, highest first."""
+        config = cls.__new__(cls)
+        config._names = names
+        config._maps = maps
+        return config
+
+    @property
+    def layer_names(self) -> Tuple[str, ...]:
+        """Names of the layers, from highest to lowest priority."""
+        return self._names
+
+    def layer(self, name: str) -> Optional[Mapping[str, Any]]:
+        """
+        Get a single layer.
+
+        Args:
+            name: Layer name
+
+        Returns:
+            The layer, or None if there is no layer with that name
+        """
+        try:
+            return self._maps[self._names.index(name)]
+        except ValueError:
+            return None
+
+    def with_layer(
+        self, name: str, mapping: Mapping[str, Any]
+    ) -> "LayeredConfig":
+        """
+        Get a copy with a layer replaced or added.
+
+        A layer with an existing name keeps its priority. A new layer
+        is added on top of all others, except that a standard layer
+        (see STANDARD_LAYERS) goes below the standard layers that
+        outrank it: a ``file`` layer added later still loses to ``env``
+        and ``cli``.
+
+        Args:
+            name: Layer name
+            mapping: Layer values
+
+        Returns:
+            New configuration sharing all other layers
+        """
+        frozen = freeze(mapping)
+        if name in self._names:
+            index = self._names.index(name)
+            maps = self._maps[:index] + (frozen,) + self._maps[index + 1:]
+            return self._from_frozen(self._names, maps)
+        index = 0
+        if name in STANDARD_LAYERS:
+            rank = STANDARD_LAYERS.index(name)
+            for position, existing in enumerate(self._names):
+                if existing in STANDARD_LAYERS[rank + 1:]:
+                    index = position + 1
+        return self._from_frozen(
+            self._names[:index] + (name,) + self._names[index:],
+            self._maps[:index] + (frozen,) + self._maps[index:],
+        )
+
+    def with_defaults(
+        self, defaults: Mapping[str, Any] = DEFAULT_CONFIG
+    ) -> "LayeredConfig":
+        """
+        Get a configuration whose lowest layer holds ``defaults``.
+
+        Returns this configuration itself when it already uses the same
+        defaults object, so shared configurations cost nothing extra.
+
+        Args:
+            defaults: Default values
+
+        Returns:
+            Configuration with a ``defaults`` layer at the bottom
+        """
+        if self._names[-1:] == ("defaults",) and self._maps[-1] is defaults:
+            return self
+
+        names = self._names
+        maps = self._maps
+        if "defaults" in names:
+            index = names.index("defaults")
+            names = names[:index] + names[index + 1:]
+            maps = maps[:index] + maps[index + 1:]
+        return self._from_frozen(names + ("defaults",), maps + (freeze(defaults),))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Flatten the layers into a new dictionary.
+
+        Returns:
+            Dictionary with the effective value of every key
+        """
+        result: Dict[str, Any] = {}
+        for mapping in reversed(self._maps):
+            result.update(mapping)
+        return result
+
+    def __getitem__(self, key: str) -> Any:
+        for mapping in self._maps:
+            if key in mapping:
+                return mapping[key]
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in mapping for mapping in self._maps)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(set().union(*self._maps))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Read-only views cannot be pickled; rebuild from plain copies
+        layers = [
+            (name, dict(mapping))
+            for name, mapping in zip(self._names, self._maps)
+        ]
+        return (type(self), (dict(reversed(layers)),))
+
+    def __repr__(self) -> str:
+        layers = ", ".join(
+            f"{name}={dict(mapping)!r}"
+            for name, mapping in zip(self._names, self._maps)
+        )
+        return f"{type(self).__name__}({layers})"
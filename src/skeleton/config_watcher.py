@@ -0,0 +1,155 @@
+"""
+Hot reloading of configuration files.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import load_config_file, validate_config
+
+# Called with the new configuration and the perf_counter() time at
+# which the change was detected
+ChangeCallback = Callable[[Dict[str, Any], float], None]
+
+
+class ConfigWatcher:
+    """
+    Background thread reloading a configuration file when it changes.
+
+    The file is polled with os.stat() every ``interval`` seconds; a new
+    modification time or size triggers a reload through
+    load_config_file(). Valid configurations are handed to
+    ``on_change``, invalid ones are logged and skipped so the current
+    configuration stays in place.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        on_change: ChangeCallback,
+        interval: float = 1.0,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        """
+        Initialize the watcher.
+
+        Args:
+            path: Configuration file to watch
+            on_change: Callable receiving each new valid configuration
+            interval: Seconds between polls
+            cache_dir: Directory for parsed-config caches
+        """
+        if interval <= 0:
+            raise ValueError(f"Invalid poll interval: {interval}")
+
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.cache_dir = cache_dir
+        self.logger = logging.getLogger(__name__)
+        # Serializes configuration swaps with the start and end of runs
+        self.lock = threading.Lock()
+
+        self.reloads = 0
+        self.errors = 0
+        self.last_swap_seconds: Optional[float] = None
+        self._signature = self._stat()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ConfigWatcher":
+        """Start polling in the background."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name="config-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self) -> bool:
+        """
+        Poll the file once and reload it if it changed.
+
+        Returns:
+            True if a new configuration was passed to ``on_change``
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        detected_at = time.perf_counter()
+        self._signature = signature
+        if signature is None:
+            self.logger.warning("Config file %s disappeared", self.path)
+            return False
+
+        try:
+            config = load_config_file(self.path, self.cache_dir)
+            validate_config(config)
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            self.logger.warning(
+                "Keeping current config, %s is invalid: %s", self.path, e
+            )
+            return False
+
+        self.reloads += 1
+        self.logger.info("Reloading config from %s", self.path)
+        self.on_change(config, detected_at)
+        return True
+
+    def record_swap(self, detected_at: float) -> float:
+        """
+        Record that a change detected at ``detected_at`` took effect.
+
+        Args:
+            detected_at: perf_counter() time passed to ``on_change``
+
+        Returns:
+            Seconds between detection and swap
+        """
+        seconds = time.perf_counter() - detected_at
+        self.last_swap_seconds = seconds
+        return seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get reload statistics.
+
+        Returns:
+            Dictionary with the path, reload and error counts and the
+            latency of the last swap in seconds
+        """
+        return {
+            "path": str(self.path),
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "last_swap_seconds": self.last_swap_seconds,
+        }
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        """Get the modification time and size of the file."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _loop(self) -> None:
+        """Poll every interval until stopped."""
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                self.logger.exception("Config reload failed")
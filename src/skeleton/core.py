@@ -2,8 +2,106 @@
 Core application module for the skeleton project.
 """
 
+import asyncio
+import contextlib
+import contextvars
+import itertools
 import logging
-from typing import Dict, Any, Optional
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import (
+    Dict,
+    Any,
+    Awaitable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from .cancellation import CancellationToken, RunCancelled
+from .config import DEFAULT_CONFIG, LayeredConfig
+from .config_watcher import ConfigWatcher
+from .flight_recorder import dump_flight_recorders
+from .metrics import REGISTRY
+from .pipeline import Pipeline
+from .progress import PROGRESS_INTERVAL, ProgressListener, ProgressReporter
+from .result_cache import ResultCache, make_cache_key
+from .utils import pop_log_context, push_log_context
+
+
+# Run metrics, shared by every SkeletonApp in the process
+RUNS_TOTAL = REGISTRY.counter(
+    "skeleton_runs_total", "Number of application runs started"
+)
+RUN_FAILURES_TOTAL = REGISTRY.counter(
+    "skeleton_run_failures_total", "Number of application runs that failed"
+)
+RUNS_CANCELLED_TOTAL = REGISTRY.counter(
+    "skeleton_runs_cancelled_total",
+    "Number of application runs that were cancelled or timed out",
+)
+RUNS_IN_PROGRESS = REGISTRY.gauge(
+    "skeleton_runs_in_progress", "Number of application runs in progress"
+)
+RUN_SECONDS = REGISTRY.histogram(
+    "skeleton_run_duration_seconds", "Duration of application runs"
+)
+MAIN_LOGIC_SECONDS = REGISTRY.histogram(
+    "skeleton_main_logic_duration_seconds",
+    "Duration of the main application logic, excluding cache hits",
+)
+CONFIG_RELOADS_TOTAL = REGISTRY.counter(
+    "skeleton_config_reloads_total", "Number of configuration hot reloads"
+)
+CONFIG_SWAP_SECONDS = REGISTRY.histogram(
+    "skeleton_config_swap_seconds",
+    "Time from detecting a config file change to using the new config",
+)
+
+
+# How often run_async() checks its token while awaiting the main logic
+CANCEL_POLL_INTERVAL = 0.05
+
+# Process-wide run numbers, added to JSON log records as ``run_id``
+_RUN_IDS = itertools.count(1)
+
+# Token of the run whose main logic executes on an executor thread of
+# run_async(); unlike ``cancel_token`` it stays set until the thread
+# returns, even after the run stopped awaiting it
+_EXECUTOR_TOKEN: "contextvars.ContextVar[Optional[CancellationToken]]" = (
+    contextvars.ContextVar("skeleton_executor_token", default=None)
+)
+
+
+class RunResult(NamedTuple):
+    """Outcome of a single job executed by SkeletonApp.run_many()."""
+
+    index: int
+    exit_code: int
+    result: Any
+    # Why the outcome could not be received from the worker process,
+    # e.g. an unpicklable result; failures inside the run are logged
+    # by the worker instead
+    error: Optional[str] = None
+
+
+def _init_worker(app_cls: Type["SkeletonApp"]) -> None:
+    """Process pool initializer; runs once in each worker process."""
+    app_cls.setup_worker()
+
+
+def _run_job(
+    app_cls: Type["SkeletonApp"], config: Optional[Mapping[str, Any]]
+) -> Tuple[int, Any]:
+    """Run a single job inside a worker process."""
+    return app_cls(config)._run_with_result()
 
 
 class SkeletonApp:
@@ -14,52 +112,491 @@ class SkeletonApp:
     in both CLI and GUI interfaces.
     """
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+    __slots__ = (
+        "config",
+        "logger",
+        "result_cache",
+        "cancel_token",
+        "config_watcher",
+        "_pending_config",
+        "_progress",
+    )
+    
+    def __init__(
+        self,
+        config: Optional[Mapping[str, Any]] = None,
+        result_cache: Optional[ResultCache] = None,
+    ) -> None:
         """
         Initialize the skeleton application.
         
+        A LayeredConfig is used as it is, so one base configuration can
+        be shared by many instances at no extra cost. A plain dictionary
+        is copied and never modified.
+        
         Args:
-            config: Optional configuration dictionary
+            config: Optional configuration mapping
+            result_cache: Optional cache for results of the main logic,
+                keyed on the effective configuration
         """
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
+        self.result_cache = result_cache
+        self.cancel_token: Optional[CancellationToken] = None
+        self.config_watcher: Optional[ConfigWatcher] = None
+        self._pending_config: Optional[Tuple[LayeredConfig, float]] = None
+        self._progress: Optional[ProgressReporter] = None
         self._setup_defaults()
     
     def _setup_defaults(self) -> None:
-        """Set up default configuration values."""
-        defaults = {
-            "app_name": "Skeleton Project",
-            "version": "0.1.0",
-            "debug": False,
-        }
-        
-        for key, value in defaults.items():
-            if key not in self.config:
-                self.config[key] = value
+        """Set up default configuration values as the lowest layer."""
+        config = self.config
+        if not isinstance(config, LayeredConfig):
+            config = LayeredConfig({"config": config})
+        self.config = config.with_defaults(DEFAULT_CONFIG)
     
-    def run(self) -> int:
+    def run(
+        self,
+        token: Optional[CancellationToken] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
         """
         Run the main application logic.
         
+        While the run is in progress its token is available as
+        ``self.cancel_token``; long-running logic should call
+        check_cancelled() regularly so it can be stopped.
+        
+        Args:
+            token: Optional token another thread can use to cancel
+            timeout: Optional time limit in seconds (only without token;
+                give the token a timeout instead)
+        
+        Returns:
+            Exit code (0 for success, EXIT_CANCELLED or EXIT_TIMEOUT if
+            the run was stopped, other non-zero values for errors)
+        """
+        exit_code, _ = self._run_with_result(token, timeout)
+        return exit_code
+    
+    def _run_with_result(
+        self,
+        token: Optional[CancellationToken] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Run the main application logic and keep its result.
+        
+        Args:
+            token: Optional cancellation token
+            timeout: Optional time limit in seconds
+        
+        Returns:
+            Tuple of (exit code, result); the result is None on failure
+        """
+        token = self._start_token(token, timeout)
+        self._apply_pending_config()
+        log_context = self._push_log_context()
+        start = self._begin_run()
+        if self._progress is not None:
+            self._progress.reset()
+        try:
+            self._log_start()
+            token.raise_if_cancelled()
+            
+            key, found, result = self._lookup_cached_result()
+            if not found:
+                # Main application logic goes here
+                with MAIN_LOGIC_SECONDS.time():
+                    result = self._execute_main_logic()
+                self._store_cached_result(key, result)
+            
+            self.logger.info("Application completed successfully")
+            return 0, result
+            
+        except RunCancelled as e:
+            return self._handle_cancelled(e), None
+            
+        except Exception as e:
+            RUN_FAILURES_TOTAL.inc()
+            self.logger.error("Application failed: %s", str(e))
+            self._dump_flight_recorder(e)
+            if self.config.get("debug"):
+                raise
+            return 1, None
+        
+        finally:
+            self.cancel_token = None
+            self._apply_pending_config()
+            self._end_run(start)
+            if self._progress is not None:
+                self._progress.finish()
+            pop_log_context(log_context)
+    
+    async def run_async(
+        self,
+        token: Optional[CancellationToken] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """
+        Run the main application logic on the running event loop.
+        
+        Logging, exit codes and debug re-raising match run(). When the
+        token is cancelled or times out, the awaited main logic is
+        cancelled as well.
+        
+        Args:
+            token: Optional token another task or thread can cancel
+            timeout: Optional time limit in seconds (only without token)
+        
         Returns:
             Exit code (0 for success, non-zero for error)
         """
+        exit_code, _ = await self._run_with_result_async(token, timeout)
+        return exit_code
+    
+    async def _run_with_result_async(
+        self,
+        token: Optional[CancellationToken] = None,
+        timeout: Optional[float] = None,
+    ) -> Tuple[int, Any]:
+        """
+        Awaitable counterpart of _run_with_result().
+        
+        Args:
+            token: Optional cancellation token
+            timeout: Optional time limit in seconds
+        
+        Returns:
+            Tuple of (exit code, result); the result is None on failure
+        """
+        token = self._start_token(token, timeout)
+        self._apply_pending_config()
+        log_context = self._push_log_context()
+        start = self._begin_run()
+        if self._progress is not None:
+            self._progress.reset()
         try:
-            self.logger.info("Starting %s v%s", 
-                           self.config["app_name"], 
-                           self.config["version"])
+            self._log_start()
+            token.raise_if_cancelled()
             
-            # Main application logic goes here
-            result = self._execute_main_logic()
+            key, found, result = self._lookup_cached_result()
+            if not found:
+                with MAIN_LOGIC_SECONDS.time():
+                    result = await _await_cancellable(
+                        self._execute_main_logic_async(), token
+                    )
+                self._store_cached_result(key, result)
             
             self.logger.info("Application completed successfully")
-            return 0
+            return 0, result
+            
+        except RunCancelled as e:
+            return self._handle_cancelled(e), None
             
         except Exception as e:
+            RUN_FAILURES_TOTAL.inc()
             self.logger.error("Application failed: %s", str(e))
+            self._dump_flight_recorder(e)
             if self.config.get("debug"):
                 raise
-            return 1
+            return 1, None
+        
+        finally:
+            self.cancel_token = None
+            self._apply_pending_config()
+            self._end_run(start)
+            if self._progress is not None:
+                self._progress.finish()
+            pop_log_context(log_context)
+    
+    def check_cancelled(self) -> None:
+        """
+        Stop the current run if it was cancelled or timed out.
+        
+        Call this at safe points in long-running main logic.
+        
+        Raises:
+            RunCancelled: If the run was cancelled
+            RunTimedOut: If the run's deadline has passed
+        """
+        token = self._current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+    
+    def _current_token(self) -> Optional[CancellationToken]:
+        """Get the token of the run executing on this thread."""
+        token = _EXECUTOR_TOKEN.get()
+        return self.cancel_token if token is None else token
+    
+    def set_progress_listener(
+        self,
+        listener: Optional[ProgressListener],
+        interval: float = PROGRESS_INTERVAL,
+    ) -> None:
+        """
+        Receive the progress reported by runs of this application.
+        
+        Reports are coalesced to at most one per ``interval`` (plus the
+        last one of each run), however often the main logic calls
+        report_progress(). The listener is called on the thread of the
+        run.
+        
+        Args:
+            listener: Callable receiving Progress reports, or None to
+                stop listening
+            interval: Minimum seconds between two reports
+        """
+        self._progress = (
+            None if listener is None else ProgressReporter(listener, interval)
+        )
+    
+    def report_progress(self, done: float, total: Optional[float] = None) -> None:
+        """
+        Report how far the current run has got.
+        
+        Cheap enough to call for every unit of work: without a listener
+        it does nothing, and with one most calls only store the values.
+        
+        Args:
+            done: Units done so far
+            total: Total units, if known
+        """
+        progress = self._progress
+        if progress is not None:
+            progress.update(done, total)
+    
+    def watch_config(
+        self,
+        path: Path,
+        interval: float = 1.0,
+        cache_dir: Optional[Path] = None,
+    ) -> ConfigWatcher:
+        """
+        Reload the ``file`` configuration layer whenever ``path`` changes.
+        
+        Changes are polled for on a background thread. A valid new
+        configuration replaces the current one atomically: right away
+        when no run is in progress, otherwise as soon as the current run
+        ends, so a run never sees its configuration change underneath
+        it. Stop watching with ``config_watcher.stop()``.
+        
+        Args:
+            path: JSON or TOML configuration file
+            interval: Seconds between polls
+            cache_dir: Directory for parsed-config caches
+        
+        Returns:
+            The running watcher, also available as ``config_watcher``
+        """
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self.config_watcher = ConfigWatcher(
+            Path(path),
+            self._on_config_change,
+            interval=interval,
+            cache_dir=cache_dir,
+        ).start()
+        return self.config_watcher
+    
+    def _on_config_change(
+        self, file_config: Dict[str, Any], detected_at: float
+    ) -> None:
+        """Queue a reloaded file layer and apply it if no run is active."""
+        watcher = self.config_watcher
+        if watcher is None:
+            return
+        with watcher.lock:
+            self._pending_config = (
+                self.config.with_layer("file", file_config), detected_at
+            )
+            if self.cancel_token is None:
+                self._swap_config()
+    
+    def _apply_pending_config(self) -> None:
+        """Apply a reloaded configuration queued while a run was active."""
+        watcher = self.config_watcher
+        if watcher is None or self._pending_config is None:
+            return
+        with watcher.lock:
+            self._swap_config()
+    
+    def _swap_config(self) -> None:
+        """Replace the configuration; the watcher lock must be held."""
+        pending = self._pending_config
+        if pending is None or self.config_watcher is None:
+            return
+        self.config, detected_at = pending
+        self._pending_config = None
+        CONFIG_RELOADS_TOTAL.inc()
+        CONFIG_SWAP_SECONDS.observe(self.config_watcher.record_swap(detected_at))
+        self.logger.info("Configuration reloaded")
+    
+    def _start_token(
+        self, token: Optional[CancellationToken], timeout: Optional[float]
+    ) -> CancellationToken:
+        """Create or adopt the token of a run and publish it."""
+        if token is None:
+            token = CancellationToken(timeout)
+        elif timeout is not None:
+            raise ValueError("Pass either a token or a timeout, not both")
+        self.cancel_token = token
+        return token
+    
+    def _handle_cancelled(self, error: RunCancelled) -> int:
+        """Log a stopped run and return its exit code."""
+        RUNS_CANCELLED_TOTAL.inc()
+        self.logger.warning("Application stopped: %s", error)
+        return error.exit_code
+    
+    def _dump_flight_recorder(self, error: Exception) -> None:
+        """Keep the records leading up to a failed run, if recorded."""
+        for path in dump_flight_recorders(error):
+            self.logger.error("Flight recorder dumped to %s", path)
+    
+    def _push_log_context(self) -> Any:
+        """Add the app and run to JSON log records of the current run."""
+        return push_log_context({
+            "app": self.config["app_name"],
+            "version": self.config["version"],
+            "run_id": next(_RUN_IDS),
+        })
+    
+    @staticmethod
+    def _begin_run() -> float:
+        """Record the start of a run and return its start time."""
+        RUNS_TOTAL.inc()
+        RUNS_IN_PROGRESS.inc()
+        return time.perf_counter()
+    
+    @staticmethod
+    def _end_run(start: float) -> None:
+        """Record the end of a run started at ``start``."""
+        RUNS_IN_PROGRESS.dec()
+        RUN_SECONDS.observe(time.perf_counter() - start)
+    
+    def _log_start(self) -> None:
+        """Log the start of a run."""
+        self.logger.info("Starting %s v%s", 
+                       self.config["app_name"], 
+                       self.config["version"])
+    
+    def _lookup_cached_result(self) -> Tuple[Optional[str], bool, Any]:
+        """
+        Look up the result for the current configuration.
+        
+        Returns:
+            Tuple of (cache key, found, result); the key is None when
+            no result cache is configured
+        """
+        if self.result_cache is None:
+            return None, False, None
+        
+        cls = type(self)
+        key = make_cache_key(f"{cls.__module__}.{cls.__qualname__}", self.config)
+        found, result = self.result_cache.get(key)
+        if found:
+            self.logger.info("Using cached result")
+        return key, found, result
+    
+    def _store_cached_result(self, key: Optional[str], result: Any) -> None:
+        """Store a successful result under ``key`` if caching is enabled."""
+        if self.result_cache is not None and key is not None:
+            self.result_cache.put(key, result)
+    
+    @classmethod
+    def setup_worker(cls) -> None:
+        """
+        Prepare per-process state for run_many() workers.
+        
+        Called once in each worker process before it takes any jobs.
+        Override this in subclasses to open connections or load
+        resources that every job in that process can share.
+        """
+    
+    @classmethod
+    def run_many(
+        cls,
+        inputs: Iterable[Optional[Mapping[str, Any]]],
+        workers: Optional[int] = None,
+        ordered: bool = False,
+    ) -> Iterator[RunResult]:
+        """
+        Run one job per configuration on a pool of worker processes.
+        
+        Every job builds a fresh instance of this class from its
+        configuration and runs it exactly like run(). At most two jobs
+        per worker are queued or waiting to be yielded at a time, so
+        ``inputs`` may be a lazy or very long iterable. Subclasses,
+        configurations and results must be picklable.
+        
+        Args:
+            inputs: Iterable of configuration dictionaries, one per job
+            workers: Number of worker processes (defaults to CPU count)
+            ordered: Yield results in input order; results that finish
+                early are held back (counting against the window)
+                until all earlier jobs are done
+            
+        Yields:
+            RunResult for each job, in completion or input order
+            
+        Raises:
+            Exception: Re-raised from a failing job whose config has
+                ``debug`` enabled; queued jobs are cancelled. Without
+                debug, a failing job yields exit code 1 and the other
+                jobs carry on
+        """
+        workers = workers or os.cpu_count() or 1
+        max_pending = workers * 2
+        jobs = enumerate(inputs)
+        # Index and debug flag of each submitted job
+        pending: Dict[Future, Tuple[int, bool]] = {}
+        # Finished results waiting for earlier jobs (ordered mode only)
+        held: Dict[int, RunResult] = {}
+        next_index = 0
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(cls,),
+        ) as executor:
+            try:
+                while True:
+                    for index, config in itertools.islice(
+                        jobs, max_pending - len(pending) - len(held)
+                    ):
+                        future = executor.submit(_run_job, cls, config)
+                        debug = bool(config and config.get("debug"))
+                        pending[future] = (index, debug)
+                    
+                    if not pending:
+                        break
+                    
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, debug = pending.pop(future)
+                        try:
+                            exit_code, result = future.result()
+                            run_result = RunResult(index, exit_code, result)
+                        except Exception as e:
+                            # Raised by the job in debug mode, or by the
+                            # pool, e.g. for a result that cannot be pickled
+                            if debug:
+                                raise
+                            logging.getLogger(__name__).error(
+                                "Job %d failed: %s", index, e
+                            )
+                            run_result = RunResult(index, 1, None, str(e))
+                        if not ordered:
+                            yield run_result
+                            continue
+                        held[index] = run_result
+                        while next_index in held:
+                            yield held.pop(next_index)
+                            next_index += 1
+            finally:
+                for future in pending:
+                    future.cancel()
     
     def _execute_main_logic(self) -> Any:
         """
@@ -68,13 +605,74 @@ class SkeletonApp:
         Override this method in subclasses to implement
         specific functionality.
         
+        Subclasses that stream their data can override build_pipeline()
+        instead; its pipeline is then run here and the sink's result
+        returned.
+        
         Returns:
             Result of the main logic execution
         """
+        pipeline = self.build_pipeline()
+        if pipeline is not None:
+            self.logger.info("Running main application pipeline...")
+            return pipeline.run(token=self._current_token())
+        
         # Placeholder implementation
         self.logger.info("Executing main application logic...")
         return "Hello from Skeleton Project!"
     
+    def build_pipeline(self) -> Optional[Pipeline]:
+        """
+        Build a streaming pipeline for the main application logic.
+        
+        Override this method in subclasses to process data as a chain
+        of source, map/filter and sink stages, for example::
+        
+            def build_pipeline(self):
+                return (
+                    Pipeline(read_records(self.config["input"]))
+                    .map(transform, threaded=True)
+                    .sink(write_records)
+                )
+        
+        Returns:
+            Pipeline to run, or None to use the default logic
+        """
+        return None
+    
+    async def _execute_main_logic_async(self) -> Any:
+        """
+        Execute the main application logic without blocking the loop.
+        
+        Override this method in subclasses whose logic waits on I/O.
+        The default implementation runs _execute_main_logic() in the
+        event loop's default executor. A thread cannot be interrupted,
+        so when the run is cancelled this waits until the main logic
+        notices at its next check_cancelled() and returns.
+        
+        Returns:
+            Result of the main logic execution
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            None, self._execute_main_logic_in_thread, self.cancel_token
+        )
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait({future})
+            raise
+    
+    def _execute_main_logic_in_thread(
+        self, token: Optional[CancellationToken]
+    ) -> Any:
+        """Run _execute_main_logic() on an executor thread with ``token``."""
+        reset = _EXECUTOR_TOKEN.set(token)
+        try:
+            return self._execute_main_logic()
+        finally:
+            _EXECUTOR_TOKEN.reset(reset)
+    
     def get_status(self) -> Dict[str, Any]:
         """
         Get the current application status.
@@ -82,9 +680,87 @@ class SkeletonApp:
         Returns:
             Dictionary containing status information
         """
-        return {
+        status: Dict[str, Any] = {
             "app_name": self.config["app_name"],
             "version": self.config["version"],
             "debug": self.config.get("debug", False),
             "config": self.config,
-        } 
\ No newline at end of file
+        }
+        if self.result_cache is not None:
+            status["result_cache"] = self.result_cache.stats()
+        if self.config_watcher is not None:
+            status["config_reload"] = self.config_watcher.stats()
+        status["metrics"] = REGISTRY.snapshot()
+        return status
+
+
+async def _await_cancellable(
+    awaitable: Awaitable[Any], token: CancellationToken
+) -> Any:
+    """
+    Await ``awaitable`` until it finishes or ``token`` is cancelled.
+    
+    Raises:
+        RunCancelled: If the token was cancelled; the awaitable is
+            cancelled first
+        RunTimedOut: If the token's deadline passed
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            remaining = token.remaining()
+            poll = CANCEL_POLL_INTERVAL
+            if remaining is not None:
+                poll = min(poll, remaining)
+            done, _ = await asyncio.wait({task}, timeout=poll)
+            if done:
+                return task.result()
+            if token.cancelled:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+                token.raise_if_cancelled()
+    except asyncio.CancelledError:
+        # The run itself was cancelled: stop the main logic as well
+        token.cancel("Run task cancelled")
+        task.cancel()
+        raise
+
+
+async def gather_runs(
+    apps: Iterable[SkeletonApp], limit: int = 100
+) -> List[int]:
+    """
+    Run many applications concurrently on the current event loop.
+    
+    At most ``limit`` runs are in flight at once and ``apps`` is
+    consumed lazily, so it may be a generator.
+    
+    Args:
+        apps: Applications to run
+        limit: Maximum number of concurrent runs
+        
+    Returns:
+        Exit codes in the same order as ``apps``
+        
+    Raises:
+        ValueError: If limit is less than 1
+    """
+    if limit < 1:
+        raise ValueError(f"Invalid concurrency limit: {limit}")
+    
+    exit_codes: Dict[int, int] = {}
+    jobs = enumerate(apps)
+    
+    async def worker() -> None:
+        for index, app in jobs:
+            exit_codes[index] = await app.run_async()
+    
+    tasks = [asyncio.ensure_future(worker()) for _ in range(limit)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    return [exit_codes[index] for index in range(len(exit_codes))]
\ No newline at end of file
@@ -0,0 +1,502 @@
+"""
+Resident daemon running CLI jobs for thin clients.
+"""
+
+import argparse
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import select
+import signal
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from types import FrameType
+from typing import (
+    Any, Callable, Dict, Iterator, List, Mapping, NoReturn, Optional, TextIO
+)
+
+from .cancellation import CancellationToken, RunCancelled
+from .cli import build_config, create_parser
+from .config import env_layer, load_config_file, validate_config
+from .config_watcher import ConfigWatcher
+from .core import CONFIG_RELOADS_TOTAL, CONFIG_SWAP_SECONDS, SkeletonApp
+from .metrics import PrometheusFileExporter
+from .utils import DEFAULT_FORMAT
+
+# Upper bound on the size of a single job request
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# How often a job checks whether its client went away, and a queued job
+# whether it was cancelled while waiting for a slot
+DISCONNECT_POLL_INTERVAL = 0.1
+
+Send = Callable[[Dict[str, Any]], None]
+
+# Options configuring the daemon's own logging or profiling, which a job
+# cannot change; set them when starting the daemon instead
+UNSUPPORTED_JOB_OPTIONS = (
+    ("debug", "--debug"),
+    ("log_file", "--log-file"),
+    ("log_max_bytes", "--log-max-bytes"),
+    ("log_max_age", "--log-max-age"),
+    ("log_backups", "--log-backups"),
+    ("log_compress", "--log-compress"),
+    ("log_rate_limit", "--log-rate-limit"),
+    ("log_burst", "--log-burst"),
+    ("log_sample", "--log-sample"),
+    ("flight_recorder", "--flight-recorder"),
+    ("flight_records", "--flight-records"),
+    ("log_format", "--log-format"),
+    ("log_async", "--log-async"),
+    ("log_queue_size", "--log-queue-size"),
+    ("log_overflow", "--log-overflow"),
+    ("profile", "--profile"),
+    ("profile_top", "--profile-top"),
+)
+
+# Job whose log records the current thread or task emits; copied into
+# threads the job starts, e.g. threaded pipeline stages
+_current_job: "contextvars.ContextVar[Optional[object]]" = contextvars.ContextVar(
+    "skeleton_daemon_job", default=None
+)
+
+
+class JobRejected(Exception):
+    """Raised when a job's arguments cannot be run by the daemon."""
+    
+    def __init__(self, message: str, exit_code: int = 2) -> None:
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+class _JobArgumentParser(argparse.ArgumentParser):
+    """Argument parser reporting errors instead of exiting the daemon."""
+    
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.messages: List[str] = []
+    
+    def _print_message(self, message: str, file: Optional[TextIO] = None) -> None:
+        if message:
+            self.messages.append(message)
+    
+    def exit(self, status: int = 0, message: Optional[str] = None) -> NoReturn:
+        if message:
+            self.messages.append(message)
+        raise JobRejected("".join(self.messages).rstrip(), status)
+
+
+class _JobLogHandler(logging.Handler):
+    """Forward log records emitted on behalf of one job to its client."""
+    
+    def __init__(self, send: Send, job: object, level: int) -> None:
+        super().__init__(level)
+        self._send = send
+        self._job = job
+        self.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        if _current_job.get() is not self._job:
+            return
+        try:
+            self._send({"type": "log", "line": self.format(record)})
+        except OSError:
+            # The client went away; the job is being cancelled
+            pass
+        except Exception:
+            self.handleError(record)
+
+
+class _JobRequestHandler(socketserver.StreamRequestHandler):
+    """Handle one client connection: one request line, one job."""
+    
+    server: "_DaemonServer"
+    
+    def handle(self) -> None:
+        """Read the request line and run the job it describes."""
+        # Cancels the job when the client disconnects, e.g. on Ctrl-C
+        token = CancellationToken()
+        
+        def send(message: Dict[str, Any]) -> None:
+            try:
+                self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except OSError:
+                token.cancel("Client disconnected")
+                raise
+        
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        if not line:
+            # Connection probe, or the client went away
+            return
+        
+        done = threading.Event()
+        watcher = threading.Thread(
+            target=self._watch_disconnect,
+            args=(token, done),
+            name="daemon-client-watch",
+            daemon=True,
+        )
+        watcher.start()
+        try:
+            self._run_request(line, send, token)
+        except (BrokenPipeError, ConnectionResetError):
+            logging.getLogger(__name__).debug("Client disconnected early")
+        finally:
+            done.set()
+            watcher.join()
+    
+    def _watch_disconnect(
+        self, token: CancellationToken, done: threading.Event
+    ) -> None:
+        """Cancel ``token`` once the client closes its end of the socket."""
+        while not done.is_set():
+            readable, _, _ = select.select(
+                [self.connection], [], [], DISCONNECT_POLL_INTERVAL
+            )
+            if not readable:
+                continue
+            try:
+                # Clients send nothing after the request line
+                data = self.connection.recv(4096)
+            except OSError:
+                data = b""
+            if not data:
+                token.cancel("Client disconnected")
+                return
+    
+    def _run_request(
+        self, line: bytes, send: Send, token: CancellationToken
+    ) -> None:
+        """Validate a request, run its job and send the exit code."""
+        try:
+            request = json.loads(line)
+            argv = request["argv"]
+            if not isinstance(argv, list) or not all(
+                isinstance(arg, str) for arg in argv
+            ):
+                raise ValueError("argv must be a list of strings")
+            cwd = request.get("cwd")
+            if cwd is not None and not isinstance(cwd, str):
+                raise ValueError("cwd must be a string")
+        except (ValueError, KeyError, TypeError) as e:
+            send({"type": "error", "message": f"Invalid request: {e}"})
+            send({"type": "exit", "code": 2})
+            return
+        
+        try:
+            exit_code = self.server.daemon.run_job(argv, send, token, cwd)
+        except JobRejected as e:
+            # --help and --version end the job successfully
+            kind = "output" if e.exit_code == 0 else "error"
+            send({"type": kind, "message": str(e)})
+            exit_code = e.exit_code
+        send({"type": "exit", "code": exit_code})
+
+
+class _RootLevel:
+    """Lower the root logger level while jobs want records below it."""
+    
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._levels: List[int] = []
+        self._base = logging.NOTSET
+    
+    @contextlib.contextmanager
+    def at_most(self, level: int) -> Iterator[None]:
+        """Let records of ``level`` and above through inside the block."""
+        root = logging.getLogger()
+        with self._lock:
+            if not self._levels:
+                self._base = root.level
+            self._levels.append(level)
+            root.setLevel(min([self._base, *self._levels]))
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._levels.remove(level)
+                root.setLevel(min([self._base, *self._levels]))
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server handing requests to a SkeletonDaemon."""
+    
+    daemon_threads = True
+    
+    def __init__(self, socket_path: Path, daemon: "SkeletonDaemon") -> None:
+        self.daemon = daemon
+        super().__init__(str(socket_path), _JobRequestHandler)
+
+
+class SkeletonDaemon:
+    """
+    Keep the application warm and run CLI jobs sent over a Unix socket.
+    
+    Each connection carries one job: the client sends its command-line
+    arguments and working directory as a JSON line and receives the
+    job's log lines followed by its exit code. Imports, logging and the
+    environment layer of the configuration are set up once for the
+    lifetime of the daemon, so a job costs about one round trip plus the
+    work itself.
+    
+    At most ``max_jobs`` jobs run at once; further jobs wait for a slot.
+    A job is cancelled when its client disconnects.
+    
+    With a ``config_file`` the daemon watches the file while it serves:
+    jobs that name no config file of their own use its current content
+    as their file layer, so edits apply from the next job on. A job's
+    own config file is resolved against the client's working directory
+    and must exist.
+    """
+    
+    def __init__(
+        self,
+        socket_path: Path,
+        env: Optional[Mapping[str, Any]] = None,
+        max_jobs: Optional[int] = None,
+        config_file: Optional[Path] = None,
+        config_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the daemon.
+        
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            env: Environment configuration layer shared by all jobs
+                (defaults to the daemon's SKELETON_* variables)
+            max_jobs: Maximum number of jobs running at once (defaults
+                to the CPU count)
+            config_file: JSON or TOML configuration file for jobs,
+                reloaded when it changes
+            config_interval: Seconds between checks of ``config_file``
+            
+        Raises:
+            OSError: If ``config_file`` cannot be read
+            ValueError: If ``config_file`` is not a valid configuration
+        """
+        if max_jobs is None:
+            max_jobs = os.cpu_count() or 1
+        if max_jobs < 1:
+            raise ValueError(f"Invalid number of daemon jobs: {max_jobs}")
+        self.socket_path = socket_path
+        self.max_jobs = max_jobs
+        self.env = env_layer() if env is None else env
+        self.config_file = config_file
+        self.config_watcher: Optional[ConfigWatcher] = None
+        self._file_config: Optional[Dict[str, Any]] = None
+        if config_file is not None:
+            self._file_config = load_config_file(config_file)
+            validate_config(self._file_config)
+            self.config_watcher = ConfigWatcher(
+                config_file, self._on_config_change, interval=config_interval
+            )
+        self.logger = logging.getLogger(__name__)
+        self._server: Optional[_DaemonServer] = None
+        self._ready = threading.Event()
+        self._root_level = _RootLevel()
+        self._job_slots = threading.BoundedSemaphore(max_jobs)
+    
+    def run_job(
+        self,
+        argv: List[str],
+        send: Send,
+        token: Optional[CancellationToken] = None,
+        cwd: Optional[str] = None,
+    ) -> int:
+        """
+        Run one job in the calling thread once a job slot is free.
+        
+        Args:
+            argv: Command-line arguments of the job
+            send: Callable delivering messages to the client
+            token: Optional token cancelling the job, e.g. when the
+                client disconnects; the job's --timeout is added to it
+            cwd: Working directory of the client, against which relative
+                paths in ``argv`` are resolved (the daemon's if not given)
+            
+        Returns:
+            Exit code of the job
+            
+        Raises:
+            JobRejected: If the arguments are invalid or ask for
+                something the daemon cannot do on a client's behalf
+        """
+        parser = create_parser(parser_class=_JobArgumentParser)
+        args = parser.parse_args(argv)
+        if (
+            args.command is not None
+            or args.connect
+            or args.daemon_socket is not None
+        ):
+            raise JobRejected(
+                "Subcommands and --connect cannot be sent to the daemon"
+            )
+        unsupported = [
+            option for dest, option in UNSUPPORTED_JOB_OPTIONS
+            if getattr(args, dest) != parser.get_default(dest)
+        ]
+        if unsupported:
+            verb = "is" if len(unsupported) == 1 else "are"
+            raise JobRejected(
+                f"{', '.join(unsupported)} {verb} not supported for daemon "
+                "jobs; configure logging and profiling when starting the daemon"
+            )
+        if args.config_file is not None:
+            # The daemon's working directory is not the client's
+            args.config_file = Path(cwd or os.getcwd()) / args.config_file
+            if not args.config_file.is_file():
+                raise JobRejected(f"Config file not found: {args.config_file}")
+        
+        level = getattr(logging, args.log_level)
+        job = object()
+        handler = _JobLogHandler(send, job, level)
+        root = logging.getLogger()
+        context = _current_job.set(job)
+        root.addHandler(handler)
+        try:
+            try:
+                config = build_config(args, args.log_file, env=self.env)
+            except (OSError, ValueError) as e:
+                raise JobRejected(
+                    f"Could not load config file {args.config_file}: {e}"
+                ) from e
+            file_config = self._file_config
+            if args.config_file is None and file_config is not None:
+                config = config.with_layer("file", file_config)
+            token = token or CancellationToken()
+            if args.timeout is not None:
+                token.deadline = time.monotonic() + args.timeout
+            try:
+                self._wait_for_slot(token)
+            except RunCancelled as e:
+                self.logger.info("Job cancelled while queued: %s", e)
+                return e.exit_code
+            try:
+                with self._root_level.at_most(level):
+                    return SkeletonApp(config).run(token)
+            finally:
+                self._job_slots.release()
+        finally:
+            root.removeHandler(handler)
+            _current_job.reset(context)
+    
+    def _on_config_change(
+        self, file_config: Dict[str, Any], detected_at: float
+    ) -> None:
+        """Use a reloaded config file for the jobs started from now on."""
+        self._file_config = file_config
+        CONFIG_RELOADS_TOTAL.inc()
+        if self.config_watcher is not None:
+            CONFIG_SWAP_SECONDS.observe(self.config_watcher.record_swap(detected_at))
+    
+    def _wait_for_slot(self, token: CancellationToken) -> None:
+        """Take a job slot, giving up if ``token`` is cancelled meanwhile."""
+        while not self._job_slots.acquire(timeout=DISCONNECT_POLL_INTERVAL):
+            token.raise_if_cancelled()
+    
+    def serve_forever(self) -> None:
+        """Listen for jobs until shutdown() is called."""
+        self._remove_stale_socket()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Only the owner may submit jobs
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _DaemonServer(self.socket_path, self)
+        finally:
+            os.umask(old_umask)
+        
+        self.logger.info("Daemon listening on %s", self.socket_path)
+        if self.config_watcher is not None:
+            self.config_watcher.start()
+        self._ready.set()
+        try:
+            self._server.serve_forever()
+        finally:
+            if self.config_watcher is not None:
+                self.config_watcher.stop()
+            self._server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+            self._server = None
+            self._ready.clear()
+            self.logger.info("Daemon stopped")
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the daemon accepts connections."""
+        return self._ready.wait(timeout)
+    
+    def shutdown(self) -> None:
+        """Stop serve_forever() from another thread."""
+        if self._server is not None:
+            self._server.shutdown()
+    
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file left behind by a daemon that died."""
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise RuntimeError(
+                f"A daemon is already listening on {self.socket_path}"
+            )
+        finally:
+            probe.close()
+
+
+def serve(
+    socket_path: Path,
+    max_jobs: Optional[int] = None,
+    config_file: Optional[Path] = None,
+) -> int:
+    """
+    Run a daemon in the foreground until interrupted or terminated.
+    
+    Args:
+        socket_path: Path of the Unix socket to listen on
+        max_jobs: Maximum number of jobs running at once (defaults to
+            the CPU count)
+        config_file: Configuration file for jobs, reloaded when it
+            changes
+        
+    Returns:
+        Exit code (0 after a clean shutdown, 1 if the daemon failed)
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        logging.getLogger(__name__).error("Unix sockets are not supported here")
+        return 1
+    
+    def terminate(signum: int, frame: Optional[FrameType]) -> None:
+        raise KeyboardInterrupt
+    
+    try:
+        daemon = SkeletonDaemon(
+            socket_path, max_jobs=max_jobs, config_file=config_file
+        )
+    except (OSError, ValueError) as e:
+        logging.getLogger(__name__).error(
+            "Could not load config file %s: %s", config_file, e
+        )
+        return 1
+    
+    signal.signal(signal.SIGTERM, terminate)
+    exporter = PrometheusFileExporter().start()
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except (OSError, RuntimeError) as e:
+        logging.getLogger(__name__).error("Daemon failed: %s", e)
+        return 1
+    finally:
+        exporter.stop()
+    return 0
@@ -0,0 +1,446 @@
+"""
+Flight recorder: the most recent log records in a memory-mapped ring buffer.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import time
+import traceback
+import weakref
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+FLIGHT_RECORDER_FILE = "flight-recorder.bin"
+
+_MAGIC = b"SKFR"
+_VERSION = 1
+# magic, version, reserved, slot size, capacity, sequence number of the
+# last record written
+_HEADER = struct.Struct("<4sHHIIQ")
+_HEADER_SIZE = 64
+_LAST_SEQ = struct.Struct("<Q")
+_LAST_SEQ_OFFSET = 16
+# sequence number (0 while the slot is written), created, level, name
+# length, message length; followed by the name and message in UTF-8
+_SLOT = struct.Struct("<QdHHH")
+_MAX_NAME = 128
+
+# Open recorders of this process, for dump_flight_recorders()
+_recorders: "weakref.WeakSet[FlightRecorder]" = weakref.WeakSet()
+
+
+class FlightRecord(NamedTuple):
+    """One record decoded from a flight recorder file."""
+
+    seq: int
+    created: float
+    levelno: int
+    name: str
+    message: str
+
+    def to_log_record(self) -> logging.LogRecord:
+        """
+        Convert to a LogRecord, e.g. to format it like live logs.
+
+        Returns:
+            LogRecord with the recorded time, level, name and message
+        """
+        return logging.makeLogRecord({
+            "name": self.name,
+            "msg": self.message,
+            "levelno": self.levelno,
+            "levelname": logging.getLevelName(self.levelno),
+            "created": self.created,
+            "msecs": (self.created - int(self.created)) * 1000,
+        })
+
+
+class FlightRecorder(logging.Handler):
+    """
+    Handler keeping the last ``capacity`` records in a ring buffer file.
+
+    Each record is written into a fixed-size slot of a memory-mapped
+    file: no formatting beyond the message itself, no write() calls and
+    no flushing, so leaving it on at DEBUG level costs little even when
+    the console only shows warnings. The file survives the process; call
+    dump() (SkeletonApp.run() does so when it fails) to keep a snapshot
+    of the records leading up to a failure, and read_flight_records() to
+    decode it.
+
+    Messages longer than a slot are truncated. Only the process that
+    opened the recorder writes to it; forked children leave it alone.
+    Processes that find the file in use record into a file of their own,
+    ``<stem>.<pid>.bin``, which is deleted when the recorder is closed;
+    at most ``max_dumps`` of those left by processes that died are kept.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        capacity: int = 4096,
+        slot_size: int = 512,
+        max_dumps: int = 10,
+    ) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            path: Ring buffer file, created if needed; if another
+                process holds it, a per-process file next to it is used
+            capacity: Number of records kept
+            slot_size: Bytes per record, including a 22-byte header
+            max_dumps: Number of dumps, and of per-process files of dead
+                processes, kept next to the ring buffer
+        """
+        if capacity < 1:
+            raise ValueError(f"Invalid flight recorder capacity: {capacity}")
+        if slot_size < _SLOT.size + 32:
+            raise ValueError(f"Invalid flight recorder slot size: {slot_size}")
+
+        super().__init__(logging.DEBUG)
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self.max_dumps = max_dumps
+        self._payload = slot_size - _SLOT.size
+        self._exc_formatter = logging.Formatter()
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Dumps are named after the requested file even when a
+        # per-process file is used, so they all sort together
+        self._dump_stem = path.stem
+        self._fd, self.path = _open_locked(path, max_dumps)
+        self._private = self.path != path
+        try:
+            self._map: Optional[mmap.mmap] = None
+            self._seq = self._map_file()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        _recorders.add(self)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            if not record.exc_info:
+                self._write(record.created, record.levelno, record.name, message)
+                return
+            message = (
+                f"{message}\n{self._exc_formatter.formatException(record.exc_info)}"
+            )
+            self._write(
+                record.created, record.levelno, record.name, message, keep_tail=True
+            )
+        except Exception:
+            self.handleError(record)
+
+    def dump(
+        self, error: Optional[BaseException] = None, directory: Optional[Path] = None
+    ) -> Optional[Path]:
+        """
+        Save a snapshot of the ring buffer.
+
+        Args:
+            error: Exception whose traceback is recorded as the last
+                record of the snapshot
+            directory: Where to write the dump (defaults to the
+                directory of the ring buffer)
+
+        Returns:
+            Path of the dump, or None if the recorder is closed
+        """
+        self.acquire()
+        try:
+            if self._map is None:
+                return None
+            if error is not None:
+                self._write(
+                    time.time(), logging.ERROR, __name__,
+                    "".join(traceback.format_exception(
+                        type(error), error, error.__traceback__
+                    )).rstrip("\n"),
+                    keep_tail=True,
+                )
+            data = self._map[:]
+        finally:
+            self.release()
+
+        directory = Path(directory) if directory is not None else self.path.parent
+        target = _dump_name(directory, self._dump_stem)
+        tmp_path = target.with_name(target.name + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, target)
+
+        dumps = find_flight_dumps(directory, self._dump_stem)
+        for old in dumps[:max(0, len(dumps) - self.max_dumps)]:
+            old.unlink(missing_ok=True)
+        return target
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            _recorders.discard(self)
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._fd >= 0:
+                if self._private:
+                    # Nobody else writes to it; dumps keep what matters
+                    self.path.unlink(missing_ok=True)
+                os.close(self._fd)
+                self._fd = -1
+            super().close()
+        finally:
+            self.release()
+
+    def _map_file(self) -> int:
+        """Map the ring buffer, keeping records of a compatible file."""
+        size = _HEADER_SIZE + self.capacity * self.slot_size
+        header = os.read(self._fd, _HEADER.size)
+        last_seq = 0
+        if len(header) == _HEADER.size and os.fstat(self._fd).st_size == size:
+            magic, version, _, slot_size, capacity, seq = _HEADER.unpack(header)
+            if (magic, version, slot_size, capacity) == (
+                _MAGIC, _VERSION, self.slot_size, self.capacity
+            ):
+                last_seq = seq
+
+        if not last_seq:
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        _HEADER.pack_into(
+            self._map, 0, _MAGIC, _VERSION, 0, self.slot_size, self.capacity, last_seq
+        )
+        return last_seq
+
+    def _write(
+        self,
+        created: float,
+        levelno: int,
+        name: str,
+        message: str,
+        keep_tail: bool = False,
+    ) -> None:
+        """
+        Write one record into the next slot; the caller holds the lock.
+
+        Messages that do not fit are cut at the end, or at the start
+        with ``keep_tail`` (for tracebacks, whose last lines matter most).
+        """
+        buffer = self._map
+        if buffer is None:
+            return
+        seq = self._seq = self._seq + 1
+        offset = _HEADER_SIZE + (seq - 1) % self.capacity * self.slot_size
+
+        # In small slots the name may take at most half of the payload
+        max_name = min(_MAX_NAME, self._payload // 2)
+        name_bytes = name.encode("utf-8", "replace")[:max_name]
+        message_bytes = message.encode("utf-8", "replace")
+        room = self._payload - len(name_bytes)
+        if len(message_bytes) > room:
+            message_bytes = message_bytes[-room:] if keep_tail else message_bytes[:room]
+        # Readers skip a slot whose sequence number is still 0, so a
+        # crash halfway through never leaves a torn record
+        _SLOT.pack_into(
+            buffer, offset, 0, created, min(levelno, 0xFFFF),
+            len(name_bytes), len(message_bytes),
+        )
+        start = offset + _SLOT.size
+        middle = start + len(name_bytes)
+        buffer[start:middle] = name_bytes
+        buffer[middle:middle + len(message_bytes)] = message_bytes
+        _LAST_SEQ.pack_into(buffer, offset, seq)
+        _LAST_SEQ.pack_into(buffer, _LAST_SEQ_OFFSET, seq)
+
+    def _detach(self) -> None:
+        """Stop writing without touching the file (in a forked child)."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def dump_flight_recorders(error: Optional[BaseException] = None) -> List[Path]:
+    """
+    Dump every open flight recorder of this process.
+
+    Args:
+        error: Exception whose traceback is added to each dump
+
+    Returns:
+        Paths of the dumps written
+    """
+    paths = []
+    for recorder in list(_recorders):
+        try:
+            path = recorder.dump(error)
+        except OSError:
+            logging.getLogger(__name__).warning(
+                "Could not dump flight recorder %s", recorder.path, exc_info=True
+            )
+            continue
+        if path is not None:
+            paths.append(path)
+    return paths
+
+
+def find_flight_dumps(directory: Path, stem: str = "flight-recorder") -> List[Path]:
+    """
+    Find flight recorder dumps, oldest first.
+
+    Args:
+        directory: Directory holding the dumps
+        stem: File name stem of the ring buffer they were taken from
+
+    Returns:
+        Paths of the dumps
+    """
+    return sorted(Path(directory).glob(f"{stem}-[0-9]*.dump"))
+
+
+def find_flight_buffers(
+    directory: Path, stem: str = "flight-recorder"
+) -> List[Path]:
+    """
+    Find flight recorder ring buffers, least recently written first.
+
+    Args:
+        directory: Directory holding the ring buffers
+        stem: File name stem of the shared ring buffer
+
+    Returns:
+        Paths of the shared ring buffer and of per-process ones
+    """
+    directory = Path(directory)
+    paths = list(directory.glob(f"{stem}.[0-9]*.bin"))
+    if (directory / f"{stem}.bin").exists():
+        paths.append(directory / f"{stem}.bin")
+    return sorted(paths, key=_mtime)
+
+
+def read_flight_records(path: Path) -> List[FlightRecord]:
+    """
+    Decode a flight recorder file or dump.
+
+    Args:
+        path: Ring buffer file or dump
+
+    Returns:
+        Records in the order they were logged
+
+    Raises:
+        ValueError: If the file is not a flight recorder file
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER_SIZE or data[:4] != _MAGIC:
+        raise ValueError(f"Not a flight recorder file: {path}")
+    _, version, _, slot_size, capacity, _ = _HEADER.unpack_from(data)
+    if version != _VERSION:
+        raise ValueError(f"Unsupported flight recorder version: {version}")
+
+    records = []
+    for index in range(capacity):
+        offset = _HEADER_SIZE + index * slot_size
+        if offset + slot_size > len(data):
+            break
+        seq, created, levelno, name_length, message_length = _SLOT.unpack_from(
+            data, offset
+        )
+        if not seq:
+            continue
+        start = offset + _SLOT.size
+        middle = start + name_length
+        records.append(FlightRecord(
+            seq,
+            created,
+            levelno,
+            data[start:middle].decode("utf-8", "replace"),
+            data[middle:middle + message_length].decode("utf-8", "replace"),
+        ))
+    records.sort()
+    return records
+
+
+def _open_locked(path: Path, keep_stale: int) -> Tuple[int, Path]:
+    """Open the ring buffer, or a per-process one if it is in use."""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    if fcntl is None:
+        return fd, path
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd, path
+    except OSError:
+        os.close(fd)
+
+    _prune_process_buffers(path, keep_stale)
+    path = path.with_name(f"{path.stem}.{os.getpid()}{path.suffix}")
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+    # Marks the file as in use for _prune_process_buffers()
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd, path
+
+
+def _prune_process_buffers(path: Path, keep: int) -> None:
+    """Delete all but the newest ``keep`` per-process files not in use."""
+    stale = []
+    try:
+        for other in path.parent.glob(f"{path.stem}.[0-9]*{path.suffix}"):
+            try:
+                fd = os.open(other, os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Still recording
+                os.close(fd)
+                continue
+            stale.append((_mtime(other), other, fd))
+        stale.sort()
+        for _, other, _ in stale[:max(0, len(stale) - keep)]:
+            other.unlink(missing_ok=True)
+    finally:
+        for _, _, fd in stale:
+            os.close(fd)
+
+
+def _mtime(path: Path) -> float:
+    """Get the modification time of a file, or 0 if it is gone."""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
+
+
+def _dump_name(directory: Path, stem: str) -> Path:
+    """Get an unused dump name; names sort by time."""
+    micros = int(time.time() * 1_000_000)
+    while True:
+        seconds, fraction = divmod(micros, 1_000_000)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(seconds))
+        target = directory / f"{stem}-{stamp}-{fraction:06d}.dump"
+        if not target.exists():
+            return target
+        micros += 1
+
+
+def _detach_after_fork() -> None:
+    """Keep forked children from writing into the parent's ring buffer."""
+    for recorder in list(_recorders):
+        recorder._detach()
+    _recorders.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_detach_after_fork)
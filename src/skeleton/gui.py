@@ -2,9 +2,19 @@
 Graphical user interface for the skeleton project using wxPython.
 """
 
+import itertools
+import os
 import sys
 import threading
-from typing import Optional
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any, Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+)
 
 try:
     import wx
@@ -14,27 +24,954 @@ except ImportError:
     wx = None
     WX_AVAILABLE = False
 
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
 # Handle both relative and absolute imports
 try:
-    from .core import SkeletonApp
-    from .utils import setup_logging, get_version
+    from .cancellation import (
+        EXIT_CANCELLED, EXIT_TIMEOUT, CancellationToken, RunCancelled
+    )
+    from .config import (
+        LayeredConfig, env_layer, load_config_file, validate_config
+    )
+    from .config_watcher import ConfigWatcher
+    from .core import (
+        CONFIG_RELOADS_TOTAL, CONFIG_SWAP_SECONDS, RUN_SECONDS, RUNS_TOTAL,
+        SkeletonApp,
+    )
+    from .metrics import (
+        Counter, Histogram, PrometheusFileExporter, estimate_percentile
+    )
+    from .progress import Progress, format_progress
+    from .utils import setup_logging, get_version, get_config_dir
 except ImportError:
     # If running as __main__, try absolute imports
     try:
-        from skeleton.core import SkeletonApp
-        from skeleton.utils import setup_logging, get_version
+        from skeleton.cancellation import (
+            EXIT_CANCELLED, EXIT_TIMEOUT, CancellationToken, RunCancelled
+        )
+        from skeleton.config import (
+            LayeredConfig, env_layer, load_config_file, validate_config
+        )
+        from skeleton.config_watcher import ConfigWatcher
+        from skeleton.core import (
+            CONFIG_RELOADS_TOTAL, CONFIG_SWAP_SECONDS, RUN_SECONDS, RUNS_TOTAL,
+            SkeletonApp,
+        )
+        from skeleton.metrics import (
+            Counter, Histogram, PrometheusFileExporter, estimate_percentile
+        )
+        from skeleton.progress import Progress, format_progress
+        from skeleton.utils import setup_logging, get_version, get_config_dir
     except ImportError:
         # Last resort - add parent directory to path
-        import os
-        from pathlib import Path
         parent_dir = Path(__file__).parent.parent.parent / "src"
         sys.path.insert(0, str(parent_dir))
         
-        from skeleton.core import SkeletonApp
-        from skeleton.utils import setup_logging, get_version
+        from skeleton.cancellation import (
+            EXIT_CANCELLED, EXIT_TIMEOUT, CancellationToken, RunCancelled
+        )
+        from skeleton.config import (
+            LayeredConfig, env_layer, load_config_file, validate_config
+        )
+        from skeleton.config_watcher import ConfigWatcher
+        from skeleton.core import (
+            CONFIG_RELOADS_TOTAL, CONFIG_SWAP_SECONDS, RUN_SECONDS, RUNS_TOTAL,
+            SkeletonApp,
+        )
+        from skeleton.metrics import (
+            Counter, Histogram, PrometheusFileExporter, estimate_percentile
+        )
+        from skeleton.progress import Progress, format_progress
+        from skeleton.utils import setup_logging, get_version, get_config_dir
+
+
+# How often queued output is written to the output pane
+OUTPUT_FLUSH_INTERVAL_MS = 50
+
+# Lines queued for the output pane between two flushes
+OUTPUT_MAX_PENDING = 10000
+
+# Lines kept in the output pane; older lines are removed
+OUTPUT_MAX_LINES = 1000000
+
+# Lines an output search scans between two cancellation checks
+SEARCH_CHUNK_LINES = 10000
+
+# Steps of the progress gauge
+PROGRESS_GAUGE_RANGE = 1000
+
+# Configuration file in the configuration directory; edits apply to
+# runs started after the change
+GUI_CONFIG_FILE = "config.json"
+
+# Runs started from the GUI that execute at once; more clicks queue up
+GUI_MAX_WORKERS = 2
+
+# States of a RunJob
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# How often the dashboard takes a sample, and how many samples it plots
+DASHBOARD_INTERVAL_MS = 1000
+DASHBOARD_SAMPLES = 120
+
+# Run latency percentiles shown on the dashboard
+DASHBOARD_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+class OutputBuffer:
+    """
+    Thread-safe queue of output lines waiting to be displayed.
+    
+    Any thread can append() cheaply; the GUI thread collects everything
+    queued since the last flush with drain() and writes it in one go, so
+    a chatty worker costs one widget update per flush instead of one
+    event per line. At most ``max_lines`` lines are queued: if the GUI
+    falls behind, the oldest are dropped, as the output pane would have
+    scrolled them away anyway.
+    """
+    
+    def __init__(self, max_lines: int = OUTPUT_MAX_PENDING):
+        """
+        Initialize the buffer.
+        
+        Args:
+            max_lines: Maximum number of queued lines
+        """
+        if max_lines < 1:
+            raise ValueError(f"Invalid output buffer size: {max_lines}")
+        
+        self._lines: Deque[str] = deque(maxlen=max_lines)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        
+    def append(self, message: str) -> None:
+        """
+        Queue a message; multi-line messages count as several lines.
+        
+        Args:
+            message: Text to display
+        """
+        lines = message.split("\n")
+        with self._lock:
+            overflow = len(self._lines) + len(lines) - self._lines.maxlen
+            if overflow > 0:
+                self._dropped += overflow
+            self._lines.extend(lines)
+            
+    def drain(self) -> Tuple[List[str], int]:
+        """
+        Take all queued lines.
+        
+        Returns:
+            Tuple of (lines in order, number of lines dropped since the
+            last drain)
+        """
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+            dropped, self._dropped = self._dropped, 0
+        return lines, dropped
+
+
+class LineStore:
+    """
+    Compact, append-only store of output lines.
+    
+    Lines are kept UTF-8 encoded in one bytearray with an array of end
+    offsets, about 8 bytes of overhead per line instead of a Python
+    string each. Lines have absolute numbers that stay valid while the
+    store runs: when it holds more than ``max_lines``, the oldest lines
+    are dropped and ``first`` moves on. All methods are thread safe, so
+    a background thread can search() while the GUI thread appends.
+    """
+    
+    def __init__(self, max_lines: int = OUTPUT_MAX_LINES):
+        """
+        Initialize the store.
+        
+        Args:
+            max_lines: Maximum number of lines kept
+        """
+        if max_lines < 1:
+            raise ValueError(f"Invalid line store size: {max_lines}")
+        
+        self.max_lines = max_lines
+        self._data = bytearray()
+        # End offset in _data (after the newline) of each line
+        self._ends = array("Q")
+        # Leading entries of _ends that were dropped but not compacted
+        self._skip = 0
+        # Absolute number of the line at _ends[0]
+        self._base = 0
+        self._lock = threading.Lock()
+        
+    def __len__(self) -> int:
+        return len(self._ends) - self._skip
+    
+    @property
+    def first(self) -> int:
+        """Absolute number of the oldest line kept."""
+        return self._base + self._skip
+    
+    @property
+    def end(self) -> int:
+        """Absolute number the next line will get."""
+        return self._base + len(self._ends)
+    
+    def extend(self, lines: Iterable[str]) -> None:
+        """
+        Append lines, dropping the oldest beyond ``max_lines``.
+        
+        Args:
+            lines: Lines without newlines (any are replaced by spaces)
+        """
+        with self._lock:
+            data, ends = self._data, self._ends
+            for line in lines:
+                data += line.replace("\n", " ").encode("utf-8", "replace")
+                data += b"\n"
+                ends.append(len(data))
+            excess = len(ends) - self._skip - self.max_lines
+            if excess > 0:
+                self._skip += excess
+                if self._skip > len(ends) // 2:
+                    self._compact()
+                    
+    def get(self, index: int) -> Optional[str]:
+        """
+        Get a line by absolute number.
+        
+        Args:
+            index: Absolute line number
+            
+        Returns:
+            The line, or None if it was dropped or does not exist yet
+        """
+        with self._lock:
+            position = index - self._base
+            if not self._skip <= position < len(self._ends):
+                return None
+            start = self._ends[position - 1] if position else 0
+            return self._data[start:self._ends[position] - 1].decode(
+                "utf-8", "replace"
+            )
+            
+    def search(
+        self,
+        needle: str,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+        token: Optional[CancellationToken] = None,
+    ) -> "array[int]":
+        """
+        Find lines containing ``needle``, ignoring case.
+        
+        The store is locked for one chunk of lines at a time, so the GUI
+        thread can keep appending while a long search runs.
+        
+        Args:
+            needle: Text to look for
+            start: First absolute line number to search (default: first)
+            stop: Absolute line number to stop before (default: end)
+            token: Optional token, checked between chunks
+            
+        Returns:
+            Absolute numbers of the matching lines, ascending
+            
+        Raises:
+            RunCancelled: If the token was cancelled
+        """
+        needle = needle.casefold()
+        matches = array("q")
+        index = self.first if start is None else start
+        while True:
+            if token is not None:
+                token.raise_if_cancelled()
+            with self._lock:
+                index = max(index, self.first)
+                chunk_stop = min(self.end if stop is None else stop,
+                                 index + SEARCH_CHUNK_LINES)
+                if index >= chunk_stop:
+                    return matches
+                position = index - self._base
+                begin = self._ends[position - 1] if position else 0
+                text = self._data[begin:self._ends[chunk_stop - self._base - 1]]
+            lines = text.decode("utf-8", "replace").casefold().split("\n")
+            matches.extend(
+                index + offset for offset, line in enumerate(lines[:-1])
+                if needle in line
+            )
+            index = chunk_stop
+            
+    def _compact(self) -> None:
+        """Free the space of dropped lines; the caller holds the lock."""
+        cut = self._ends[self._skip - 1]
+        del self._data[:cut]
+        self._ends = array("Q", (end - cut for end in self._ends[self._skip:]))
+        self._base += self._skip
+        self._skip = 0
+
+
+class RunJob:
+    """One application run submitted to a RunExecutor."""
+    
+    __slots__ = (
+        "job_id", "token", "state", "exit_code", "error", "future", "progress"
+    )
+    
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self.token = CancellationToken()
+        self.state = JOB_QUEUED
+        self.exit_code: Optional[int] = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+        # Latest progress reported by the run
+        self.progress: Optional[Progress] = None
+        
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done, failed or cancelled."""
+        return self.state in JOB_FINISHED_STATES
+
+
+class RunExecutor:
+    """
+    Bounded pool running application runs for the GUI.
+    
+    At most ``max_workers`` runs execute at once; further submissions
+    wait in a queue that can be inspected with jobs() and cancelled job
+    by job. Each worker thread has its own application instance, so
+    concurrent runs never share state; discard_apps() makes the workers
+    create new ones, e.g. after a configuration change. ``on_change`` is called with a
+    job whenever its state changes, and ``on_progress`` whenever its
+    run reports progress (stored in ``job.progress``), on whichever
+    thread changed it.
+    """
+    
+    def __init__(
+        self,
+        app_factory: Callable[[], SkeletonApp] = SkeletonApp,
+        max_workers: int = GUI_MAX_WORKERS,
+        on_change: Optional[Callable[[RunJob], None]] = None,
+        on_progress: Optional[Callable[[RunJob], None]] = None,
+    ):
+        """
+        Initialize the executor.
+        
+        Args:
+            app_factory: Callable creating the application of a worker
+            max_workers: Maximum number of runs executing at once
+            on_change: Callback receiving a job after each state change
+            on_progress: Callback receiving a job after each progress
+                report of its run
+        """
+        if max_workers < 1:
+            raise ValueError(f"Invalid number of workers: {max_workers}")
+        
+        self.max_workers = max_workers
+        self._app_factory = app_factory
+        self._on_change = on_change
+        self._on_progress = on_progress
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="gui-run"
+        )
+        self._local = threading.local()
+        # Bumped by discard_apps(); workers recreate older applications
+        self._app_generation = 0
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, RunJob] = {}
+        self._lock = threading.Lock()
+        
+    def submit(self) -> RunJob:
+        """
+        Queue a run.
+        
+        Returns:
+            The queued job
+        """
+        job = RunJob(next(self._ids))
+        with self._lock:
+            self._jobs[job.job_id] = job
+            job.future = self._executor.submit(self._run, job)
+        self._notify(job)
+        return job
+    
+    def cancel(self, job_id: int, reason: str = "Cancelled by user") -> bool:
+        """
+        Cancel a queued or running job.
+        
+        A queued job is removed from the queue; a running one is asked
+        to stop through its cancellation token.
+        
+        Args:
+            job_id: Job to cancel
+            reason: Message of the RunCancelled raised in the run
+            
+        Returns:
+            True if the job was still pending
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.token.cancel(reason)
+            dequeued = job.future is not None and job.future.cancel()
+            if dequeued:
+                job.state = JOB_CANCELLED
+                del self._jobs[job_id]
+        if dequeued:
+            self._notify(job)
+        return True
+    
+    def cancel_all(self, reason: str = "Cancelled by user") -> None:
+        """
+        Cancel every queued and running job.
+        
+        Args:
+            reason: Message of the RunCancelled raised in the runs
+        """
+        for job in self.jobs():
+            self.cancel(job.job_id, reason)
+            
+    def jobs(self) -> List[RunJob]:
+        """
+        Get the queued and running jobs.
+        
+        Returns:
+            Jobs in submission order
+        """
+        with self._lock:
+            return list(self._jobs.values())
+        
+    def shutdown(self, reason: str = "Shutting down") -> None:
+        """
+        Cancel all jobs and stop the worker threads once they return.
+        
+        Args:
+            reason: Message of the RunCancelled raised in the runs
+        """
+        self.cancel_all(reason)
+        self._executor.shutdown(wait=False)
+        
+    def discard_apps(self) -> None:
+        """
+        Make every worker create a new application for its next run.
+        
+        Runs in progress keep the application they started with.
+        """
+        with self._lock:
+            self._app_generation += 1
+        
+    def _run(self, job: RunJob) -> None:
+        """Execute a job on a worker thread."""
+        with self._lock:
+            job.state = JOB_RUNNING
+        self._notify(job)
+        try:
+            generation = self._app_generation
+            app = getattr(self._local, "app", None)
+            if app is None or self._local.generation != generation:
+                app = self._local.app = self._app_factory()
+                self._local.generation = generation
+            if self._on_progress is not None:
+                # The worker's app runs one job at a time
+                app.set_progress_listener(
+                    lambda progress: self._report_progress(job, progress)
+                )
+            job.exit_code = app.run(job.token)
+            if job.exit_code == 0:
+                job.state = JOB_DONE
+            elif job.exit_code in (EXIT_CANCELLED, EXIT_TIMEOUT):
+                job.state = JOB_CANCELLED
+            else:
+                job.state = JOB_FAILED
+        except Exception as e:
+            job.error = str(e)
+            job.state = JOB_FAILED
+        finally:
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+            self._notify(job)
+            
+    def _notify(self, job: RunJob) -> None:
+        """Report a state change."""
+        if self._on_change is not None:
+            self._on_change(job)
+            
+    def _report_progress(self, job: RunJob, progress: Progress) -> None:
+        """Record and pass on the progress of a job's run."""
+        job.progress = progress
+        if self._on_progress is not None:
+            self._on_progress(job)
+
+
+def read_process_usage() -> Tuple[float, Optional[int]]:
+    """
+    Get the CPU time and resident memory of this process.
+    
+    Memory is read from /proc where it exists; elsewhere the peak
+    resident size reported by getrusage() stands in for it.
+    
+    Returns:
+        Tuple of (CPU seconds used so far, resident bytes or None if
+        unknown)
+    """
+    cpu = time.process_time()
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            pages = int(f.read().split()[1])
+        return cpu, pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return cpu, None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return cpu, peak if sys.platform == "darwin" else peak * 1024
+
+
+class DashboardSample(NamedTuple):
+    """Activity of the process during one dashboard interval."""
+    
+    runs_per_second: float
+    # Run latency in seconds at each of DASHBOARD_PERCENTILES, over the
+    # runs that finished in the interval (None without runs)
+    latencies: Tuple[Optional[float], ...]
+    cpu_percent: float
+    rss_bytes: Optional[int]
+    running: int
+    queued: int
+
+
+class DashboardSampler:
+    """
+    Ring buffer of dashboard samples taken from the run metrics.
+    
+    Each sample() turns the difference between two readings of the
+    cumulative run counter, latency histogram and CPU time into rates
+    and percentiles for the interval in between, so the dashboard shows
+    what is happening now rather than averages since startup.
+    """
+    
+    def __init__(
+        self,
+        jobs: Callable[[], Iterable[RunJob]] = lambda: (),
+        capacity: int = DASHBOARD_SAMPLES,
+        runs: Counter = RUNS_TOTAL,
+        latency: Histogram = RUN_SECONDS,
+    ):
+        """
+        Initialize the sampler.
+        
+        Args:
+            jobs: Callable getting the queued and running jobs, e.g.
+                RunExecutor.jobs
+            capacity: Number of samples kept
+            runs: Counter of runs started
+            latency: Histogram of run durations
+        """
+        if capacity < 1:
+            raise ValueError(f"Invalid number of dashboard samples: {capacity}")
+        
+        self.samples: Deque[DashboardSample] = deque(maxlen=capacity)
+        self._jobs = jobs
+        self._runs = runs
+        self._latency = latency
+        self._last = self._read()
+        
+    def sample(self) -> DashboardSample:
+        """
+        Take a sample covering the time since the previous one.
+        
+        Returns:
+            The new sample, also appended to ``samples``
+        """
+        now, runs, counts, cpu, rss = reading = self._read()
+        last_now, last_runs, last_counts, last_cpu, _ = self._last
+        self._last = reading
+        
+        elapsed = now - last_now
+        window = [new - old for new, old in zip(counts, last_counts)]
+        running = queued = 0
+        for job in self._jobs():
+            if job.state == JOB_RUNNING:
+                running += 1
+            elif job.state == JOB_QUEUED:
+                queued += 1
+        
+        sample = DashboardSample(
+            runs_per_second=(runs - last_runs) / elapsed if elapsed > 0 else 0.0,
+            latencies=tuple(
+                estimate_percentile(self._latency.buckets, window, q)
+                for q in DASHBOARD_PERCENTILES
+            ),
+            cpu_percent=100.0 * (cpu - last_cpu) / elapsed if elapsed > 0 else 0.0,
+            rss_bytes=rss,
+            running=running,
+            queued=queued,
+        )
+        self.samples.append(sample)
+        return sample
+    
+    def _read(self) -> Tuple[float, float, List[int], float, Optional[int]]:
+        """Read the cumulative values samples are computed from."""
+        cpu, rss = read_process_usage()
+        return (
+            time.monotonic(),
+            self._runs.value,
+            self._latency.bucket_counts(),
+            cpu,
+            rss,
+        )
+
+
+def format_dashboard_sample(sample: DashboardSample) -> str:
+    """
+    Format a dashboard sample as one line.
+    
+    Args:
+        sample: Sample to format
+        
+    Returns:
+        Line such as ``2.0 runs/s  p50 12ms p99 80ms  CPU 35%  RSS 48.2 MiB
+        running 2, queued 5``
+    """
+    latencies = " ".join(
+        f"p{q:g} {_format_seconds(value)}"
+        for q, value in zip(DASHBOARD_PERCENTILES, sample.latencies)
+    )
+    rss = "?" if sample.rss_bytes is None else f"{sample.rss_bytes / 2**20:.1f} MiB"
+    return (
+        f"{sample.runs_per_second:.1f} runs/s  {latencies}  "
+        f"CPU {sample.cpu_percent:.0f}%  RSS {rss}  "
+        f"running {sample.running}, queued {sample.queued}"
+    )
+
+
+def plot_points(
+    values: Sequence[Optional[float]],
+    width: int,
+    height: int,
+    top: float,
+    slots: int = DASHBOARD_SAMPLES,
+) -> List[List[Tuple[int, int]]]:
+    """
+    Scale a series of values to polylines in a plot area.
+    
+    The last value is drawn at the right edge and the others one step
+    of ``width / (slots - 1)`` apart to its left, so the plot scrolls as
+    samples arrive. Missing values split the series.
+    
+    Args:
+        values: Values, oldest first; None for gaps
+        width: Width of the plot area in pixels
+        height: Height of the plot area in pixels
+        top: Value drawn at the top edge (larger values are clipped)
+        slots: Number of values that fit the width
+        
+    Returns:
+        Polylines of (x, y) points relative to the top left corner
+    """
+    step = width / max(1, slots - 1)
+    offset = width - step * (len(values) - 1)
+    lines: List[List[Tuple[int, int]]] = []
+    current: List[Tuple[int, int]] = []
+    for index, value in enumerate(values):
+        if value is None:
+            if current:
+                lines.append(current)
+                current = []
+            continue
+        fraction = min(1.0, max(0.0, value / top)) if top > 0 else 0.0
+        current.append(
+            (round(offset + index * step), round((1.0 - fraction) * (height - 1)))
+        )
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    """Format a latency compactly, e.g. 850us, 12ms or 2.5s."""
+    if value is None:
+        return "-"
+    if value < 0.001:
+        return f"{value * 1e6:.0f}us"
+    if value < 1.0:
+        return f"{value * 1e3:.0f}ms"
+    return f"{value:.1f}s"
 
 
 if WX_AVAILABLE:
+    class OutputListCtrl(wx.ListCtrl):
+        """
+        Virtual list showing a LineStore, or the lines matching a filter.
+        
+        Only the rows on screen are ever asked for, so the control stays
+        fast however many lines the store holds.
+        """
+        
+        def __init__(self, parent, store: LineStore):
+            super().__init__(
+                parent,
+                style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_NO_HEADER
+                | wx.LC_SINGLE_SEL,
+                size=(-1, 200)
+            )
+            self.store = store
+            # Absolute line numbers shown while filtered
+            self.view: Optional["array[int]"] = None
+            self.InsertColumn(0, "Output")
+            self.Bind(wx.EVT_SIZE, self.on_size)
+            
+        def OnGetItemText(self, item, column):
+            """Get the text of a row (called by wx for visible rows)."""
+            if self.view is None:
+                index = self.store.first + item
+            elif item < len(self.view):
+                index = self.view[item]
+            else:
+                return ""
+            return self.store.get(index) or ""
+        
+        def set_view(self, view: Optional["array[int]"]):
+            """Show only the given lines, or every line with None."""
+            self.view = view
+            self.update(follow=True)
+            
+        def update(self, follow: Optional[bool] = None):
+            """
+            Resize to the current number of rows.
+            
+            Args:
+                follow: Scroll to the last row; by default only if it
+                    was visible before
+            """
+            old_count = self.GetItemCount()
+            if follow is None:
+                follow = self.GetTopItem() + self.GetCountPerPage() >= old_count
+            if self.view is not None:
+                # Forget lines the store dropped
+                del self.view[:bisect_left(self.view, self.store.first)]
+            count = len(self.store) if self.view is None else len(self.view)
+            self.SetItemCount(count)
+            if follow and count:
+                self.EnsureVisible(count - 1)
+            # Rows shift when old lines are dropped
+            self.Refresh()
+            
+        def on_size(self, event):
+            """Let the single column fill the control."""
+            self.SetColumnWidth(0, self.GetClientSize().width)
+            event.Skip()
+    
+    
+    class JobQueuePanel(wx.ScrolledWindow):
+        """List of queued and running jobs with their progress and a cancel button."""
+        
+        def __init__(self, parent, on_cancel: Callable[[int], None]):
+            super().__init__(parent, size=(-1, 80), style=wx.VSCROLL)
+            self.SetScrollRate(0, 10)
+            self.on_cancel = on_cancel
+            self.rows: Dict[int, Tuple[wx.StaticText, wx.Gauge, wx.Button]] = {}
+            self.sizer = wx.BoxSizer(wx.VERTICAL)
+            self.SetSizer(self.sizer)
+            
+        def update_job(self, job: RunJob):
+            """Add, relabel or remove the row of a job."""
+            row = self.rows.get(job.job_id)
+            if job.finished:
+                if row is not None:
+                    for widget in self.rows.pop(job.job_id):
+                        widget.Destroy()
+                    self.FitInside()
+                return
+            
+            if row is not None:
+                self.update_progress(job)
+                return
+            
+            text = wx.StaticText(self)
+            gauge = wx.Gauge(self, range=PROGRESS_GAUGE_RANGE, size=(120, -1))
+            button = wx.Button(self, label="Cancel", style=wx.BU_EXACTFIT)
+            button.Bind(wx.EVT_BUTTON, lambda event: self.on_cancel(job.job_id))
+            row_sizer = wx.BoxSizer(wx.HORIZONTAL)
+            row_sizer.Add(text, 1, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+            row_sizer.Add(gauge, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+            row_sizer.Add(button, 0)
+            self.sizer.Add(row_sizer, 0, wx.ALL | wx.EXPAND, 2)
+            self.rows[job.job_id] = (text, gauge, button)
+            self.update_progress(job)
+            self.FitInside()
+            
+        def update_progress(self, job: RunJob):
+            """Show the state and latest progress of a job in its row."""
+            row = self.rows.get(job.job_id)
+            if row is None:
+                # Reports can arrive after the job finished
+                return
+            text, gauge, _ = row
+            label = f"Run {job.job_id}: {job.state}"
+            progress = job.progress
+            if progress is not None:
+                label += f"  {format_progress(progress, width=0)}"
+                fraction = progress.fraction
+                if fraction is None:
+                    gauge.Pulse()
+                else:
+                    gauge.SetValue(int(fraction * PROGRESS_GAUGE_RANGE))
+            text.SetLabel(label)
+    
+    
+    class DashboardPanel(wx.Panel):
+        """
+        Live plots of run throughput, latency, CPU use and job queue.
+        
+        A timer takes a sample every interval; painting draws the
+        sampler's ring buffer with plain wx.DC calls, one strip per
+        measure. The job strip turns red while runs wait in the queue,
+        i.e. while every worker is busy.
+        """
+        
+        # Colours of the latency percentiles, in DASHBOARD_PERCENTILES order
+        LATENCY_COLOURS = ("#2e7d32", "#f9a825", "#c62828")
+        
+        def __init__(
+            self,
+            parent,
+            sampler: DashboardSampler,
+            interval_ms: int = DASHBOARD_INTERVAL_MS,
+        ):
+            super().__init__(parent)
+            self.sampler = sampler
+            # Everything is drawn in on_paint, which avoids flicker
+            self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+            self.Bind(wx.EVT_PAINT, self.on_paint)
+            self.Bind(wx.EVT_SIZE, self.on_size)
+            self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+            
+            self.timer = wx.Timer(self)
+            self.Bind(wx.EVT_TIMER, self.on_timer, self.timer)
+            self.timer.Start(interval_ms)
+            
+        def on_timer(self, event):
+            """Take a sample and redraw."""
+            self.sampler.sample()
+            if self.IsShownOnScreen():
+                self.Refresh()
+                
+        def on_size(self, event):
+            """Redraw the whole panel at the new size."""
+            self.Refresh()
+            event.Skip()
+            
+        def on_destroy(self, event):
+            """Stop sampling once the panel is gone."""
+            if event.GetEventObject() is self:
+                self.timer.Stop()
+            event.Skip()
+            
+        def on_paint(self, event):
+            """Draw the plot strips."""
+            dc = wx.AutoBufferedPaintDC(self)
+            dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+            dc.Clear()
+            
+            samples = list(self.sampler.samples)
+            if not samples:
+                dc.DrawText("Collecting samples...", 10, 10)
+                return
+            latest = samples[-1]
+            width, height = self.GetClientSize()
+            strip_height = height // 4
+            
+            runs = [sample.runs_per_second for sample in samples]
+            self._draw_strip(
+                dc, 0, width, strip_height,
+                f"Runs/s: {latest.runs_per_second:.1f}",
+                [(runs, wx.BLUE)], max(1.0, max(runs)),
+            )
+            
+            series = [
+                ([sample.latencies[i] for sample in samples], wx.Colour(colour))
+                for i, colour in enumerate(self.LATENCY_COLOURS)
+            ]
+            slowest = [value for value in series[-1][0] if value is not None]
+            self._draw_strip(
+                dc, strip_height, width, strip_height,
+                "Latency: " + " ".join(
+                    f"p{q:g} {_format_seconds(value)}"
+                    for q, value in zip(DASHBOARD_PERCENTILES, latest.latencies)
+                ),
+                series, max(slowest, default=0.001),
+            )
+            
+            cpu = [sample.cpu_percent for sample in samples]
+            rss = latest.rss_bytes
+            self._draw_strip(
+                dc, 2 * strip_height, width, strip_height,
+                f"CPU: {latest.cpu_percent:.0f}%   RSS: "
+                + ("?" if rss is None else f"{rss / 2**20:.1f} MiB"),
+                [(cpu, wx.Colour("#6a1b9a"))], max(100.0, max(cpu)),
+            )
+            
+            running = [sample.running for sample in samples]
+            queued = [sample.queued for sample in samples]
+            saturated = latest.queued > 0
+            self._draw_strip(
+                dc, 3 * strip_height, width, height - 3 * strip_height,
+                f"Jobs: running {latest.running}, queued {latest.queued}"
+                + ("  (saturated)" if saturated else ""),
+                [(running, wx.Colour("#2e7d32")), (queued, wx.RED)],
+                max(1, max(r + q for r, q in zip(running, queued))),
+                alert=saturated,
+            )
+            
+        def _draw_strip(self, dc, y, width, height, title, series, top, alert=False):
+            """Draw one titled plot of one or more series."""
+            margin = 4
+            text_height = dc.GetTextExtent(title)[1]
+            plot_top = y + text_height + 2 * margin
+            plot_width = width - 2 * margin
+            plot_height = height - text_height - 3 * margin
+            if plot_height < 2 or plot_width < 2:
+                return
+            
+            dc.SetTextForeground(wx.RED if alert else self.GetForegroundColour())
+            dc.DrawText(title, margin, y + margin)
+            dc.SetPen(wx.Pen(wx.RED if alert else wx.LIGHT_GREY))
+            dc.SetBrush(wx.TRANSPARENT_BRUSH)
+            dc.DrawRectangle(margin, plot_top, plot_width, plot_height)
+            
+            slots = self.sampler.samples.maxlen or DASHBOARD_SAMPLES
+            for values, colour in series:
+                dc.SetPen(wx.Pen(colour, 2))
+                for line in plot_points(values, plot_width, plot_height, top, slots):
+                    points = [(margin + x, plot_top + py) for x, py in line]
+                    if len(points) == 1:
+                        dc.DrawPoint(*points[0])
+                    else:
+                        dc.DrawLines(points)
+    
+    
+    class DashboardFrame(wx.Frame):
+        """Window holding a DashboardPanel."""
+        
+        def __init__(self, parent, sampler: DashboardSampler):
+            super().__init__(parent, title="Performance Dashboard", size=(520, 520))
+            self.panel = DashboardPanel(self, sampler)
+    
+    
     class SkeletonFrame(wx.Frame):
         """Main application frame."""
         
@@ -46,11 +983,37 @@ if WX_AVAILABLE:
             )
             
             self.app_instance = None
+            self.dashboard: Optional[DashboardFrame] = None
+            self.executor = RunExecutor(
+                self._create_run_app,
+                on_change=lambda job: wx.CallAfter(self._on_job_changed, job),
+                # Reports are already coalesced, so at most a few per
+                # second reach the event queue
+                on_progress=lambda job: wx.CallAfter(self._on_job_progress, job),
+            )
+            self.output_buffer = OutputBuffer()
+            self.line_store = LineStore()
+            # Filter of the output view, and the search building it
+            self.output_filter = ""
+            self.filter_token: Optional[CancellationToken] = None
             self.setup_ui()
             self.setup_menubar()
             self.setup_statusbar()
             self.center_on_screen()
             
+            config_path = get_config_dir() / GUI_CONFIG_FILE
+            self.run_config = LayeredConfig.from_layers(
+                file=self._load_config_file(config_path),
+                env=env_layer(),
+                cli={"debug": False},
+            )
+            self.config_watcher = ConfigWatcher(
+                config_path,
+                lambda config, detected_at: wx.CallAfter(
+                    self._on_config_change, config, detected_at
+                ),
+            ).start()
+            
         def setup_ui(self):
             """Set up the user interface."""
             # Create main panel
@@ -82,33 +1045,58 @@ if WX_AVAILABLE:
             button_sizer = wx.BoxSizer(wx.HORIZONTAL)
             
             self.run_button = wx.Button(self.panel, label="Run Application")
+            self.cancel_button = wx.Button(self.panel, label="Cancel All")
             self.status_button = wx.Button(self.panel, label="Show Status")
+            self.cancel_button.Disable()
             
             button_sizer.Add(self.run_button, 0, wx.ALL, 5)
+            button_sizer.Add(self.cancel_button, 0, wx.ALL, 5)
             button_sizer.Add(self.status_button, 0, wx.ALL, 5)
             
-            # Output text area
-            self.output_text = wx.TextCtrl(
-                self.panel,
-                style=wx.TE_MULTILINE | wx.TE_READONLY,
-                size=(-1, 200)
+            # Queued and running jobs, each with its progress
+            self.job_panel = JobQueuePanel(self.panel, self.executor.cancel)
+            
+            # Output area: a virtual list with a filter box
+            self.output_list = OutputListCtrl(self.panel, self.line_store)
+            self.filter_box = wx.SearchCtrl(self.panel)
+            self.filter_box.ShowCancelButton(True)
+            self.filter_box.SetDescriptiveText("Filter output")
+            
+            output_sizer = wx.BoxSizer(wx.HORIZONTAL)
+            output_sizer.Add(
+                wx.StaticText(self.panel, label="Output:"),
+                1, wx.ALIGN_CENTER_VERTICAL
             )
+            output_sizer.Add(self.filter_box, 0)
             
             # Layout
             main_sizer.Add(title_label, 0, wx.ALL | wx.CENTER, 10)
             main_sizer.Add(info_text, 0, wx.ALL | wx.CENTER, 10)
             main_sizer.Add(button_sizer, 0, wx.ALL | wx.CENTER, 10)
             main_sizer.Add(
-                wx.StaticText(self.panel, label="Output:"),
-                0, wx.ALL | wx.EXPAND, 5
+                wx.StaticText(self.panel, label="Jobs:"),
+                0, wx.LEFT | wx.RIGHT | wx.TOP, 5
             )
-            main_sizer.Add(self.output_text, 1, wx.ALL | wx.EXPAND, 5)
+            main_sizer.Add(self.job_panel, 0, wx.ALL | wx.EXPAND, 5)
+            main_sizer.Add(output_sizer, 0, wx.ALL | wx.EXPAND, 5)
+            main_sizer.Add(self.output_list, 1, wx.ALL | wx.EXPAND, 5)
             
             self.panel.SetSizer(main_sizer)
             
             # Bind events
             self.run_button.Bind(wx.EVT_BUTTON, self.on_run_application)
+            self.cancel_button.Bind(wx.EVT_BUTTON, self.on_cancel_runs)
+            self.Bind(wx.EVT_CLOSE, self.on_close)
             self.status_button.Bind(wx.EVT_BUTTON, self.on_show_status)
+            self.filter_box.Bind(wx.EVT_TEXT, self.on_filter_output)
+            self.filter_box.Bind(
+                wx.EVT_SEARCHCTRL_CANCEL_BTN, lambda event: self.filter_box.Clear()
+            )
+            
+            # Write queued output in batches
+            self.output_timer = wx.Timer(self)
+            self.Bind(wx.EVT_TIMER, self.on_flush_output, self.output_timer)
+            self.output_timer.Start(OUTPUT_FLUSH_INTERVAL_MS)
             
         def setup_menubar(self):
             """Set up the menu bar."""
@@ -141,44 +1129,158 @@ if WX_AVAILABLE:
             self.Center()
             
         def log_to_output(self, message: str):
-            """Add a message to the output text area."""
-            wx.CallAfter(self._append_to_output, message)
+            """Add a message to the output text area (from any thread)."""
+            self.output_buffer.append(message)
+            
+        def on_flush_output(self, event):
+            """Store queued output and update the output view once."""
+            lines, dropped = self.output_buffer.drain()
+            if not lines:
+                return
+            if dropped:
+                lines.insert(0, f"... {dropped} lines not shown ...")
+            
+            start = self.line_store.end
+            self.line_store.extend(lines)
+            view = self.output_list.view
+            if view is not None:
+                # Only the new lines need matching
+                view.extend(self.line_store.search(self.output_filter, start=start))
+            self.output_list.update()
+            
+        def on_filter_output(self, event):
+            """Filter the output view on a background thread."""
+            if self.filter_token is not None:
+                self.filter_token.cancel()
+                self.filter_token = None
+            needle = self.filter_box.GetValue()
+            if not needle:
+                self.output_filter = ""
+                self.output_list.set_view(None)
+                self.statusbar.SetStatusText("Ready", 0)
+                return
+            
+            token = CancellationToken()
+            self.filter_token = token
+            stop = self.line_store.end
+            self.statusbar.SetStatusText("Filtering output...", 0)
+            
+            def search():
+                try:
+                    matches = self.line_store.search(needle, stop=stop, token=token)
+                except RunCancelled:
+                    return
+                wx.CallAfter(self._on_filter_done, token, needle, stop, matches)
+            
+            threading.Thread(target=search, name="output-filter", daemon=True).start()
+            
+        def _on_filter_done(self, token, needle, stop, matches):
+            """Show a finished filter (called from main thread)."""
+            if token is not self.filter_token:
+                # Superseded by a newer filter
+                return
+            self.filter_token = None
+            # Lines stored while the search ran
+            matches.extend(self.line_store.search(needle, start=stop))
+            self.output_filter = needle
+            self.output_list.set_view(matches)
+            self.statusbar.SetStatusText(f"{len(matches)} matching lines", 0)
+            
+        def _load_config_file(self, path: Path) -> Dict[str, Any]:
+            """Load the configuration file, if there is a valid one."""
+            if not path.exists():
+                return {}
+            try:
+                config = load_config_file(path)
+                validate_config(config)
+            except (OSError, ValueError) as e:
+                self.log_to_output(f"Ignoring config file {path}: {e}")
+                return {}
+            return config
             
-        def _append_to_output(self, message: str):
-            """Append message to output (called from main thread)."""
-            self.output_text.AppendText(f"{message}\n")
+        def _on_config_change(self, config: Dict[str, Any], detected_at: float):
+            """Use a reloaded config file for new runs (called from main thread)."""
+            if not self:
+                return
+            # Runs in progress keep the configuration they started with
+            self.run_config = self.run_config.with_layer("file", config)
+            self.app_instance = None
+            self.executor.discard_apps()
+            CONFIG_RELOADS_TOTAL.inc()
+            CONFIG_SWAP_SECONDS.observe(self.config_watcher.record_swap(detected_at))
+            self.log_to_output("Configuration reloaded; it applies to new runs")
+            
+        def _create_run_app(self) -> SkeletonApp:
+            """Create the application of a worker thread."""
+            return SkeletonApp(self.run_config)
+        
+        def _on_job_progress(self, job: RunJob):
+            """Show the progress of a job in its row (called from main thread)."""
+            if not self:
+                return
+            self.job_panel.update_progress(job)
             
         def on_run_application(self, event):
             """Handle run application button click."""
-            self.statusbar.SetStatusText("Running...", 0)
-            self.log_to_output("Starting application...")
+            # Runs execute on the executor's bounded pool, so repeated
+            # clicks queue up instead of starting a thread each
+            job = self.executor.submit()
+            self.log_to_output(f"Run {job.job_id} queued")
+            self.cancel_button.Enable()
             
-            # Run app in separate thread to avoid blocking GUI
-            def run_app():
-                try:
-                    if self.app_instance is None:
-                        self.app_instance = SkeletonApp({"debug": False})
-                    
-                    result = self.app_instance.run()
-                    if result == 0:
-                        self.log_to_output("Application completed successfully!")
-                    else:
-                        self.log_to_output(f"Application failed with exit code: {result}")
-                        
-                except Exception as e:
-                    self.log_to_output(f"Error running application: {str(e)}")
-                    
-                finally:
-                    wx.CallAfter(self.statusbar.SetStatusText, "Ready", 0)
+        def _on_job_changed(self, job: RunJob):
+            """Show a job state change (called from main thread)."""
+            if not self:
+                # The frame was closed while the job finished
+                return
+            self.job_panel.update_job(job)
+            if job.state == JOB_RUNNING:
+                self.log_to_output(f"Run {job.job_id}: starting application...")
+            elif job.state == JOB_DONE:
+                self.log_to_output(
+                    f"Run {job.job_id}: application completed successfully!"
+                )
+            elif job.state == JOB_CANCELLED:
+                self.log_to_output(f"Run {job.job_id}: cancelled")
+            elif job.state == JOB_FAILED:
+                if job.error is not None:
+                    self.log_to_output(
+                        f"Run {job.job_id}: error running application: {job.error}"
+                    )
+                else:
+                    self.log_to_output(
+                        f"Run {job.job_id}: application failed with exit code: "
+                        f"{job.exit_code}"
+                    )
+            
+            jobs = self.executor.jobs()
+            if not jobs:
+                self.cancel_button.Disable()
+                self.statusbar.SetStatusText("Ready", 0)
+            else:
+                running = sum(1 for queued in jobs if queued.state == JOB_RUNNING)
+                self.statusbar.SetStatusText(
+                    f"Running {running}, queued {len(jobs) - running}", 0
+                )
+            
+        def on_cancel_runs(self, event):
+            """Handle cancel button click."""
+            self.executor.cancel_all()
+            self.statusbar.SetStatusText("Cancelling...", 0)
             
-            thread = threading.Thread(target=run_app)
-            thread.daemon = True
-            thread.start()
+        def on_close(self, event):
+            """Cancel runs in progress so their resources are released."""
+            self.executor.shutdown("Window closed")
+            self.config_watcher.stop()
+            if self.filter_token is not None:
+                self.filter_token.cancel()
+            self.output_timer.Stop()
+            event.Skip()
             
         def on_show_status(self, event):
-            """Handle show status button click."""
+            """Log the application status and open the dashboard."""
             if self.app_instance is None:
-                self.app_instance = SkeletonApp()
+                self.app_instance = SkeletonApp(self.run_config)
                 
             status = self.app_instance.get_status()
             
@@ -189,6 +1291,14 @@ if WX_AVAILABLE:
             self.log_to_output("Current Status:")
             self.log_to_output(status_msg)
             
+            # Deleted windows are falsy, so this also reopens a closed one
+            if not self.dashboard:
+                self.dashboard = DashboardFrame(
+                    self, DashboardSampler(self.executor.jobs)
+                )
+            self.dashboard.Show()
+            self.dashboard.Raise()
+            
         def on_exit(self, event):
             """Handle exit menu item."""
             self.Close()
@@ -250,9 +1360,15 @@ def main() -> int:
     # Set up basic logging
     setup_logging(level="INFO")
     
+    # Export run metrics while the GUI is open
+    exporter = PrometheusFileExporter().start()
+    
     # Create and run the wxPython application
-    app = SkeletonWxApp()
-    app.MainLoop()
+    try:
+        app = SkeletonWxApp()
+        app.MainLoop()
+    finally:
+        exporter.stop()
     
     return 0
 
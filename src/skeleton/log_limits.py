@@ -0,0 +1,209 @@
+"""
+Rate limiting and sampling of log records from hot call sites.
+"""
+
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Per call site state: [tokens, last refill time, records seen,
+# records suppressed since the last one that passed]
+_SiteState = List[float]
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Filter thinning out records that come from the same call site.
+
+    Every ``logger.info(...)`` line is limited on its own: with
+    ``sample_every=N`` only every Nth record from a line passes, and
+    with ``rate`` a token bucket lets through ``burst`` records at once
+    and ``rate`` records per second after that. The next record that
+    passes reports how many were suppressed in between.
+
+    Records above ``max_level`` (warnings and errors by default) always
+    pass. On a handler the filter drops suppressed records before they
+    are formatted or written, but only after the logger has built them.
+    Installed with gate_log_calls() it limits logging calls before any
+    record exists, and the handler filter only adds the summary.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 10,
+        sample_every: int = 1,
+        max_level: int = logging.INFO,
+    ) -> None:
+        """
+        Initialize the filter.
+
+        Args:
+            rate: Records per second allowed from one call site, or
+                None for no rate limit
+            burst: Records a call site may log at once before the rate
+                applies
+            sample_every: Let only every Nth record from a call site
+                through (1 to keep all)
+            max_level: Highest level that is limited
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError(f"Invalid log rate limit: {rate}")
+        if burst < 1:
+            raise ValueError(f"Invalid log burst size: {burst}")
+        if sample_every < 1:
+            raise ValueError(f"Invalid log sampling interval: {sample_every}")
+
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_every = sample_every
+        self.max_level = max_level
+        self._sites: Dict[Any, _SiteState] = {}
+        self._lock = threading.Lock()
+        # The same record reaches this filter once per handler
+        self._last_record: Optional[logging.LogRecord] = None
+        self._last_result = True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Decided by gate_log_calls() before the record was built; kept
+        # on the record for the other handlers, the summary added once
+        gated = record.__dict__.get(_GATED_ATTR)
+        if gated is not None:
+            if gated:
+                _add_summary(record, gated)
+                record.__dict__[_GATED_ATTR] = 0
+            return True
+        if record.levelno > self.max_level:
+            return True
+        if record is self._last_record:
+            return self._last_result
+
+        with self._lock:
+            passed, suppressed = self._check((record.pathname, record.lineno))
+            self._last_record = record
+            self._last_result = passed
+
+        if passed and suppressed:
+            _add_summary(record, suppressed)
+        return passed
+
+    def check_call_site(self, key: Any) -> Tuple[bool, int]:
+        """
+        Decide whether the next record of a call site passes.
+
+        Args:
+            key: Hashable identifying the call site
+
+        Returns:
+            Whether it passes, and how many records of the call site
+            were suppressed since the last one that passed
+        """
+        with self._lock:
+            return self._check(key)
+
+    def suppressed(self) -> int:
+        """
+        Get the number of records suppressed and not yet reported.
+
+        Returns:
+            Total over all call sites
+        """
+        with self._lock:
+            return int(sum(state[3] for state in self._sites.values()))
+
+    def _check(self, key: Any) -> Tuple[bool, int]:
+        """Admit the next record of a call site; hold the lock."""
+        state = self._sites.get(key)
+        if state is None:
+            state = self._sites[key] = [float(self.burst), 0.0, 0, 0]
+        if self._admit(state):
+            suppressed = int(state[3])
+            state[3] = 0
+            return True, suppressed
+        state[3] += 1
+        return False, 0
+
+    def _admit(self, state: _SiteState) -> bool:
+        """Decide whether the next record of a call site passes."""
+        state[2] += 1
+        if self.sample_every > 1 and (state[2] - 1) % self.sample_every:
+            return False
+        if self.rate is None:
+            return True
+
+        now = time.monotonic()
+        if state[1]:
+            state[0] = min(float(self.burst), state[0] + (now - state[1]) * self.rate)
+        state[1] = now
+        if state[0] < 1:
+            return False
+        state[0] -= 1
+        return True
+
+
+# Record attribute carrying the suppressed count from the gate to the filter
+_GATED_ATTR = "_rate_limit_suppressed"
+
+_original_log = logging.Logger._log
+# Frames of logging's own methods (info(), exception(), adapters, ...)
+_LOGGING_SOURCE = _original_log.__code__.co_filename
+_gate: Optional[RateLimitFilter] = None
+
+
+def gate_log_calls(rate_filter: Optional[RateLimitFilter]) -> None:
+    """
+    Rate limit logging calls before their records are built.
+
+    Suppressed calls then cost little more than disabled ones. The
+    filter must also be on the handlers, where it adds the summary of
+    suppressed records to the next record that passes.
+
+    Args:
+        rate_filter: Filter deciding which calls pass, or None to stop
+            gating logging calls
+    """
+    global _gate
+
+    _gate = rate_filter
+    logging.Logger._log = (  # type: ignore[assignment]
+        _gated_log if rate_filter is not None else _original_log
+    )
+
+
+def _gated_log(
+    self: logging.Logger,
+    level: int,
+    msg: Any,
+    args: Any,
+    exc_info: Any = None,
+    extra: Optional[Dict[str, Any]] = None,
+    stack_info: bool = False,
+    stacklevel: int = 1,
+) -> None:
+    """Logger._log() that skips calls suppressed by the gate."""
+    gate = _gate
+    if gate is not None and level <= gate.max_level:
+        frame = sys._getframe(1)
+        while frame.f_back is not None and (
+            frame.f_code.co_filename == _LOGGING_SOURCE
+        ):
+            frame = frame.f_back
+        for _ in range(stacklevel - 1):
+            if frame.f_back is None:
+                break
+            frame = frame.f_back
+        passed, suppressed = gate.check_call_site((frame.f_code, frame.f_lineno))
+        if not passed:
+            return
+        extra = {**(extra or {}), _GATED_ATTR: suppressed}
+    _original_log(self, level, msg, args, exc_info, extra, stack_info, stacklevel)
+
+
+def _add_summary(record: logging.LogRecord, suppressed: int) -> None:
+    """Report suppressed records in the message of ``record``."""
+    record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+    record.args = None
+    record.suppressed = suppressed
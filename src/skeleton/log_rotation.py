@@ -0,0 +1,198 @@
+"""
+Log file rotation with background compression.
+"""
+
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, IO, List, Optional
+
+COMPRESSIONS = ("gzip", "zstd")
+
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class RotatingLogHandler(logging.handlers.BaseRotatingHandler):
+    """
+    File handler starting a new segment by size and/or age.
+
+    A full segment is renamed to ``<name>.<timestamp>`` and logging goes
+    on in a fresh file right away; compressing the old segment and
+    deleting segments beyond ``backup_count`` happen on a background
+    thread, so the logging path only pays for a rename. The age of an
+    existing log file counts from its last modification.
+    """
+
+    def __init__(
+        self,
+        filename: Path,
+        max_bytes: int = 0,
+        max_age: Optional[float] = None,
+        backup_count: int = 5,
+        compression: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the handler.
+
+        Args:
+            filename: Log file to write
+            max_bytes: Start a new segment before the file would grow
+                past this size (0 for no size limit)
+            max_age: Start a new segment after this many seconds
+            backup_count: Number of rotated segments to keep
+            compression: ``gzip``, ``zstd`` or None to keep segments as
+                plain text
+        """
+        if max_bytes < 0:
+            raise ValueError(f"Invalid maximum log size: {max_bytes}")
+        if max_age is not None and max_age <= 0:
+            raise ValueError(f"Invalid maximum log age: {max_age}")
+        if backup_count < 0:
+            raise ValueError(f"Invalid log backup count: {backup_count}")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Invalid log compression: {compression}")
+        # Fail now rather than on the first rotation
+        self._open_compressed = _compressor(compression)
+
+        super().__init__(str(filename), "a", encoding="utf-8", delay=False)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backup_count = backup_count
+        self.compression = compression
+        # A file left by an earlier process ages from its last write,
+        # as with TimedRotatingFileHandler, so short runs still rotate it
+        stat = os.stat(self.baseFilename)
+        started = stat.st_mtime if stat.st_size else time.time()
+        self._rollover_at = self._next_rollover(started)
+
+        self._jobs: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._work, name="log-compressor", daemon=True
+        )
+        self._worker.start()
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.max_age is not None and time.time() >= self._rollover_at:
+            return True
+        if self.max_bytes > 0 and self.stream is not None:
+            size = self.stream.tell()
+            if size and size + len(self.format(record)) + 1 > self.max_bytes:
+                return True
+        return False
+
+    def doRollover(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None  # type: ignore[assignment]
+
+        segment = self._segment_name()
+        try:
+            os.replace(self.baseFilename, segment)
+        except FileNotFoundError:
+            segment = ""
+        self.stream = self._open()
+        self._rollover_at = self._next_rollover(time.time())
+        self._jobs.put(segment)
+
+    def close(self) -> None:
+        """Close the file and wait for pending compression to finish."""
+        self.acquire()
+        try:
+            if self._worker.is_alive():
+                self._jobs.put(None)
+                self._worker.join()
+            super().close()
+        finally:
+            self.release()
+
+    def segments(self) -> List[Path]:
+        """
+        Get the rotated segments, oldest first.
+
+        Returns:
+            Paths of rotated (and possibly compressed) segments
+        """
+        base = Path(self.baseFilename)
+        return sorted(
+            path for path in base.parent.glob(f"{base.name}.[0-9]*")
+            if not path.name.endswith(".tmp")
+        )
+
+    def _next_rollover(self, now: float) -> float:
+        """Get the time at which the current segment gets too old."""
+        return now + self.max_age if self.max_age is not None else float("inf")
+
+    def _segment_name(self) -> str:
+        """Get an unused name for the segment being rotated out."""
+        # Fixed-width stamps keep the segments sorted by name
+        micros = int(time.time() * 1_000_000)
+        suffixes = ("",) + tuple(_SUFFIXES.values())
+        while True:
+            seconds, fraction = divmod(micros, 1_000_000)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(seconds))
+            name = f"{self.baseFilename}.{stamp}-{fraction:06d}"
+            if not any(os.path.exists(name + suffix) for suffix in suffixes):
+                return name
+            micros += 1
+
+    def _work(self) -> None:
+        """Compress rotated segments and apply retention until closed."""
+        while True:
+            segment = self._jobs.get()
+            if segment is None:
+                return
+            try:
+                if segment and self.compression is not None:
+                    self._compress(segment)
+                self._prune()
+            except Exception:
+                # Report like any other handler error, never raise
+                self.handleError(
+                    logging.makeLogRecord({"msg": f"Rotating {segment}"})
+                )
+
+    def _compress(self, segment: str) -> None:
+        """Compress a segment next to itself and delete the original."""
+        assert self.compression is not None
+        target = segment + _SUFFIXES[self.compression]
+        tmp_name = target + ".tmp"
+        try:
+            source = open(segment, "rb")
+        except FileNotFoundError:
+            # Already removed by retention
+            return
+        with source, self._open_compressed(tmp_name) as compressed:
+            shutil.copyfileobj(source, compressed)
+        os.replace(tmp_name, target)
+        os.remove(segment)
+
+    def _prune(self) -> None:
+        """Delete the oldest segments beyond the retention cap."""
+        segments = self.segments()
+        for path in segments[:max(0, len(segments) - self.backup_count)]:
+            path.unlink(missing_ok=True)
+
+
+def _compressor(compression: Optional[str]) -> Callable[[str], IO[Any]]:
+    """Get a function opening a file for compressed writing."""
+    if compression != "zstd":
+        return lambda path: gzip.open(path, "wb")
+
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+        return lambda path: zstd.open(path, "wb")
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        raise ValueError(
+            "zstd log compression requires Python 3.14+ or the zstandard package"
+        ) from None
+    return lambda path: zstandard.open(path, "wb")
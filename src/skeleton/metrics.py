@@ -0,0 +1,390 @@
+"""
+In-process metrics for the skeleton project.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from .utils import get_app_data_dir, write_atomic
+
+# Latency buckets in seconds, upper bounds (the +Inf bucket is implicit)
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Counter:
+    """Monotonically increasing value."""
+
+    __slots__ = ("name", "help", "_value", "_lock")
+    kind = "counter"
+
+    def __init__(self, name: str, help: str = "") -> None:
+        self.name = name
+        self.help = help
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter by ``amount``."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        """Current value."""
+        return self._value
+
+    def snapshot(self) -> float:
+        """Get the current value for reporting."""
+        return self._value
+
+    def samples(self) -> Iterator[str]:
+        """Yield Prometheus sample lines."""
+        yield f"{self.name} {_format_value(self._value)}"
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    __slots__ = ("name", "help", "_value", "_lock")
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str = "") -> None:
+        self.name = name
+        self.help = help
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Set the gauge to ``value``."""
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge by ``amount``."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge by ``amount``."""
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        """Current value."""
+        return self._value
+
+    def snapshot(self) -> float:
+        """Get the current value for reporting."""
+        return self._value
+
+    def samples(self) -> Iterator[str]:
+        """Yield Prometheus sample lines."""
+        yield f"{self.name} {_format_value(self._value)}"
+
+
+class Histogram:
+    """
+    Distribution of observed values in fixed buckets.
+
+    Observing a value costs one binary search and a few additions, so
+    histograms can stay enabled on hot paths.
+    """
+
+    __slots__ = (
+        "name", "help", "buckets", "_counts", "_sum", "_count", "_lock",
+    )
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        if list(buckets) != sorted(buckets):
+            raise ValueError(f"Histogram buckets must be sorted: {buckets}")
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # One slot per bucket plus the implicit +Inf bucket
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record an observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall-clock duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        """Sum of all observations."""
+        return self._sum
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile from the bucket counts.
+
+        The estimate interpolates linearly inside the bucket containing
+        the percentile, like Prometheus' ``histogram_quantile``.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Estimated value, or None without observations
+        """
+        return estimate_percentile(self.buckets, self.bucket_counts(), q)
+
+    def bucket_counts(self) -> List[int]:
+        """
+        Get the number of observations in each bucket.
+
+        Subtracting two results gives the counts of the observations
+        made in between, e.g. for percentiles over a recent window.
+
+        Returns:
+            Non-cumulative counts, one per bucket plus the +Inf bucket
+        """
+        with self._lock:
+            return list(self._counts)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get count, sum and cumulative bucket counts for reporting."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+        cumulative = 0
+        buckets: Dict[str, int] = {}
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            buckets[_format_value(bound)] = cumulative
+        buckets["+Inf"] = total
+        return {"count": total, "sum": value_sum, "buckets": buckets}
+
+    def samples(self) -> Iterator[str]:
+        """Yield Prometheus sample lines."""
+        snapshot = self.snapshot()
+        for bound, cumulative in snapshot["buckets"].items():
+            yield f'{self.name}_bucket{{le="{bound}"}} {cumulative}'
+        yield f"{self.name}_sum {_format_value(snapshot['sum'])}"
+        yield f"{self.name}_count {snapshot['count']}"
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+def estimate_percentile(
+    buckets: Sequence[float], counts: Sequence[int], q: float
+) -> Optional[float]:
+    """
+    Estimate a percentile from histogram bucket counts.
+
+    Args:
+        buckets: Bucket upper bounds, as in Histogram.buckets
+        counts: Non-cumulative counts, one per bucket plus +Inf
+        q: Percentile between 0 and 100
+
+    Returns:
+        Estimated value, or None without observations
+    """
+    total = sum(counts)
+    if total == 0:
+        return None
+
+    rank = q / 100.0 * total
+    cumulative = 0
+    for index, count in enumerate(counts):
+        if cumulative + count >= rank and count:
+            if index == len(buckets):
+                # Values above the last bucket: report its bound
+                return buckets[-1]
+            lower = buckets[index - 1] if index else 0.0
+            upper = buckets[index]
+            return lower + (upper - lower) * (rank - cumulative) / count
+        cumulative += count
+    return buckets[-1]
+
+
+class MetricsRegistry:
+    """Collection of named metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        """Get or create a counter."""
+        metric = self._get_or_create(Counter, name, help)
+        return metric  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        """Get or create a gauge."""
+        metric = self._get_or_create(Gauge, name, help)
+        return metric  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, help, buckets)
+        if not isinstance(metric, Histogram):
+            raise ValueError(
+                f"Metric {name} is already registered as a {metric.kind}"
+            )
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Get a registered metric by name."""
+        return self._metrics.get(name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current value of every metric.
+
+        Returns:
+            Dictionary of metric name to value; histograms map to a
+            dictionary with count, sum and cumulative buckets
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def render_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text ending with a newline
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, cls: type, name: str, help: str) -> Metric:
+        """Get a metric of type ``cls``, creating it if needed."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help)
+        if not isinstance(metric, cls):
+            raise ValueError(
+                f"Metric {name} is already registered as a {metric.kind}"
+            )
+        return metric
+
+
+# Process-wide registry used by SkeletonApp
+REGISTRY = MetricsRegistry()
+
+
+class PrometheusFileExporter:
+    """
+    Background thread writing a registry to a Prometheus text file.
+
+    The file is replaced atomically on every write, so it can be picked
+    up by node_exporter's textfile collector or any other scraper.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        path: Optional[Path] = None,
+        interval: float = 15.0,
+    ) -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+            registry: Registry to export
+            path: Output file (defaults to ``metrics.prom`` in the
+                application data directory)
+            interval: Seconds between writes
+        """
+        if path is None:
+            path = get_app_data_dir() / "metrics.prom"
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PrometheusFileExporter":
+        """Start writing in the background."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._loop, name="metrics-exporter", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background thread and write a final snapshot."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self) -> None:
+        """Write the current metrics to the output file."""
+        text = self.registry.render_prometheus()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            write_atomic(self.path, text.encode("utf-8"))
+        except OSError as e:
+            self.logger.warning("Could not write metrics to %s: %s", self.path, e)
+
+    def _loop(self) -> None:
+        """Write metrics every interval until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.write()
+
+
+def _format_value(value: float) -> str:
+    """Format a number the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
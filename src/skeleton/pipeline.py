@@ -0,0 +1,242 @@
+"""
+Streaming pipeline stages for the skeleton project.
+"""
+
+import contextvars
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .cancellation import CancellationToken
+
+Stage = Callable[[Iterator[Any]], Iterator[Any]]
+Sink = Callable[[Iterator[Any]], Any]
+
+# Message kinds passed between a threaded stage and its consumer
+_ITEM = 0
+_DONE = 1
+_ERROR = 2
+
+# How often a blocked producer checks whether its consumer went away
+_PUT_POLL_INTERVAL = 0.1
+
+
+class Pipeline:
+    """
+    Chain of generator stages running from a source to a sink.
+
+    Items flow through the stages one at a time, so peak memory depends
+    on the size of an item (use batch() to pick a chunk size) rather
+    than on the size of the whole dataset. A stage added with
+    ``threaded=True`` runs on its own thread and hands items downstream
+    through a bounded queue; when the consumer falls behind, the
+    producer blocks instead of buffering.
+
+    Example:
+        total = (
+            Pipeline(read_rows(path))
+            .map(parse)
+            .filter(is_valid)
+            .batch(1000)
+            .map(write_chunk, threaded=True)
+            .sink(sum)
+            .run()
+        )
+    """
+
+    def __init__(self, source: Iterable[Any], queue_size: int = 64) -> None:
+        """
+        Initialize the pipeline.
+
+        Args:
+            source: Iterable producing the input items
+            queue_size: Capacity of the queue behind each threaded stage
+        """
+        if queue_size < 1:
+            raise ValueError(f"Invalid queue size: {queue_size}")
+
+        self.queue_size = queue_size
+        self._source = source
+        self._stages: List[Tuple[Stage, bool]] = []
+        self._sink: Optional[Sink] = None
+
+    def stage(self, func: Stage, threaded: bool = False) -> "Pipeline":
+        """
+        Add a generator stage.
+
+        Args:
+            func: Callable taking the upstream iterator and returning
+                an iterator of output items
+            threaded: Run the stage on its own thread
+
+        Returns:
+            This pipeline, for chaining
+        """
+        self._stages.append((func, threaded))
+        return self
+
+    def map(self, func: Callable[[Any], Any], threaded: bool = False) -> "Pipeline":
+        """
+        Add a stage applying ``func`` to every item.
+
+        Args:
+            func: Function applied to each item
+            threaded: Run the stage on its own thread
+
+        Returns:
+            This pipeline, for chaining
+        """
+        return self.stage(lambda items: map(func, items), threaded)
+
+    def filter(
+        self, predicate: Callable[[Any], bool], threaded: bool = False
+    ) -> "Pipeline":
+        """
+        Add a stage keeping only items for which ``predicate`` is true.
+
+        Args:
+            predicate: Function deciding whether an item is kept
+            threaded: Run the stage on its own thread
+
+        Returns:
+            This pipeline, for chaining
+        """
+        return self.stage(lambda items: filter(predicate, items), threaded)
+
+    def batch(self, size: int) -> "Pipeline":
+        """
+        Add a stage grouping items into lists of up to ``size`` items.
+
+        Args:
+            size: Maximum number of items per chunk
+
+        Returns:
+            This pipeline, for chaining
+        """
+        if size < 1:
+            raise ValueError(f"Invalid batch size: {size}")
+        return self.stage(lambda items: _chunked(items, size))
+
+    def sink(self, func: Sink) -> "Pipeline":
+        """
+        Set the sink consuming the output of the last stage.
+
+        Args:
+            func: Callable taking the output iterator; its return value
+                becomes the result of run()
+
+        Returns:
+            This pipeline, for chaining
+        """
+        self._sink = func
+        return self
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the output of the last stage."""
+        return self.iterate()
+
+    def iterate(self, token: Optional[CancellationToken] = None) -> Iterator[Any]:
+        """
+        Iterate over the output of the last stage.
+
+        Args:
+            token: Optional cancellation token, checked before each
+                item is taken from the source
+
+        Returns:
+            Iterator over the output items
+        """
+        items: Iterator[Any] = iter(self._source)
+        if token is not None:
+            items = _checked(items, token)
+        for func, threaded in self._stages:
+            items = func(items)
+            if threaded:
+                items = _threaded(items, self.queue_size)
+        return items
+
+    def run(self, token: Optional[CancellationToken] = None) -> Any:
+        """
+        Drain the pipeline into its sink.
+
+        Args:
+            token: Optional cancellation token; a cancelled token stops
+                the source and raises RunCancelled from run()
+
+        Returns:
+            Result of the sink, or the number of output items when no
+            sink is set
+        """
+        items = self.iterate(token)
+        if self._sink is not None:
+            return self._sink(items)
+
+        count = 0
+        for _ in items:
+            count += 1
+        return count
+
+
+def _checked(items: Iterator[Any], token: CancellationToken) -> Iterator[Any]:
+    """Pass items through, raising once the token is cancelled."""
+    for item in items:
+        token.raise_if_cancelled()
+        yield item
+
+
+def _chunked(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """Group items into lists of up to ``size`` items."""
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _threaded(items: Iterator[Any], queue_size: int) -> Iterator[Any]:
+    """
+    Consume ``items`` on a background thread through a bounded queue.
+
+    Exceptions raised upstream are re-raised in the consumer. If the
+    consumer stops early, the producer thread exits at its next put.
+    """
+    channel: "queue.Queue[Tuple[int, Any]]" = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def put(message: Tuple[int, Any]) -> bool:
+        while not stopped.is_set():
+            try:
+                channel.put(message, timeout=_PUT_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((_ITEM, item)):
+                    return
+        except BaseException as e:
+            put((_ERROR, e))
+        else:
+            put((_DONE, None))
+
+    # The stage logs in the context of the run, e.g. with its run_id
+    context = contextvars.copy_context()
+    thread = threading.Thread(
+        target=context.run, args=(produce,), name="pipeline-stage", daemon=True
+    )
+    thread.start()
+
+    try:
+        while True:
+            kind, value = channel.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise value
+            yield value
+    finally:
+        stopped.set()
@@ -0,0 +1,153 @@
+"""
+CPU and memory profiling of application runs.
+"""
+
+import io
+import os
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, List, Optional, Type
+
+# cProfile, pstats and tracemalloc are imported when profiling starts,
+# so the CLI can offer --profile without paying for them on every run
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+PROFILE_MODES = ("cpu", "mem", "both")
+
+# Number of stack frames kept per allocation by tracemalloc
+_TRACEMALLOC_FRAMES = 10
+
+
+class RunProfiler:
+    """
+    Context manager profiling the code it wraps.
+
+    In ``cpu`` mode the block runs under cProfile and the statistics are
+    saved as a ``.pstats`` file, which can be opened with ``pstats`` or
+    tools such as snakeviz. In ``mem`` mode tracemalloc records
+    allocations and the top allocation sites are written to a text
+    report. ``both`` does both.
+    """
+
+    def __init__(self, mode: str, output_dir: Path, top_n: int = 20) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            mode: One of ``cpu``, ``mem`` or ``both``
+            output_dir: Directory for the report files
+            top_n: Number of entries in reports and summaries
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Invalid profile mode: {mode}")
+
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.stats_path: Optional[Path] = None
+        self.allocations_path: Optional[Path] = None
+
+        self._profile: Optional["cProfile.Profile"] = None
+        self._snapshot: Optional["tracemalloc.Snapshot"] = None
+        self._started_tracemalloc = False
+        self._stem = ""
+
+    @property
+    def cpu(self) -> bool:
+        """Whether CPU profiling is enabled."""
+        return self.mode in ("cpu", "both")
+
+    @property
+    def mem(self) -> bool:
+        """Whether memory profiling is enabled."""
+        return self.mode in ("mem", "both")
+
+    def __enter__(self) -> "RunProfiler":
+        import cProfile
+        import tracemalloc
+
+        self._stem = f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        if self.mem and not tracemalloc.is_tracing():
+            tracemalloc.start(_TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+        if self.cpu:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        import tracemalloc
+
+        if self._profile is not None:
+            self._profile.disable()
+        if self.mem:
+            self._snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self._profile is not None:
+            self.stats_path = self.output_dir / f"{self._stem}.pstats"
+            self._profile.dump_stats(str(self.stats_path))
+        if self._snapshot is not None:
+            self.allocations_path = self.output_dir / f"{self._stem}-allocations.txt"
+            self.allocations_path.write_text(
+                "\n".join(self._allocation_lines(self.top_n)) + "\n",
+                encoding="utf-8",
+            )
+
+    def summary(self, limit: int = 10) -> str:
+        """
+        Get a short report of the hottest functions and allocations.
+
+        Args:
+            limit: Number of entries per section
+
+        Returns:
+            Human readable summary including the report file paths
+        """
+        import pstats
+
+        lines: List[str] = []
+        if self._profile is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+            lines.append(f"CPU profile: {self.stats_path}")
+            lines.extend(
+                line for line in stream.getvalue().splitlines() if line.strip()
+            )
+        if self._snapshot is not None:
+            if lines:
+                lines.append("")
+            lines.append(f"Allocation report: {self.allocations_path}")
+            lines.extend(self._allocation_lines(limit))
+        return "\n".join(lines)
+
+    def _allocation_lines(self, limit: int) -> List[str]:
+        """Format the top allocation sites by size."""
+        import tracemalloc
+
+        assert self._snapshot is not None
+        snapshot = self._snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        stats = snapshot.statistics("lineno")
+        total = sum(stat.size for stat in stats)
+        lines = [f"Top {limit} allocation sites ({total / 1024:.1f} KiB total):"]
+        for index, stat in enumerate(stats[:limit], 1):
+            frame = stat.traceback[0]
+            lines.append(
+                f"#{index}: {frame.filename}:{frame.lineno}: "
+                f"{stat.size / 1024:.1f} KiB in {stat.count} blocks"
+            )
+        return lines
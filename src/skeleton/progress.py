@@ -0,0 +1,198 @@
+"""
+Throttled progress reporting for application runs.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, NamedTuple, Optional, TextIO
+
+# Default minimum time between two progress reports, in seconds
+PROGRESS_INTERVAL = 0.1
+
+# Weight of the latest interval in the smoothed rate
+_RATE_SMOOTHING = 0.3
+
+
+class Progress(NamedTuple):
+    """Snapshot of how far a run has got."""
+
+    done: float
+    total: Optional[float]
+    rate: float
+    elapsed: float
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share of the total done (0 to 1), or None without a total."""
+        if not self.total:
+            return None
+        return min(1.0, max(0.0, self.done / self.total))
+
+    @property
+    def remaining(self) -> Optional[float]:
+        """Estimated seconds left, or None if unknown."""
+        if not self.total or self.rate <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / self.rate)
+
+
+ProgressListener = Callable[[Progress], None]
+
+
+class ProgressReporter:
+    """
+    Coalesce progress updates into at most one report per interval.
+
+    update() may be called for every unit of work: it only stores the
+    values and compares a timestamp unless ``interval`` has passed since
+    the last report. Reaching the total is always reported, and finish()
+    reports the last values if they were held back.
+    """
+
+    __slots__ = (
+        "listener", "interval", "_start", "_next", "_last_time", "_last_done",
+        "_rate", "_done", "_total", "_pending",
+    )
+
+    def __init__(
+        self, listener: ProgressListener, interval: float = PROGRESS_INTERVAL
+    ) -> None:
+        """
+        Initialize the reporter.
+
+        Args:
+            listener: Callable receiving each Progress report
+            interval: Minimum seconds between two reports
+        """
+        if interval < 0:
+            raise ValueError(f"Invalid progress interval: {interval}")
+        self.listener = listener
+        self.interval = interval
+        self.reset()
+
+    def reset(self) -> None:
+        """Start measuring a new run."""
+        now = time.monotonic()
+        self._start = self._last_time = now
+        self._next = now + self.interval
+        self._last_done = 0.0
+        self._rate = 0.0
+        self._done = 0.0
+        self._total: Optional[float] = None
+        self._pending = False
+
+    def update(self, done: float, total: Optional[float] = None) -> None:
+        """
+        Record progress, reporting it if the interval has passed.
+
+        Args:
+            done: Units done so far
+            total: Total units, if known
+        """
+        self._done = done
+        self._total = total
+        now = time.monotonic()
+        if now < self._next and (total is None or done < total):
+            self._pending = True
+            return
+        self._report(now)
+
+    def finish(self) -> None:
+        """Report the last recorded values if they were held back."""
+        if self._pending:
+            self._report(time.monotonic())
+
+    def _report(self, now: float) -> None:
+        """Update the rate and call the listener."""
+        interval = now - self._last_time
+        if interval > 0:
+            rate = (self._done - self._last_done) / interval
+            if self._rate:
+                rate = self._rate + _RATE_SMOOTHING * (rate - self._rate)
+            self._rate = rate
+        self._last_time = now
+        self._last_done = self._done
+        self._next = now + self.interval
+        self._pending = False
+        self.listener(
+            Progress(self._done, self._total, self._rate, now - self._start)
+        )
+
+
+def format_progress(progress: Progress, width: int = 30) -> str:
+    """
+    Format a progress report as one line.
+
+    Args:
+        progress: Report to format
+        width: Width of the bar in characters (0 for no bar)
+
+    Returns:
+        Line such as ``[#######.......]  47/100  23.1/s  ETA 2s``
+    """
+    parts = []
+    fraction = progress.fraction
+    if fraction is not None:
+        if width:
+            filled = int(fraction * width)
+            parts.append(f"[{'#' * filled}{'.' * (width - filled)}]")
+        parts.append(f"{progress.done:g}/{progress.total:g}")
+    else:
+        parts.append(f"{progress.done:g}")
+    parts.append(f"{progress.rate:.1f}/s")
+    remaining = progress.remaining
+    if remaining is not None:
+        parts.append(f"ETA {remaining:.0f}s")
+    return "  ".join(parts)
+
+
+class TerminalProgressLine:
+    """
+    Progress listener redrawing a single line on a terminal.
+
+    Nothing is written unless ``stream`` is a TTY, so the listener can
+    be attached unconditionally without garbling redirected output.
+    The line is also a logging filter: on the console log handlers it
+    clears itself before each log line, and the next report redraws it.
+    """
+
+    def __init__(self, stream: TextIO, width: int = 30) -> None:
+        """
+        Initialize the line.
+
+        Args:
+            stream: Terminal stream, typically sys.stderr
+            width: Width of the bar in characters
+        """
+        self.stream = stream
+        self.width = width
+        self.enabled = stream.isatty()
+        self._length = 0
+        # Runs report and log from any thread
+        self._lock = threading.Lock()
+
+    def __call__(self, progress: Progress) -> None:
+        if not self.enabled:
+            return
+        line = format_progress(progress, self.width)
+        with self._lock:
+            # Pad to overwrite a longer previous line
+            self.stream.write("\r" + line.ljust(self._length))
+            self.stream.flush()
+            self._length = len(line)
+
+    def close(self) -> None:
+        """Clear the line so later output starts on a clean line."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._length:
+                self.stream.write("\r" + " " * self._length + "\r")
+                self.stream.flush()
+                self._length = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Clear the line before a log record is written; never drops it."""
+        self.close()
+        return True
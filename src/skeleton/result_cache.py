@@ -0,0 +1,274 @@
+"""
+Memoization cache for application results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .utils import get_app_data_dir, write_atomic
+
+_SUFFIX = ".pickle"
+
+
+class _Pickled(bytes):
+    """Pickled form of a value in the memory tier."""
+
+
+def make_cache_key(namespace: str, config: Mapping[str, Any]) -> str:
+    """
+    Build a stable cache key for a configuration.
+
+    The key is a SHA-256 digest of the configuration serialized as JSON
+    with sorted keys, so dictionaries with equal contents always map to
+    the same key. Values JSON cannot represent are serialized with
+    ``repr()``.
+
+    Args:
+        namespace: Name separating keys of different applications
+        config: Effective configuration mapping
+
+    Returns:
+        Hex digest identifying the configuration
+    """
+    payload = json.dumps(
+        [namespace, dict(config)],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier result cache with an in-memory LRU in front of a disk store.
+
+    Lookups check the in-memory tier first and fall back to pickled
+    files on disk; disk hits are promoted into memory. The memory tier
+    holds values in pickled form too, so every hit gets its own copy
+    and callers cannot change the cached result. Entries older than
+    ``ttl`` seconds are treated as misses in both tiers, and the disk
+    tier evicts its least recently used files once it grows past
+    ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        max_entries: int = 128,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory for the disk tier (defaults to
+                ``result-cache`` under the application data directory)
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Maximum total size of the disk tier in bytes
+            ttl: Optional entry lifetime in seconds
+        """
+        if directory is None:
+            directory = get_app_data_dir() / "result-cache"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "evictions": 0,
+        }
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            Tuple of (found, value); value is None when not found
+        """
+        now = time.time()
+        hit = False
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self._expired(stored_at, now):
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    hit = True
+                else:
+                    del self._memory[key]
+        if hit:
+            # Unpickled outside the lock; each caller gets its own copy
+            if isinstance(value, _Pickled):
+                value = pickle.loads(value)
+            return True, value
+
+        found, value, data, stored_at = self._read_disk(key, now)
+
+        with self._lock:
+            if found:
+                # Keeps the age it has on disk, so the TTL is not extended
+                self._remember(key, _Pickled(data), stored_at)
+                self._stats["hits"] += 1
+                self._stats["disk_hits"] += 1
+            else:
+                self._stats["misses"] += 1
+        return found, value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a result in both tiers.
+
+        Values that cannot be pickled are kept in memory only, as they
+        are, so every hit shares the same object.
+
+        Args:
+            key: Cache key from make_cache_key()
+            value: Result to cache
+        """
+        now = time.time()
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.logger.debug("Result for %s is not picklable: %s", key, e)
+            with self._lock:
+                self._remember(key, value, now)
+            return
+
+        with self._lock:
+            self._remember(key, _Pickled(data), now)
+        self._write_disk(key, data)
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            for path in self.directory.glob(f"*{_SUFFIX}"):
+                path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit, miss and eviction counts
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        return stats
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        """Check whether an entry stored at ``stored_at`` has expired."""
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _remember(self, key: str, value: Any, stored_at: float) -> None:
+        """Insert into the memory tier; the caller holds the lock."""
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        """Get the disk tier path for a key."""
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _read_disk(
+        self, key: str, now: float
+    ) -> Tuple[bool, Any, bytes, float]:
+        """Read an entry from the disk tier, with its pickled form and write time."""
+        path = self._path(key)
+        try:
+            stored_at = path.stat().st_mtime
+            if self._expired(stored_at, now):
+                path.unlink(missing_ok=True)
+                return False, None, b"", 0.0
+            data = path.read_bytes()
+            value = pickle.loads(data)
+            # Reading counts as a use for LRU eviction; keep the write
+            # time in the modification time so TTL still applies
+            os.utime(path, (now, stored_at))
+        except FileNotFoundError:
+            return False, None, b"", 0.0
+        except Exception as e:
+            self.logger.warning("Discarding unreadable cache entry %s: %s", key, e)
+            path.unlink(missing_ok=True)
+            return False, None, b"", 0.0
+        return True, value, data, stored_at
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        """Write a pickled entry to the disk tier atomically."""
+        path = self._path(key)
+        try:
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            write_atomic(path, data)
+        except OSError as e:
+            self.logger.warning("Could not write cache entry %s: %s", key, e)
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                # An overwritten entry no longer takes up its old size
+                self._disk_bytes += len(data) - replaced
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan_disk_bytes(self) -> int:
+        """Sum the size of all disk tier entries."""
+        total = 0
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """Evict least recently used files until under max_bytes."""
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_atime, st.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self._stats["evictions"] += 1
+        self._disk_bytes = total
@@ -2,11 +2,24 @@
 Utility functions for the skeleton project.
 """
 
+import atexit
+import contextlib
+import contextvars
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from typing import Optional
+import tempfile
+from typing import Any, Dict, Iterator, List, Mapping, Optional, TextIO, Tuple
 from pathlib import Path
 
+from .flight_recorder import FlightRecorder
+from .log_limits import RateLimitFilter, gate_log_calls
+from .log_rotation import RotatingLogHandler
+
 # Handle both relative and absolute imports for version
 try:
     from . import __version__
@@ -17,6 +30,190 @@ except ImportError:
         # Fallback if package not installed
         __version__ = "0.1.0"
 
+# Default format of log lines
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# What a full log queue does with new records in async mode
+LOG_OVERFLOW_POLICIES = ("block", "drop")
+
+# Output formats of setup_logging()
+LOG_FORMATS = ("text", "json")
+
+# Fields added to JSON log records in the current context, together with
+# their pre-serialized form
+_LogContext = Tuple[Mapping[str, Any], str]
+_log_context: "contextvars.ContextVar[_LogContext]" = contextvars.ContextVar(
+    "skeleton_log_context", default=({}, "")
+)
+
+_encode_string = json.encoder.encode_basestring  # type: ignore[attr-defined]
+
+# Listener writing queued records in async mode and the handler
+# feeding it, if any
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["BoundedQueueHandler"] = None
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue with an overflow policy.
+    
+    With the ``block`` policy a full queue makes the logging thread wait
+    for the listener; with ``drop`` the record is discarded and counted
+    in ``dropped`` so logging never stalls the caller.
+    """
+    
+    def __init__(
+        self, log_queue: "queue.Queue[logging.LogRecord]", overflow: str = "block"
+    ) -> None:
+        if overflow not in LOG_OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid log overflow policy: {overflow}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike QueueHandler.prepare, keep the exception text out of the
+        # message so JSON output matches synchronous logging
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                formatter = self.formatter or logging.Formatter()
+                record.exc_text = formatter.formatException(record.exc_info)
+            # Tracebacks can't cross threads safely; the text is enough
+            record.exc_info = None
+        # The listener formats on another thread; keep this context
+        record.context_fields = _log_context.get()[1]
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatter writing each record as one JSON object per line.
+    
+    Only the parts that change per record are serialized per record:
+    static fields are encoded once when the formatter is built, context
+    fields once per log_context() block, and logger and level names
+    once per name. Records look like::
+    
+        {"ts": 1700000000.123, "level": "INFO", "logger": "skeleton.core",
+         "message": "...", "app": "Skeleton Project", "run_id": 3}
+    """
+    
+    def __init__(self, static_fields: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Initialize the formatter.
+        
+        Args:
+            static_fields: Fields added to every record, e.g. host name
+        """
+        super().__init__()
+        self._static = _encode_fields(static_fields or {})
+        self._names: Dict[str, str] = {}
+    
+    def format(self, record: logging.LogRecord) -> str:
+        names = self._names
+        logger = names.get(record.name)
+        if logger is None:
+            logger = names[record.name] = _encode_string(record.name)
+        level = names.get(record.levelname)
+        if level is None:
+            level = names[record.levelname] = _encode_string(record.levelname)
+        
+        parts = [
+            '{"ts": ', "%.3f" % record.created,
+            ', "level": ', level,
+            ', "logger": ', logger,
+            ', "message": ', _encode_string(record.getMessage()),
+        ]
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            parts += [', "exc_info": ', _encode_string(record.exc_text)]
+        if record.stack_info:
+            parts += [', "stack_info": ', _encode_string(record.stack_info)]
+        
+        context = record.__dict__.get("context_fields")
+        if context is None:
+            context = _log_context.get()[1]
+        if context:
+            parts += [", ", context]
+        if self._static:
+            parts += [", ", self._static]
+        parts.append("}")
+        return "".join(parts)
+
+
+@contextlib.contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """
+    Add fields to the JSON log records written inside the block.
+    
+    Fields are serialized once on entry and apply to the current thread
+    or asyncio task; nested blocks add to and override outer fields.
+    
+    Args:
+        **fields: JSON-serializable field values
+    """
+    token = push_log_context(fields)
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def push_log_context(
+    fields: Mapping[str, Any],
+) -> "contextvars.Token[_LogContext]":
+    """
+    Add fields to JSON log records until pop_log_context() is called.
+    
+    Args:
+        fields: JSON-serializable field values
+    
+    Returns:
+        Token to pass to pop_log_context()
+    """
+    outer = _log_context.get()[0]
+    merged = {**outer, **fields} if outer else dict(fields)
+    return _log_context.set((merged, _encode_fields(merged)))
+
+
+def pop_log_context(token: "contextvars.Token[_LogContext]") -> None:
+    """
+    Remove the fields added by push_log_context().
+    
+    Args:
+        token: Token returned by push_log_context()
+    """
+    _log_context.reset(token)
+
+
+def _encode_fields(fields: Mapping[str, Any]) -> str:
+    """Serialize fields as the inside of a JSON object."""
+    if not fields:
+        return ""
+    return json.dumps(dict(fields), default=repr)[1:-1]
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """QueueListener that can be stopped while its queue is full."""
+    
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
 
 def get_version() -> str:
     """
@@ -31,7 +228,22 @@ def get_version() -> str:
 def setup_logging(
     level: str = "INFO",
     log_file: Optional[Path] = None,
-    format_string: Optional[str] = None
+    format_string: Optional[str] = None,
+    stream: Optional[TextIO] = None,
+    fmt: str = "text",
+    static_fields: Optional[Mapping[str, Any]] = None,
+    max_bytes: int = 0,
+    max_age: Optional[float] = None,
+    backup_count: int = 5,
+    compression: Optional[str] = None,
+    rate_limit: Optional[float] = None,
+    rate_burst: int = 10,
+    sample_every: int = 1,
+    flight_recorder: Optional[Path] = None,
+    flight_records: int = 4096,
+    async_mode: bool = False,
+    queue_size: int = 10000,
+    overflow: str = "block"
 ) -> None:
     """
     Set up logging configuration.
@@ -40,41 +252,245 @@ def setup_logging(
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path for logging output
         format_string: Optional custom format string
+        stream: Console stream (defaults to stdout)
+        fmt: ``text`` for lines in ``format_string``, or ``json`` for one
+            JSON object per record (see JsonFormatter)
+        static_fields: Fields added to every record in ``json`` format
+        max_bytes: Rotate the log file before it grows past this size
+            (0 for no size limit)
+        max_age: Rotate the log file after this many seconds
+        backup_count: Number of rotated log files to keep
+        compression: Compress rotated log files with ``gzip`` or
+            ``zstd`` on a background thread
+        rate_limit: Records per second allowed from one logging call
+            site at INFO level and below (see RateLimitFilter).
+            Suppressed calls build no record, so the flight recorder
+            does not see them either
+        rate_burst: Records a call site may log at once under
+            ``rate_limit``
+        sample_every: Keep only every Nth INFO or DEBUG record from each
+            call site
+        flight_recorder: Keep the last ``flight_records`` DEBUG and
+            higher records in this ring buffer file, whatever ``level``
+            is (see FlightRecorder)
+        flight_records: Number of records the flight recorder keeps
+        async_mode: Queue records and write them on a background thread,
+            so logging calls never wait for console or disk I/O
+        queue_size: Maximum number of queued records in async mode
+        overflow: What a full queue does with new records in async mode:
+            ``block`` until there is room, or ``drop`` them
     """
     if format_string is None:
-        format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        format_string = DEFAULT_FORMAT
     
     # Convert string level to logging constant
     numeric_level = getattr(logging, level.upper(), None)
     if not isinstance(numeric_level, int):
         raise ValueError(f"Invalid log level: {level}")
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Invalid log format: {fmt}")
+    if overflow not in LOG_OVERFLOW_POLICIES:
+        raise ValueError(f"Invalid log overflow policy: {overflow}")
+    if queue_size < 1:
+        raise ValueError(f"Invalid log queue size: {queue_size}")
+    rate_filter = None
+    if rate_limit is not None or sample_every != 1:
+        rate_filter = RateLimitFilter(rate_limit, rate_burst, sample_every)
+    
+    if fmt == "json":
+        formatter: logging.Formatter = JsonFormatter(static_fields)
+    else:
+        formatter = logging.Formatter(format_string)
     
     # Configure logging
     handlers = []
     
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(logging.Formatter(format_string))
+    console_handler.setFormatter(formatter)
     handlers.append(console_handler)
     
     # File handler (if specified)
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
+        if max_bytes or max_age is not None:
+            file_handler: logging.Handler = RotatingLogHandler(
+                log_file,
+                max_bytes=max_bytes,
+                max_age=max_age,
+                backup_count=backup_count,
+                compression=compression,
+            )
+        else:
+            file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(numeric_level)
-        file_handler.setFormatter(logging.Formatter(format_string))
+        file_handler.setFormatter(formatter)
         handlers.append(file_handler)
     
+    # Stop the listener of an earlier async setup, flushing its queue
+    stop_logging_listener()
+    
+    if async_mode:
+        handlers = [_start_queue_listener(handlers, queue_size, overflow)]
+        # Only the flight recorder wants records below the level
+        handlers[0].setLevel(numeric_level)
+    
+    if rate_filter is not None:
+        # On the handlers: root logger filters miss propagated records
+        for handler in handlers:
+            handler.addFilter(rate_filter)
+    # Suppressed calls return before building a record; the handler
+    # filters only add the summaries (or limit records built elsewhere)
+    gate_log_calls(rate_filter)
+    
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, FlightRecorder):
+            # Release the ring buffer so a new recorder can lock it
+            root.removeHandler(handler)
+            handler.close()
+    
+    root_level = numeric_level
+    if flight_recorder is not None:
+        # Written in place, so it never goes through the queue
+        handlers.append(FlightRecorder(flight_recorder, capacity=flight_records))
+        root_level = min(root_level, logging.DEBUG)
+    
     # Configure root logger
     logging.basicConfig(
-        level=numeric_level,
+        level=root_level,
         format=format_string,
         handlers=handlers,
         force=True
     )
 
 
+def _start_queue_listener(
+    handlers: List[logging.Handler], queue_size: int, overflow: str
+) -> BoundedQueueHandler:
+    """Start a listener feeding ``handlers`` and get its queue handler."""
+    global _queue_listener, _queue_handler
+    
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, overflow)
+    # Records are formatted once, by the handlers behind the listener;
+    # the queue handler only merges arguments and renders exception text
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    _queue_listener = _QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    _queue_handler = queue_handler
+    return queue_handler
+
+
+def stop_logging_listener() -> None:
+    """
+    Stop async logging, writing out every queued record first.
+    
+    The handlers behind the listener are closed. Runs automatically
+    at interpreter exit; safe to call at any time.
+    """
+    global _queue_listener, _queue_handler
+    
+    listener, _queue_listener = _queue_listener, None
+    queue_handler, _queue_handler = _queue_handler, None
+    if listener is None:
+        return
+    listener.stop()
+    
+    dropped = queue_handler.dropped if queue_handler is not None else 0
+    if dropped:
+        record = logging.makeLogRecord({
+            "name": __name__,
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "msg": "Dropped %d log records because the log queue was full",
+            "args": (dropped,),
+        })
+        for handler in listener.handlers:
+            handler.handle(record)
+    for handler in listener.handlers:
+        # Nothing else owns these handlers; release their files and threads
+        handler.flush()
+        handler.close()
+
+
+def get_console_handlers() -> List[logging.Handler]:
+    """
+    Get the handlers writing log records to the console.
+    
+    In async mode these are the handlers behind the queue, which write
+    on the listener thread.
+    
+    Returns:
+        Stream handlers set up by setup_logging() that write to a
+        stream rather than a file
+    """
+    listener = _queue_listener
+    handlers = (
+        listener.handlers if listener is not None else logging.getLogger().handlers
+    )
+    return [
+        handler for handler in handlers
+        if isinstance(handler, logging.StreamHandler)
+        and not isinstance(handler, logging.FileHandler)
+    ]
+
+
+def _log_directly_after_fork() -> None:
+    """
+    Replace the queue handler with the real handlers in a forked child.
+    
+    The listener thread does not survive a fork, so records queued in
+    the child (e.g. by run_many() workers) would never be written.
+    """
+    global _queue_listener, _queue_handler
+    
+    listener, _queue_listener = _queue_listener, None
+    queue_handler, _queue_handler = _queue_handler, None
+    if listener is None:
+        return
+    root = logging.getLogger()
+    if queue_handler in root.handlers:
+        root.removeHandler(queue_handler)
+        for handler in listener.handlers:
+            root.addHandler(handler)
+
+
+atexit.register(stop_logging_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_log_directly_after_fork)
+
+
+def write_atomic(path: Path, data: bytes, tmp_dir: Optional[Path] = None) -> None:
+    """
+    Write a file under a temporary name and rename it into place.
+    
+    Readers see the old or the new contents, never a partial file. The
+    temporary file is removed again if writing fails.
+    
+    Args:
+        path: File to write
+        data: New contents
+        tmp_dir: Directory for the temporary file, on the same file
+            system as ``path`` (defaults to the directory of ``path``)
+        
+    Raises:
+        OSError: If the file cannot be written
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir or path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def get_app_data_dir() -> Path:
     """
     Get the application data directory.
@@ -0,0 +1,56 @@
+"""
+Fixtures shared by the test modules.
+"""
+
+import json
+import logging
+import os
+from unittest.mock import patch
+
+import pytest
+
+
+class FakeClock:
+    """Replacement for time.monotonic() advanced by hand."""
+    
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fixture replacing time.monotonic() with a FakeClock."""
+    clock = FakeClock()
+    with patch("time.monotonic", clock):
+        yield clock
+
+
+def _write_config(path, config):
+    """Write ``config`` as JSON and move the mtime forward."""
+    path.write_text(json.dumps(config))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def write_config():
+    """Fixture providing a function writing config files watchers notice."""
+    return _write_config
+
+
+def _make_record(
+    msg="hello world", args=(), exc_info=None, lineno=1, levelno=logging.INFO
+):
+    """Build a record as if logged from line ``lineno`` of one file."""
+    return logging.LogRecord(
+        "skeleton.test", levelno, "/app/loop.py", lineno, msg, args, exc_info
+    )
+
+
+@pytest.fixture
+def make_record():
+    """Fixture providing a function building log records."""
+    return _make_record
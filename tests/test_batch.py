@@ -0,0 +1,131 @@
+"""
+Tests for the batch module.
+"""
+
+import io
+import json
+import time
+
+from skeleton.batch import run_batch
+from skeleton.core import SkeletonApp
+
+
+class EchoApp(SkeletonApp):
+    """Subclass returning its job value, slowly for low values."""
+    
+    def _execute_main_logic(self):
+        value = self.config["value"]
+        if self.config.get("fail"):
+            raise ValueError("job failed")
+        if self.config.get("unpicklable"):
+            return (i for i in range(value))
+        time.sleep(0.2 if value == 0 else 0)
+        return {"value": value, "name": self.config["app_name"]}
+
+
+def read_records(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestRunBatch:
+    """Test cases for run_batch function."""
+    
+    def test_ordered(self):
+        """Test ordered mode writes results in input order."""
+        lines = [json.dumps({"value": i}) + "\n" for i in range(6)]
+        output = io.StringIO()
+        
+        exit_code = run_batch(lines, output, jobs=2, ordered=True, app_cls=EchoApp)
+        
+        assert exit_code == 0
+        records = read_records(output)
+        assert [r["line"] for r in records] == [1, 2, 3, 4, 5, 6]
+        assert [r["result"]["value"] for r in records] == list(range(6))
+    
+    def test_unordered(self):
+        """Test unordered mode writes every result as it completes."""
+        lines = [json.dumps({"value": i}) + "\n" for i in range(6)]
+        output = io.StringIO()
+        
+        run_batch(lines, output, jobs=2, app_cls=EchoApp)
+        
+        records = read_records(output)
+        assert sorted(r["line"] for r in records) == [1, 2, 3, 4, 5, 6]
+        assert records[0]["line"] != 1
+    
+    def test_base_config_and_job_layer(self):
+        """Test job values are layered over the shared configuration."""
+        lines = ['{"value": 1}\n', '{"value": 2, "app_name": "Own"}\n']
+        output = io.StringIO()
+        
+        run_batch(
+            lines, output, {"app_name": "Base"}, jobs=1, ordered=True,
+            app_cls=EchoApp,
+        )
+        
+        names = [r["result"]["name"] for r in read_records(output)]
+        assert names == ["Base", "Own"]
+    
+    def test_invalid_lines_and_failures(self):
+        """Test bad lines and failing jobs are reported, not fatal."""
+        lines = [
+            '{"value": 1}\n',
+            '\n',
+            'not json\n',
+            '[1, 2]\n',
+            '{"value": 2, "fail": true}\n',
+        ]
+        output = io.StringIO()
+        
+        exit_code = run_batch(lines, output, jobs=1, ordered=True, app_cls=EchoApp)
+        
+        assert exit_code == 1
+        records = {r["line"]: r for r in read_records(output)}
+        assert sorted(records) == [1, 3, 4, 5]
+        assert records[1]["exit_code"] == 0
+        assert "error" in records[3]
+        assert "JSON object" in records[4]["error"]
+        assert records[5] == {"line": 5, "exit_code": 1, "result": None}
+    
+    def test_unpicklable_result_does_not_stop_batch(self):
+        """Test a job whose result cannot be sent back fails alone."""
+        lines = [
+            '{"value": 1}\n',
+            '{"value": 2, "unpicklable": true}\n',
+            '{"value": 3}\n',
+        ]
+        output = io.StringIO()
+        
+        exit_code = run_batch(lines, output, jobs=2, ordered=True, app_cls=EchoApp)
+        
+        assert exit_code == 1
+        records = read_records(output)
+        assert [r["line"] for r in records] == [1, 2, 3]
+        assert [r["exit_code"] for r in records] == [0, 1, 0]
+        assert "pickle" in records[1]["error"]
+        assert records[2]["result"]["value"] == 3
+    
+    def test_input_read_in_bounded_window(self):
+        """Test input is read lazily, a bounded window ahead of output."""
+        consumed = []
+        
+        def lines():
+            for i in range(100):
+                consumed.append(i)
+                yield json.dumps({"value": i + 1}) + "\n"
+        
+        class Output(io.StringIO):
+            read_ahead = []
+            
+            def write(self, text):
+                self.read_ahead.append(len(consumed))
+                return super().write(text)
+        
+        output = Output()
+        run_batch(lines(), output, jobs=1, ordered=True, app_cls=EchoApp)
+        
+        assert len(read_records(output)) == 100
+        written = range(1, 101)
+        assert all(
+            ahead - done <= 2 for ahead, done in zip(output.read_ahead, written)
+        )
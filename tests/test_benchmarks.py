@@ -0,0 +1,61 @@
+"""
+Tests for the benchmark runner.
+"""
+
+import pytest
+
+from benchmarks.runner import (
+    BENCHMARKS,
+    benchmark,
+    compare_reports,
+    format_report,
+    measure,
+    percentile,
+    run_benchmarks,
+)
+
+
+def test_percentile():
+    """Test percentile interpolation."""
+    samples = [4.0, 1.0, 3.0, 2.0]
+    
+    assert percentile(samples, 0) == 1.0
+    assert percentile(samples, 50) == 2.5
+    assert percentile(samples, 100) == 4.0
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_measure():
+    """Test warmup, repeat and number are honoured."""
+    calls = []
+    
+    stats = measure(lambda: calls.append(1), warmup=2, repeat=5, number=3)
+    
+    assert len(calls) == (2 + 5) * 3
+    assert len(stats["samples"]) == 5
+    assert stats["min"] <= stats["p50"] <= stats["p90"] <= stats["max"]
+    
+    with pytest.raises(ValueError, match="Invalid repeat count"):
+        measure(lambda: None, repeat=0)
+
+
+def test_run_and_compare():
+    """Test running a registered benchmark and comparing reports."""
+    cleaned_up = []
+    
+    @benchmark("test.noop")
+    def bench_noop():
+        try:
+            yield lambda: None
+        finally:
+            cleaned_up.append(True)
+    
+    try:
+        report = run_benchmarks(["test.noop"], warmup=0, repeat=3)
+    finally:
+        del BENCHMARKS["test.noop"]
+    
+    assert cleaned_up == [True]
+    assert report["results"]["test.noop"]["repeat"] == 3
+    assert "test.noop" in format_report(report)
+    assert "+0.0%" in compare_reports(report, report)
@@ -0,0 +1,206 @@
+"""
+Tests for the cache module.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from skeleton.cache import CACHE_BYTES, BlobCache
+
+
+def _compute_in_process(directory, marker_dir, index):
+    """Worker calling get_or_compute() for a shared key."""
+    def compute():
+        (marker_dir / f"computed-{index}").touch()
+        time.sleep(0.2)
+        return b"expensive"
+    
+    return BlobCache(directory).get_or_compute("shared", compute)
+
+
+class TestBlobCache:
+    """Test cases for BlobCache class."""
+    
+    def test_miss_then_hit(self, tmp_path):
+        """Test a stored blob is found again and counted."""
+        cache = BlobCache(tmp_path)
+        
+        assert cache.get("k") is None
+        digest = cache.put("k", b"value")
+        
+        assert cache.get("k") == b"value"
+        assert digest == hashlib.sha256(b"value").hexdigest()
+        assert cache.get_blob(digest) == b"value"
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+    
+    def test_equal_blobs_stored_once(self, tmp_path):
+        """Test keys with equal contents share one blob."""
+        cache = BlobCache(tmp_path)
+        
+        first = cache.put("a", b"same")
+        second = cache.put("b", b"same")
+        
+        assert first == second
+        assert len(list((tmp_path / "objects").glob("??/*"))) == 1
+        assert cache.get("a") == cache.get("b") == b"same"
+    
+    def test_equal_blobs_counted_once(self, tmp_path):
+        """Test storing known contents again does not start a sweep."""
+        cache = BlobCache(tmp_path, max_bytes=300)
+        
+        with patch.object(cache, "sweep", wraps=cache.sweep) as mock_sweep:
+            for key in "abcd":
+                cache.put(key, b"x" * 200)
+        
+        mock_sweep.assert_not_called()
+        assert cache._bytes == 200
+    
+    def test_put_replaces_key(self, tmp_path):
+        """Test a key refers to the blob stored last."""
+        cache = BlobCache(tmp_path)
+        cache.put("k", b"old")
+        cache.put("k", b"new")
+        
+        assert cache.get("k") == b"new"
+    
+    def test_persists_across_instances(self, tmp_path):
+        """Test blobs are found by a new cache on the same directory."""
+        BlobCache(tmp_path).put("k", b"value")
+        
+        assert BlobCache(tmp_path).get("k") == b"value"
+    
+    def test_no_temporary_files_left(self, tmp_path):
+        """Test writes leave nothing behind in the temporary directory."""
+        cache = BlobCache(tmp_path)
+        cache.put("k", b"value")
+        
+        assert list((tmp_path / "tmp").iterdir()) == []
+    
+    def test_corrupted_blob_discarded(self, tmp_path):
+        """Test a blob whose contents do not match its digest is a miss."""
+        cache = BlobCache(tmp_path)
+        digest = cache.put("k", b"value")
+        (tmp_path / "objects" / digest[:2] / digest[2:]).write_bytes(b"other")
+        
+        assert cache.get("k") is None
+        assert cache.get_blob(digest) is None
+    
+    def test_get_or_compute(self, tmp_path):
+        """Test the blob is computed on the first call only."""
+        cache = BlobCache(tmp_path)
+        calls = []
+        
+        def compute():
+            calls.append(1)
+            return b"result"
+        
+        assert cache.get_or_compute("k", compute) == b"result"
+        assert cache.get_or_compute("k", compute) == b"result"
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+    
+    @pytest.mark.skipif(os.name != "posix", reason="uses flock")
+    def test_get_or_compute_across_processes(self, tmp_path):
+        """Test concurrent processes compute a key only once."""
+        markers = tmp_path / "markers"
+        markers.mkdir()
+        context = multiprocessing.get_context("spawn")
+        args = [(tmp_path / "cache", markers, i) for i in range(3)]
+        
+        with context.Pool(3) as pool:
+            results = pool.starmap(_compute_in_process, args)
+        
+        assert results == [b"expensive"] * 3
+        assert len(list(markers.iterdir())) == 1
+    
+    def test_lru_sweep(self, tmp_path):
+        """Test the least recently read blobs are evicted first."""
+        cache = BlobCache(tmp_path, max_bytes=300, low_water=0.75)
+        now = time.time()
+        for age, key in enumerate(["c", "b", "a"]):
+            digest = cache.put(key, key.encode() * 100)
+            blob = tmp_path / "objects" / digest[:2] / digest[2:]
+            os.utime(blob, (now - 10 * (age + 1), now))
+        cache.get("c")
+        
+        cache.put("d", b"d" * 100)
+        
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.get("c") == b"c" * 100
+        assert cache.get("d") == b"d" * 100
+        stats = cache.stats()
+        assert stats["evictions"] == 2
+        assert stats["bytes_evicted"] == 200
+        assert len(list((tmp_path / "refs").iterdir())) == 2
+    
+    def test_sweep_under_limit(self, tmp_path):
+        """Test a sweep of a store that fits evicts nothing."""
+        cache = BlobCache(tmp_path, max_bytes=1000)
+        cache.put("k", b"value")
+        
+        assert cache.sweep() == 0
+        assert cache.get("k") == b"value"
+    
+    def test_sweep_removes_stale_temporary_files(self, tmp_path):
+        """Test leftovers of crashed writers are removed."""
+        cache = BlobCache(tmp_path)
+        stale = tmp_path / "tmp" / "leftover"
+        stale.write_bytes(b"partial")
+        os.utime(stale, (0, 0))
+        
+        cache.sweep()
+        
+        assert not stale.exists()
+    
+    def test_clear(self, tmp_path):
+        """Test clear() removes every blob and reference."""
+        cache = BlobCache(tmp_path)
+        cache.put("k", b"value")
+        
+        cache.clear()
+        
+        assert cache.get("k") is None
+        assert list((tmp_path / "refs").iterdir()) == []
+    
+    def test_clear_resets_size_gauge(self, tmp_path):
+        """Test clear() reports the store as empty."""
+        cache = BlobCache(tmp_path)
+        cache.put("k", b"value")
+        cache.sweep()
+        
+        cache.clear()
+        
+        assert CACHE_BYTES.value == 0
+    
+    def test_lookup_keeps_key_replaced_meanwhile(self, tmp_path):
+        """Test a key pointed at a new blob during a lookup is kept."""
+        cache = BlobCache(tmp_path)
+        cache.put("k", b"old")
+        read_blob = cache._read_blob
+        
+        def evicted_then_replaced(digest):
+            if digest == hashlib.sha256(b"old").hexdigest():
+                cache.put("k", b"new")
+                return None
+            return read_blob(digest)
+        
+        with patch.object(cache, "_read_blob", side_effect=evicted_then_replaced):
+            assert cache.get("k") == b"new"
+        assert cache.get("k") == b"new"
+    
+    def test_invalid_arguments(self, tmp_path):
+        """Test invalid sizes are rejected."""
+        with pytest.raises(ValueError, match="Invalid cache size"):
+            BlobCache(tmp_path, max_bytes=0)
+        with pytest.raises(ValueError, match="low water"):
+            BlobCache(tmp_path, low_water=0)
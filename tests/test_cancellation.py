@@ -0,0 +1,69 @@
+"""
+Tests for the cancellation module.
+"""
+
+import threading
+import time
+
+import pytest
+
+from skeleton.cancellation import (
+    EXIT_CANCELLED,
+    EXIT_TIMEOUT,
+    CancellationToken,
+    RunCancelled,
+    RunTimedOut,
+)
+
+
+class TestCancellationToken:
+    """Test cases for CancellationToken class."""
+    
+    def test_new_token(self):
+        """Test a fresh token is not cancelled."""
+        token = CancellationToken()
+        
+        assert token.cancelled is False
+        assert token.remaining() is None
+        token.raise_if_cancelled()
+    
+    def test_cancel(self):
+        """Test cancelling raises RunCancelled with the reason."""
+        token = CancellationToken()
+        token.cancel("Stop now")
+        
+        assert token.cancelled is True
+        assert token.timed_out is False
+        with pytest.raises(RunCancelled, match="Stop now") as info:
+            token.raise_if_cancelled()
+        assert info.value.exit_code == EXIT_CANCELLED
+    
+    def test_deadline(self):
+        """Test a token times out after its timeout."""
+        token = CancellationToken(timeout=0.01)
+        time.sleep(0.02)
+        
+        assert token.cancelled is True
+        assert token.remaining() == 0.0
+        with pytest.raises(RunTimedOut) as info:
+            token.raise_if_cancelled()
+        assert info.value.exit_code == EXIT_TIMEOUT
+    
+    def test_wait_wakes_on_cancel(self):
+        """Test wait returns as soon as another thread cancels."""
+        token = CancellationToken()
+        threading.Timer(0.01, token.cancel).start()
+        
+        start = time.monotonic()
+        assert token.wait(5) is True
+        assert time.monotonic() - start < 1
+    
+    def test_wait_bounded_by_deadline(self):
+        """Test wait never sleeps past the deadline."""
+        token = CancellationToken(timeout=0.01)
+        
+        assert token.wait(5) is True
+    
+    def test_wait_timeout(self):
+        """Test wait returns False when nothing happened."""
+        assert CancellationToken().wait(0.001) is False
@@ -2,13 +2,46 @@
 Tests for the CLI module.
 """
 
+import logging
+import os
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-from skeleton.cli import create_parser, main, load_config
+from skeleton.cli import (
+    DEBUG_LOG_MAX_BYTES,
+    _strip_connect,
+    create_parser,
+    load_config,
+    main,
+)
+from skeleton.flight_recorder import FlightRecorder
+
+# Cold-start budget for importing skeleton.cli, in milliseconds. Slow CI
+# machines can raise it with SKELETON_STARTUP_BUDGET_MS.
+STARTUP_BUDGET_MS = float(os.environ.get("SKELETON_STARTUP_BUDGET_MS", "100"))
+
+
+def _import_times(code):
+    """Run ``code`` under ``python -X importtime`` and parse the report."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    assert completed.returncode == 0, completed.stderr
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
 
 
 class TestCreateParser:
@@ -53,6 +86,91 @@ class TestCreateParser:
         
         assert args.log_file == Path("/tmp/test.log")
     
+    def test_parser_profile(self):
+        """Test profile argument."""
+        parser = create_parser()
+        args = parser.parse_args(["--profile", "both", "--profile-top", "5"])
+        
+        assert args.profile == "both"
+        assert args.profile_top == 5
+    
+    def test_parser_timeout(self):
+        """Test timeout argument."""
+        parser = create_parser()
+        args = parser.parse_args(["--timeout", "2.5"])
+        
+        assert args.timeout == 2.5
+    
+    def test_parser_log_rotation(self):
+        """Test log rotation arguments."""
+        parser = create_parser()
+        args = parser.parse_args([
+            "--log-max-bytes", "1000", "--log-max-age", "3600",
+            "--log-backups", "2", "--log-compress", "gzip",
+        ])
+        
+        assert args.log_max_bytes == 1000
+        assert args.log_max_age == 3600
+        assert args.log_backups == 2
+        assert args.log_compress == "gzip"
+    
+    def test_parser_log_rate_limit(self):
+        """Test log rate limiting arguments."""
+        parser = create_parser()
+        args = parser.parse_args(
+            ["--log-rate-limit", "5", "--log-burst", "20", "--log-sample", "10"]
+        )
+        
+        assert args.log_rate_limit == 5
+        assert args.log_burst == 20
+        assert args.log_sample == 10
+    
+    def test_parser_flight_recorder(self):
+        """Test flight recorder arguments."""
+        parser = create_parser()
+        args = parser.parse_args(["--flight-recorder", "--flight-records", "100"])
+        
+        assert args.flight_recorder is True
+        assert args.flight_records == 100
+    
+    def test_parser_flight(self):
+        """Test flight subcommand arguments."""
+        parser = create_parser()
+        
+        assert parser.parse_args(["flight"]).path is None
+        assert parser.parse_args(["flight", "x.dump"]).path == Path("x.dump")
+    
+    def test_parser_log_async(self):
+        """Test async logging arguments."""
+        parser = create_parser()
+        args = parser.parse_args(
+            ["--log-async", "--log-queue-size", "50", "--log-overflow", "drop"]
+        )
+        
+        assert args.log_async is True
+        assert args.log_queue_size == 50
+        assert args.log_overflow == "drop"
+    
+    def test_parser_batch(self):
+        """Test batch subcommand arguments."""
+        parser = create_parser()
+        args = parser.parse_args(["batch", "--jobs", "4", "--ordered"])
+        
+        assert args.command == "batch"
+        assert args.jobs == 4
+        assert args.ordered is True
+    
+    def test_parser_serve(self):
+        """Test serve subcommand."""
+        parser = create_parser()
+        args = parser.parse_args(
+            ["serve", "--socket", "/tmp/s.sock", "--max-jobs", "3"]
+        )
+        
+        assert args.command == "serve"
+        assert args.socket == Path("/tmp/s.sock")
+        assert args.max_jobs == 3
+    
     def test_parser_config_file(self):
         """Test config file argument."""
         parser = create_parser()
@@ -74,15 +192,25 @@ class TestLoadConfig:
         config = load_config(Path("/nonexistent/file.json"))
         assert config == {}
     
-    @patch('pathlib.Path.exists')
-    def test_load_config_existing_file(self, mock_exists):
+    def test_load_config_existing_file(self, tmp_path):
         """Test loading config with existing file."""
-        mock_exists.return_value = True
-        config_file = Path("/tmp/config.json")
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"app_name": "From File"}')
         
-        config = load_config(config_file)
-        # For now, just returns empty dict as implementation is placeholder
-        assert config == {}
+        config = load_config(config_file, cache_dir=tmp_path / "cache")
+        assert config == {"app_name": "From File"}
+    
+    @patch('skeleton.cli.setup_logging')
+    def test_main_invalid_config_file(self, mock_setup_logging, tmp_path, capsys):
+        """Test an unparsable config file is reported as a usage error."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text("{not json")
+        
+        with pytest.raises(SystemExit) as info:
+            main(["--config-file", str(config_file)])
+        
+        assert info.value.code == 2
+        assert "could not load config file" in capsys.readouterr().err
 
 
 class TestMain:
@@ -138,6 +266,7 @@ class TestMain:
         # Check that setup_logging was called with log file
         call_args = mock_setup_logging.call_args
         assert call_args[1]["log_file"] == mock_app_data_dir / "debug.log"
+        assert call_args[1]["max_bytes"] == DEBUG_LOG_MAX_BYTES
     
     @patch('skeleton.cli.SkeletonApp')
     @patch('skeleton.cli.setup_logging')
@@ -155,6 +284,153 @@ class TestMain:
         call_args = mock_setup_logging.call_args
         assert call_args[1]["level"] == "ERROR"
     
+    @patch('skeleton.cli.SkeletonApp')
+    @patch('skeleton.cli.setup_logging')
+    def test_main_config_layers(self, mock_setup_logging, mock_skeleton_app, monkeypatch):
+        """Test environment values apply unless overridden on the CLI."""
+        mock_skeleton_app.return_value.run.return_value = 0
+        monkeypatch.setenv("SKELETON_LOG_LEVEL", "\"DEBUG\"")
+        monkeypatch.setenv("SKELETON_APP_NAME", "From Env")
+        
+        main(["--log-level", "ERROR"])
+        
+        config = mock_skeleton_app.call_args[0][0]
+        assert config["app_name"] == "From Env"
+        assert config["log_level"] == "ERROR"
+        assert config["debug"] is False
+    
+    @patch('skeleton.cli.SkeletonApp')
+    @patch('skeleton.cli.setup_logging')
+    @patch('skeleton.cli.get_app_data_dir')
+    def test_main_profile(self, mock_get_app_data_dir, mock_setup_logging, mock_skeleton_app, tmp_path, capsys):
+        """Test main writes profile reports and prints a summary."""
+        mock_skeleton_app.return_value.run.return_value = 0
+        mock_get_app_data_dir.return_value = tmp_path
+        
+        result = main(["--profile", "cpu"])
+        
+        assert result == 0
+        assert len(list(tmp_path.glob("*.pstats"))) == 1
+        assert "CPU profile:" in capsys.readouterr().err
+    
+    @patch('skeleton.cli.SkeletonApp')
+    @patch('skeleton.cli.setup_logging')
+    def test_main_timeout(self, mock_setup_logging, mock_skeleton_app):
+        """Test main passes a token with a deadline to the run."""
+        mock_skeleton_app.return_value.run.return_value = 124
+        
+        result = main(["--timeout", "5"])
+        
+        assert result == 124
+        token = mock_skeleton_app.return_value.run.call_args[0][0]
+        assert 0 < token.remaining() <= 5
+    
+    def test_main_invalid_timeout(self):
+        """Test a non-positive timeout is rejected."""
+        with pytest.raises(SystemExit):
+            main(["--timeout", "0"])
+    
+    @pytest.mark.parametrize("option", [
+        ["--log-rate-limit", "0"], ["--log-burst", "0"], ["--log-sample", "0"],
+    ])
+    def test_main_invalid_log_rate_limit(self, option):
+        """Test invalid log rate limits are rejected."""
+        with pytest.raises(SystemExit):
+            main(option)
+    
+    @patch('skeleton.cli.SkeletonApp')
+    @patch('skeleton.cli.setup_logging')
+    @patch('skeleton.cli.get_app_data_dir')
+    def test_main_flight_recorder(self, mock_get_app_data_dir, mock_setup_logging, mock_skeleton_app):
+        """Test --flight-recorder keeps its ring buffer in the data directory."""
+        mock_skeleton_app.return_value.run.return_value = 0
+        mock_get_app_data_dir.return_value = Path("/tmp/app_data")
+        
+        assert main(["--flight-recorder", "--flight-records", "50"]) == 0
+        
+        kwargs = mock_setup_logging.call_args.kwargs
+        assert kwargs["flight_recorder"] == Path("/tmp/app_data/flight-recorder.bin")
+        assert kwargs["flight_records"] == 50
+    
+    @patch('skeleton.cli.get_app_data_dir')
+    def test_main_flight(self, mock_get_app_data_dir, tmp_path, capsys):
+        """Test the flight subcommand prints the latest dump."""
+        mock_get_app_data_dir.return_value = tmp_path
+        recorder = FlightRecorder(tmp_path / "flight-recorder.bin")
+        try:
+            recorder.handle(logging.makeLogRecord(
+                {"name": "skeleton.core", "levelno": logging.DEBUG,
+                 "levelname": "DEBUG", "msg": "older"}
+            ))
+            recorder.dump()
+            recorder.handle(logging.makeLogRecord(
+                {"name": "skeleton.core", "levelno": logging.DEBUG,
+                 "levelname": "DEBUG", "msg": "newer"}
+            ))
+            recorder.dump()
+        finally:
+            recorder.close()
+        
+        assert main(["flight"]) == 0
+        
+        lines = capsys.readouterr().out.splitlines()
+        assert [line.split(" - ", 1)[1] for line in lines] == [
+            "skeleton.core - DEBUG - older", "skeleton.core - DEBUG - newer",
+        ]
+    
+    @pytest.mark.skipif(os.name != "posix", reason="uses flock")
+    @patch('skeleton.cli.get_app_data_dir')
+    def test_main_flight_latest_buffer(self, mock_get_app_data_dir, tmp_path, capsys):
+        """Test without dumps the most recently written ring buffer is printed."""
+        mock_get_app_data_dir.return_value = tmp_path
+        recorders = []
+        try:
+            for message in ("shared", "per-process"):
+                recorder = FlightRecorder(tmp_path / "flight-recorder.bin")
+                recorders.append(recorder)
+                recorder.handle(logging.makeLogRecord(
+                    {"name": "skeleton.core", "levelno": logging.DEBUG,
+                     "levelname": "DEBUG", "msg": message}
+                ))
+            os.utime(recorders[0].path, (0, 0))
+            
+            assert main(["flight"]) == 0
+        finally:
+            for recorder in recorders:
+                recorder.close()
+        
+        lines = capsys.readouterr().out.splitlines()
+        assert [line.split(" - ", 1)[1] for line in lines] == [
+            "skeleton.core - DEBUG - per-process",
+        ]
+    
+    def test_main_flight_invalid_file(self, tmp_path):
+        """Test the flight subcommand rejects other files."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"other")
+        
+        with pytest.raises(SystemExit):
+            main(["flight", str(path)])
+    
+    @patch('skeleton.batch.run_batch')
+    @patch('skeleton.cli.setup_logging')
+    def test_main_batch(self, mock_setup_logging, mock_run_batch):
+        """Test batch mode streams stdin to stdout with logs on stderr."""
+        mock_run_batch.return_value = 0
+        
+        result = main(["batch", "--jobs", "3"])
+        
+        assert result == 0
+        args, kwargs = mock_run_batch.call_args
+        assert args[:2] == (sys.stdin, sys.stdout)
+        assert kwargs == {"jobs": 3, "ordered": False}
+        assert mock_setup_logging.call_args.kwargs["stream"] is sys.stderr
+    
+    def test_main_invalid_jobs(self):
+        """Test a job count below one is rejected."""
+        with pytest.raises(SystemExit):
+            main(["batch", "--jobs", "0"])
+    
     @patch('skeleton.cli.SkeletonApp')
     @patch('skeleton.cli.setup_logging')
     def test_main_app_failure(self, mock_setup_logging, mock_skeleton_app):
@@ -168,6 +444,119 @@ class TestMain:
         assert result == 1
 
 
+class TestConnect:
+    """Test cases for the thin client mode."""
+    
+    def test_strip_connect(self):
+        """Test --connect and the socket are removed from forwarded args."""
+        assert _strip_connect(["--connect", "--timeout", "5"]) == ["--timeout", "5"]
+        assert _strip_connect(["--timeout", "5", "--connect"]) == ["--timeout", "5"]
+        assert _strip_connect(
+            ["--connect", "--daemon-socket", "/s.sock", "--log-level", "ERROR"]
+        ) == ["--log-level", "ERROR"]
+        assert _strip_connect(
+            ["--connect", "--daemon-socket=/s.sock", "--log-level", "ERROR"]
+        ) == ["--log-level", "ERROR"]
+    
+    def test_strip_connect_abbreviations(self):
+        """Test abbreviated option names are removed too."""
+        assert _strip_connect(["--conn", "--daemon", "/s.sock", "--timeout", "5"]) == [
+            "--timeout", "5"
+        ]
+    
+    @patch('skeleton.client.run_remote')
+    @patch('skeleton.cli.setup_logging')
+    def test_main_connect(self, mock_setup_logging, mock_run_remote):
+        """Test main forwards arguments to the daemon."""
+        mock_run_remote.return_value = 3
+        
+        result = main(
+            ["--connect", "--daemon-socket", "/tmp/s.sock", "--log-level", "ERROR"]
+        )
+        
+        assert result == 3
+        mock_run_remote.assert_called_once_with(
+            Path("/tmp/s.sock"), ["--log-level", "ERROR"]
+        )
+        mock_setup_logging.assert_not_called()
+    
+    @patch('skeleton.client.run_remote')
+    @patch('skeleton.client.default_socket_path')
+    def test_main_connect_default_socket(self, mock_default_socket, mock_run_remote):
+        """Test --connect alone uses the default socket."""
+        mock_default_socket.return_value = Path("/data/skeleton.sock")
+        mock_run_remote.return_value = 0
+        
+        assert main(["--connect", "--timeout", "5"]) == 0
+        
+        mock_run_remote.assert_called_once_with(
+            Path("/data/skeleton.sock"), ["--timeout", "5"]
+        )
+    
+    @pytest.mark.parametrize("argv", [
+        ["--connect", "serve"],
+        ["--daemon-socket", "/tmp/s.sock"],
+    ])
+    @patch('skeleton.client.run_remote')
+    def test_main_connect_rejected(self, mock_run_remote, argv):
+        """Test --connect with a subcommand, or a socket alone, is an error."""
+        with pytest.raises(SystemExit) as exc_info:
+            main(argv)
+        
+        assert exc_info.value.code == 2
+        mock_run_remote.assert_not_called()
+
+
+class TestStartup:
+    """Test cases for the fast startup path."""
+    
+    @pytest.mark.parametrize("flag", ["--version", "--help"])
+    def test_flags_skip_heavy_imports(self, flag):
+        """Test --version and --help import neither logging nor core."""
+        times = _import_times(
+            "import sys\n"
+            "from skeleton.cli import main\n"
+            "try:\n"
+            f"    main([{flag!r}])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "assert 'logging' not in sys.modules\n"
+            "assert 'skeleton.core' not in sys.modules\n"
+        )
+        
+        assert "skeleton.cli" in times
+        assert "logging" not in times
+        assert "skeleton.core" not in times
+    
+    def test_import_within_budget(self):
+        """Test importing the CLI stays within the cold-start budget."""
+        times = _import_times("import skeleton.cli")
+        
+        assert times["skeleton.cli"] < STARTUP_BUDGET_MS, (
+            f"Importing skeleton.cli took {times['skeleton.cli']:.1f} ms, "
+            f"budget is {STARTUP_BUDGET_MS:.0f} ms"
+        )
+    
+    def test_package_exports_are_lazy(self):
+        """Test importing the package defers its submodules."""
+        _import_times(
+            "import sys\n"
+            "import skeleton\n"
+            "assert 'skeleton.core' not in sys.modules\n"
+            "assert skeleton.SkeletonApp.__module__ == 'skeleton.core'\n"
+            "assert 'SkeletonApp' in dir(skeleton)\n"
+        )
+    
+    def test_deferred_names_are_attributes(self):
+        """Test deferred names resolve as module attributes."""
+        import skeleton.cli
+        from skeleton.core import SkeletonApp
+        
+        assert skeleton.cli.SkeletonApp is SkeletonApp
+        with pytest.raises(AttributeError):
+            skeleton.cli.does_not_exist
+
+
 def test_main_entry_point():
     """Test that main can be called as entry point."""
     with patch('skeleton.cli.main') as mock_main:
@@ -0,0 +1,219 @@
+"""
+Tests for the config module.
+"""
+
+import json
+import os
+import pickle
+import sys
+from types import MappingProxyType
+
+import pytest
+
+from skeleton.config import (
+    DEFAULT_CONFIG,
+    LayeredConfig,
+    env_layer,
+    freeze,
+    load_config_file,
+)
+
+
+class TestFreeze:
+    """Test cases for freeze function."""
+    
+    def test_freeze_copies_plain_dict(self):
+        """Test plain dictionaries are copied into a read-only view."""
+        source = {"a": 1}
+        frozen = freeze(source)
+        source["a"] = 2
+        
+        assert frozen["a"] == 1
+        with pytest.raises(TypeError):
+            frozen["a"] = 3
+    
+    def test_freeze_shares_read_only_mapping(self):
+        """Test read-only mappings are shared without copying."""
+        proxy = MappingProxyType({"a": 1})
+        
+        assert freeze(proxy) is proxy
+
+
+def test_env_layer():
+    """Test building a layer from environment variables."""
+    environ = {
+        "SKELETON_DEBUG": "true",
+        "SKELETON_WORKERS": "4",
+        "SKELETON_APP_NAME": "From Env",
+        "OTHER_DEBUG": "false",
+    }
+    
+    layer = env_layer(environ=environ)
+    
+    assert dict(layer) == {"debug": True, "workers": 4, "app_name": "From Env"}
+
+
+class TestLayeredConfig:
+    """Test cases for LayeredConfig class."""
+    
+    def test_from_layers_priority(self):
+        """Test cli > env > file > defaults."""
+        config = LayeredConfig.from_layers(
+            file={"app_name": "File", "version": "2.0", "x": "file"},
+            env={"x": "env", "y": "env"},
+            cli={"y": "cli"},
+        )
+        
+        assert config["app_name"] == "File"
+        assert config["version"] == "2.0"
+        assert config["debug"] is False
+        assert config["x"] == "env"
+        assert config["y"] == "cli"
+        assert config.layer_names == ("cli", "env", "file", "defaults")
+    
+    def test_mapping_interface(self):
+        """Test lookups, iteration and equality."""
+        config = LayeredConfig({"base": {"a": 1, "b": 2}, "top": {"b": 3}})
+        
+        assert len(config) == 2
+        assert sorted(config) == ["a", "b"]
+        assert "a" in config
+        assert "missing" not in config
+        assert config.get("missing", "default") == "default"
+        assert config == {"a": 1, "b": 3}
+        with pytest.raises(KeyError):
+            config["missing"]
+    
+    def test_immutable(self):
+        """Test the configuration cannot be modified."""
+        config = LayeredConfig({"base": {"a": 1}})
+        
+        with pytest.raises(TypeError):
+            config["a"] = 2
+        with pytest.raises(AttributeError):
+            config.extra = 1
+    
+    def test_with_layer_shares_other_layers(self):
+        """Test replacing a layer keeps priority and shares the rest."""
+        base = LayeredConfig.from_layers(file={"a": 1}, cli={"a": 2})
+        
+        updated = base.with_layer("file", {"a": 10, "b": 20})
+        
+        assert updated["a"] == 2
+        assert updated["b"] == 20
+        assert base.get("b") is None
+        assert updated.layer("cli") is base.layer("cli")
+        assert updated.layer("defaults") is DEFAULT_CONFIG
+    
+    def test_with_layer_adds_on_top(self):
+        """Test adding a new layer gives it the highest priority."""
+        config = LayeredConfig.from_layers().with_layer("override", {"debug": True})
+        
+        assert config["debug"] is True
+        assert config.layer_names[0] == "override"
+    
+    def test_with_layer_adds_standard_layer_by_priority(self):
+        """Test a new file layer goes below the env and cli layers."""
+        base = LayeredConfig.from_layers(env={"a": 2}, cli={"b": 3})
+        
+        config = base.with_layer("file", {"a": 1, "b": 1, "c": 1})
+        
+        assert config.layer_names == ("cli", "env", "file", "defaults")
+        assert (config["a"], config["b"], config["c"]) == (2, 3, 1)
+        assert base.with_layer("job", {}).layer_names[0] == "job"
+    
+    def test_with_defaults_reuses_self(self):
+        """Test configurations already using the defaults are reused."""
+        config = LayeredConfig.from_layers(cli={"a": 1})
+        
+        assert config.with_defaults() is config
+        assert config.with_defaults({"a": 0, "z": 1})["z"] == 1
+    
+    def test_pickle_roundtrip(self):
+        """Test configurations can be sent to other processes."""
+        config = LayeredConfig.from_layers(file={"a": 1}, cli={"b": 2})
+        
+        restored = pickle.loads(pickle.dumps(config))
+        
+        assert restored == config
+        assert restored.layer_names == config.layer_names
+
+
+class TestLoadConfigFile:
+    """Test cases for load_config_file function."""
+    
+    def test_load_json(self, tmp_path):
+        """Test loading a JSON config file."""
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({"app_name": "From File", "n": [1, 2]}))
+        
+        config = load_config_file(path, tmp_path / "cache")
+        
+        assert config == {"app_name": "From File", "n": [1, 2]}
+    
+    def test_load_toml(self, tmp_path):
+        """Test loading a TOML config file, including dates."""
+        if sys.version_info < (3, 11):
+            pytest.importorskip("tomli")
+        path = tmp_path / "config.toml"
+        path.write_text('debug = true\nreleased = 2024-01-02\n[db]\nport = 5432\n')
+        
+        config = load_config_file(path, tmp_path / "cache")
+        cached = load_config_file(path, tmp_path / "cache")
+        
+        assert config["debug"] is True
+        assert config["db"] == {"port": 5432}
+        assert cached == config
+    
+    def test_cache_reused_while_unchanged(self, tmp_path, monkeypatch):
+        """Test an unchanged file is served from the cache."""
+        path = tmp_path / "config.json"
+        path.write_text('{"a": 1}')
+        cache_dir = tmp_path / "cache"
+        load_config_file(path, cache_dir)
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("config was parsed again")
+        
+        monkeypatch.setattr(json, "load", fail)
+        
+        assert load_config_file(path, cache_dir) == {"a": 1}
+        assert len(list(cache_dir.iterdir())) == 1
+    
+    def test_cache_invalidated_on_change(self, tmp_path):
+        """Test a modified file is parsed again."""
+        path = tmp_path / "config.json"
+        path.write_text('{"a": 1}')
+        cache_dir = tmp_path / "cache"
+        load_config_file(path, cache_dir)
+        
+        path.write_text('{"a": 22}')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        assert load_config_file(path, cache_dir) == {"a": 22}
+    
+    def test_corrupt_cache_ignored(self, tmp_path):
+        """Test an unreadable cache file is rewritten."""
+        path = tmp_path / "config.json"
+        path.write_text('{"a": 1}')
+        cache_dir = tmp_path / "cache"
+        load_config_file(path, cache_dir)
+        cache_file = next(cache_dir.iterdir())
+        cache_file.write_bytes(b"Mgarbage")
+        
+        assert load_config_file(path, cache_dir) == {"a": 1}
+        assert load_config_file(path, cache_dir) == {"a": 1}
+    
+    def test_invalid_files(self, tmp_path):
+        """Test unsupported formats and non-object JSON are rejected."""
+        yaml_path = tmp_path / "config.yaml"
+        yaml_path.write_text("a: 1")
+        list_path = tmp_path / "config.json"
+        list_path.write_text("[1, 2]")
+        
+        with pytest.raises(ValueError, match="Unsupported config file format"):
+            load_config_file(yaml_path, tmp_path / "cache")
+        with pytest.raises(ValueError, match="must contain a JSON object"):
+            load_config_file(list_path, tmp_path / "cache")
+
@@ -0,0 +1,81 @@
+"""
+Tests for the config_watcher module.
+"""
+
+import pytest
+
+from skeleton.config_watcher import ConfigWatcher
+
+
+class TestConfigWatcher:
+    """Test cases for ConfigWatcher class."""
+    
+    def test_unchanged_file(self, tmp_path, write_config):
+        """Test nothing is reported while the file is unchanged."""
+        path = tmp_path / "config.json"
+        write_config(path, {"a": 1})
+        changes = []
+        watcher = ConfigWatcher(path, lambda *args: changes.append(args))
+        
+        assert watcher.check() is False
+        assert changes == []
+    
+    def test_change_reported(self, tmp_path, write_config):
+        """Test a modified file is reloaded and passed on."""
+        path = tmp_path / "config.json"
+        write_config(path, {"a": 1})
+        changes = []
+        watcher = ConfigWatcher(
+            path, lambda *args: changes.append(args), cache_dir=tmp_path / "c"
+        )
+        
+        write_config(path, {"a": 2})
+        
+        assert watcher.check() is True
+        assert watcher.check() is False
+        assert changes[0][0] == {"a": 2}
+        assert watcher.stats()["reloads"] == 1
+    
+    def test_invalid_change_skipped(self, tmp_path, write_config):
+        """Test invalid configurations are counted and not passed on."""
+        path = tmp_path / "config.json"
+        write_config(path, {"a": 1})
+        changes = []
+        watcher = ConfigWatcher(
+            path, lambda *args: changes.append(args), cache_dir=tmp_path / "c"
+        )
+        
+        write_config(path, {"debug": "yes"})
+        assert watcher.check() is False
+        path.write_text("{broken")
+        assert watcher.check() is False
+        
+        assert changes == []
+        assert watcher.stats()["errors"] == 2
+    
+    def test_background_polling(self, tmp_path, write_config):
+        """Test the background thread picks up changes."""
+        path = tmp_path / "config.json"
+        write_config(path, {"a": 1})
+        changes = []
+        watcher = ConfigWatcher(
+            path,
+            lambda *args: changes.append(args),
+            interval=0.01,
+            cache_dir=tmp_path / "c",
+        ).start()
+        try:
+            write_config(path, {"a": 2})
+            for _ in range(500):
+                if changes:
+                    break
+                watcher._stopped.wait(0.01)
+        finally:
+            watcher.stop()
+        
+        assert changes[0][0] == {"a": 2}
+    
+    def test_invalid_interval(self, tmp_path):
+        """Test a non-positive interval is rejected."""
+        with pytest.raises(ValueError, match="Invalid poll interval"):
+            ConfigWatcher(tmp_path / "config.json", print, interval=0)
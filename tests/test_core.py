@@ -2,10 +2,57 @@
 Tests for the core module.
 """
 
+import asyncio
+import io
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
 import pytest
 from unittest.mock import patch, MagicMock
 
-from skeleton.core import SkeletonApp
+from skeleton.cancellation import EXIT_CANCELLED, EXIT_TIMEOUT, CancellationToken
+from skeleton.config import LayeredConfig
+from skeleton.flight_recorder import FlightRecorder, find_flight_dumps, read_flight_records
+from skeleton.utils import JsonFormatter
+from skeleton.core import (
+    RUN_FAILURES_TOTAL,
+    RUNS_IN_PROGRESS,
+    RUN_SECONDS,
+    RUNS_TOTAL,
+    RunResult,
+    SkeletonApp,
+    gather_runs,
+)
+from skeleton.result_cache import ResultCache
+
+
+class DoublingApp(SkeletonApp):
+    """Picklable subclass used by the process pool tests."""
+    
+    def _execute_main_logic(self):
+        if self.config.get("fail"):
+            raise ValueError("job failed")
+        if self.config.get("unpicklable"):
+            return (i for i in range(self.config["value"]))
+        time.sleep(self.config.get("sleep", 0))
+        return self.config["value"] * 2
+
+
+class WorkerSetupApp(SkeletonApp):
+    """Subclass recording how often per-worker setup ran."""
+    
+    setup_calls = 0
+    
+    @classmethod
+    def setup_worker(cls):
+        cls.setup_calls += 1
+    
+    def _execute_main_logic(self):
+        return os.getpid(), self.setup_calls
 
 
 class TestSkeletonApp:
@@ -37,7 +84,7 @@ class TestSkeletonApp:
         """Test successful application run."""
         app = SkeletonApp()
         
-        with patch.object(app, '_execute_main_logic', return_value="success"):
+        with patch.object(SkeletonApp, '_execute_main_logic', return_value="success"):
             result = app.run()
             
         assert result == 0
@@ -46,7 +93,7 @@ class TestSkeletonApp:
         """Test exception handling in debug mode."""
         app = SkeletonApp({"debug": True})
         
-        with patch.object(app, '_execute_main_logic', side_effect=Exception("Test error")):
+        with patch.object(SkeletonApp, '_execute_main_logic', side_effect=Exception("Test error")):
             with pytest.raises(Exception, match="Test error"):
                 app.run()
     
@@ -54,11 +101,32 @@ class TestSkeletonApp:
         """Test exception handling in normal mode."""
         app = SkeletonApp({"debug": False})
         
-        with patch.object(app, '_execute_main_logic', side_effect=Exception("Test error")):
+        with patch.object(SkeletonApp, '_execute_main_logic', side_effect=Exception("Test error")):
             result = app.run()
             
         assert result == 1
     
+    def test_run_exception_dumps_flight_recorder(self, tmp_path):
+        """Test a failed run dumps the flight recorder with its traceback."""
+        recorder = FlightRecorder(tmp_path / "flight-recorder.bin")
+        logger = logging.getLogger("skeleton.core")
+        logger.addHandler(recorder)
+        logger.setLevel(logging.DEBUG)
+        app = SkeletonApp({"debug": False})
+        try:
+            with patch.object(SkeletonApp, '_execute_main_logic', side_effect=Exception("Test error")):
+                assert app.run() == 1
+        finally:
+            logger.removeHandler(recorder)
+            logger.setLevel(logging.NOTSET)
+            recorder.close()
+        
+        (dump,) = find_flight_dumps(tmp_path)
+        messages = [record.message for record in read_flight_records(dump)]
+        assert messages[0] == "Starting Skeleton Project v0.1.0"
+        assert "Application failed: Test error" in messages
+        assert messages[-1].endswith("Exception: Test error")
+    
     def test_execute_main_logic(self):
         """Test main logic execution."""
         app = SkeletonApp()
@@ -82,6 +150,428 @@ class TestSkeletonApp:
         assert status["version"] == "1.0.0"
         assert status["debug"] is True
         assert status["config"] == config
+    
+    def test_run_records_metrics(self):
+        """Test runs update the run metrics."""
+        runs = RUNS_TOTAL.value
+        failures = RUN_FAILURES_TOTAL.value
+        observations = RUN_SECONDS.count
+        app = SkeletonApp({"debug": False})
+        
+        app.run()
+        with patch.object(SkeletonApp, '_execute_main_logic', side_effect=Exception("Test error")):
+            app.run()
+        
+        assert RUNS_TOTAL.value == runs + 2
+        assert RUN_FAILURES_TOTAL.value == failures + 1
+        assert RUN_SECONDS.count == observations + 2
+        metrics = app.get_status()["metrics"]
+        assert metrics["skeleton_runs_total"] == RUNS_TOTAL.value
+        assert metrics["skeleton_runs_in_progress"] == 0
+    
+    def test_run_adds_log_context(self):
+        """Test JSON log records of a run carry app and run fields."""
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        logger = logging.getLogger("skeleton.core")
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        try:
+            SkeletonApp({"app_name": "Ctx"}).run()
+            SkeletonApp({"app_name": "Ctx"}).run()
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(logging.NOTSET)
+        
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert {r["app"] for r in records} == {"Ctx"}
+        run_ids = sorted({r["run_id"] for r in records})
+        assert len(run_ids) == 2
+    
+    def test_init_does_not_mutate_config(self):
+        """Test the caller's dictionary is left untouched."""
+        config = {"custom": 1}
+        
+        app = SkeletonApp(config)
+        config["custom"] = 2
+        
+        assert config == {"custom": 2}
+        assert app.config["custom"] == 1
+        assert app.config["app_name"] == "Skeleton Project"
+    
+    def test_init_shares_layered_config(self):
+        """Test a shared LayeredConfig is used without copying."""
+        base = LayeredConfig.from_layers(cli={"debug": True})
+        
+        first = SkeletonApp(base)
+        second = SkeletonApp(base)
+        
+        assert first.config is base
+        assert second.config is base
+        assert first.get_status()["debug"] is True
+    
+    def test_instances_have_no_dict(self):
+        """Test instances use __slots__ instead of a __dict__."""
+        assert not hasattr(SkeletonApp(), "__dict__")
+    
+    def test_instance_memory_budget(self):
+        """Test 100k instances sharing a config stay within budget."""
+        base = LayeredConfig.from_layers(cli={"x": 1})
+        count = 100_000
+        budget = 120 * count
+        
+        tracemalloc.start()
+        try:
+            apps = [SkeletonApp(base) for _ in range(count)]
+            used, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        assert len(apps) == count
+        assert used < budget
+
+
+class TestRunMany:
+    """Test cases for SkeletonApp.run_many."""
+    
+    def test_run_many_results(self):
+        """Test results and exit codes for every job."""
+        inputs = ({"value": i} for i in range(20))
+        
+        results = list(DoublingApp.run_many(inputs, workers=2))
+        
+        assert all(isinstance(r, RunResult) for r in results)
+        assert sorted(r.index for r in results) == list(range(20))
+        for r in results:
+            assert r.exit_code == 0
+            assert r.result == r.index * 2
+    
+    def test_run_many_failure_exit_code(self):
+        """Test failing jobs report exit code 1 without debug."""
+        inputs = [{"value": 1}, {"value": 2, "fail": True}]
+        
+        results = sorted(DoublingApp.run_many(inputs, workers=2))
+        
+        assert results[0] == RunResult(0, 0, 2)
+        assert results[1] == RunResult(1, 1, None)
+    
+    def test_run_many_failure_debug_mode(self):
+        """Test failing jobs re-raise in debug mode."""
+        inputs = [{"value": 1, "fail": True, "debug": True}]
+        
+        with pytest.raises(ValueError, match="job failed"):
+            list(DoublingApp.run_many(inputs, workers=1))
+    
+    def test_run_many_unpicklable_result(self):
+        """Test a result that cannot be sent back fails only its job."""
+        inputs = [{"value": 1}, {"value": 2, "unpicklable": True}, {"value": 3}]
+        
+        results = sorted(DoublingApp.run_many(inputs, workers=2))
+        
+        assert results[0] == RunResult(0, 0, 2)
+        assert results[1][:3] == (1, 1, None)
+        assert "pickle" in results[1].error
+        assert results[2] == RunResult(2, 0, 6)
+    
+    def test_run_many_unpicklable_result_debug_mode(self):
+        """Test the pickling error is re-raised in debug mode."""
+        inputs = [{"value": 2, "unpicklable": True, "debug": True}]
+        
+        with pytest.raises(TypeError, match="pickle"):
+            list(DoublingApp.run_many(inputs, workers=1))
+    
+    def test_run_many_setup_worker_once(self):
+        """Test per-worker setup runs once per process."""
+        results = list(WorkerSetupApp.run_many([{}] * 10, workers=2))
+        
+        assert len(results) == 10
+        for r in results:
+            pid, setup_calls = r.result
+            assert pid != os.getpid()
+            assert setup_calls == 1
+    
+    def test_run_many_ordered(self):
+        """Test ordered mode yields in input order despite a slow job."""
+        inputs = [{"value": 0, "sleep": 0.3}] + [{"value": i} for i in range(1, 8)]
+        
+        results = list(DoublingApp.run_many(inputs, workers=2, ordered=True))
+        
+        assert [r.index for r in results] == list(range(8))
+        assert [r.result for r in results] == [i * 2 for i in range(8)]
+    
+    def test_run_many_empty_inputs(self):
+        """Test run_many with no jobs."""
+        assert list(DoublingApp.run_many([], workers=1)) == []
+
+
+class SleepingApp(SkeletonApp):
+    """Subclass with an awaitable main logic hook."""
+    
+    in_flight = 0
+    peak = 0
+    
+    async def _execute_main_logic_async(self):
+        cls = type(self)
+        cls.in_flight += 1
+        cls.peak = max(cls.peak, cls.in_flight)
+        await asyncio.sleep(0.01)
+        cls.in_flight -= 1
+        if self.config.get("fail"):
+            raise ValueError("async job failed")
+        return "done"
+
+
+class LoopingApp(SkeletonApp):
+    """Subclass looping until it is cancelled."""
+    
+    def _execute_main_logic(self):
+        while True:
+            self.check_cancelled()
+            time.sleep(0.001)
+    
+    async def _execute_main_logic_async(self):
+        await asyncio.sleep(10)
+
+
+class TestCancellation:
+    """Test cases for cancelling runs."""
+    
+    def test_run_timeout(self):
+        """Test a run stops with EXIT_TIMEOUT after its timeout."""
+        app = LoopingApp({"debug": True})
+        
+        assert app.run(timeout=0.05) == EXIT_TIMEOUT
+        assert app.cancel_token is None
+    
+    def test_run_cancelled_from_other_thread(self):
+        """Test cancelling a token stops a running run."""
+        app = LoopingApp()
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        
+        assert app.run(token) == EXIT_CANCELLED
+    
+    def test_run_already_cancelled(self):
+        """Test a cancelled token stops the run before the main logic."""
+        token = CancellationToken()
+        token.cancel()
+        
+        with patch.object(SkeletonApp, '_execute_main_logic') as mock_logic:
+            assert SkeletonApp().run(token) == EXIT_CANCELLED
+        
+        mock_logic.assert_not_called()
+    
+    def test_run_token_and_timeout(self):
+        """Test passing both a token and a timeout is rejected."""
+        with pytest.raises(ValueError, match="either a token or a timeout"):
+            SkeletonApp().run(CancellationToken(), timeout=1)
+    
+    def test_check_cancelled_outside_run(self):
+        """Test check_cancelled is a no-op outside a run."""
+        SkeletonApp().check_cancelled()
+    
+    def test_run_async_timeout_cancels_awaitable(self):
+        """Test run_async stops awaiting main logic at the deadline."""
+        app = LoopingApp()
+        
+        start = time.monotonic()
+        assert asyncio.run(app.run_async(timeout=0.05)) == EXIT_TIMEOUT
+        assert time.monotonic() - start < 5
+    
+    def test_run_async_timeout_stops_sync_main_logic(self):
+        """Test a sync main logic on the executor stops with the run."""
+        stopped = threading.Event()
+        
+        class SyncLoopingApp(SkeletonApp):
+            def _execute_main_logic(self):
+                try:
+                    # Still sleeping when the run times out
+                    for _ in range(30):
+                        self.check_cancelled()
+                        time.sleep(0.1)
+                finally:
+                    stopped.set()
+        
+        in_progress = RUNS_IN_PROGRESS.value
+        
+        async def main():
+            exit_code = await SyncLoopingApp().run_async(timeout=0.05)
+            # The thread has returned before run_async() did
+            return exit_code, stopped.is_set(), RUNS_IN_PROGRESS.value
+        
+        assert asyncio.run(main()) == (EXIT_TIMEOUT, True, in_progress)
+
+
+class TestConfigReload:
+    """Test cases for hot reloading the configuration."""
+    
+    def test_reload_when_idle(self, tmp_path, write_config):
+        """Test a change is applied right away between runs."""
+        path = tmp_path / "config.json"
+        write_config(path, {"app_name": "Before"})
+        app = SkeletonApp(LayeredConfig.from_layers(file={"app_name": "Before"}))
+        watcher = app.watch_config(path, interval=60, cache_dir=tmp_path / "c")
+        try:
+            write_config(path, {"app_name": "After"})
+            watcher.check()
+        finally:
+            watcher.stop()
+        
+        assert app.config["app_name"] == "After"
+        assert app.config.layer_names == ("file", "defaults")
+        status = app.get_status()["config_reload"]
+        assert status["reloads"] == 1
+        assert status["last_swap_seconds"] >= 0
+    
+    def test_reload_deferred_until_run_ends(self, tmp_path, write_config):
+        """Test a change during a run takes effect after the run."""
+        path = tmp_path / "config.json"
+        write_config(path, {"app_name": "Before"})
+        seen = []
+        
+        class ReloadingApp(SkeletonApp):
+            def _execute_main_logic(self):
+                write_config(path, {"app_name": "After"})
+                self.config_watcher.check()
+                seen.append(self.config["app_name"])
+        
+        app = ReloadingApp({"app_name": "Before"})
+        watcher = app.watch_config(path, interval=60, cache_dir=tmp_path / "c")
+        try:
+            assert app.run() == 0
+        finally:
+            watcher.stop()
+        
+        assert seen == ["Before"]
+        assert app.config["app_name"] == "After"
+
+
+class CountingApp(SkeletonApp):
+    """Subclass reporting progress for each unit of work."""
+    
+    def _execute_main_logic(self):
+        for done in range(1, 1001):
+            self.report_progress(done, 1000)
+        for done in range(1, 11):
+            self.report_progress(done)
+        return "counted"
+
+
+class TestProgressReporting:
+    """Test cases for progress reporting from runs."""
+    
+    def test_run_reports_progress(self):
+        """Test updates are coalesced and the last one is reported."""
+        reports = []
+        app = CountingApp()
+        app.set_progress_listener(reports.append, interval=60)
+        
+        assert app.run() == 0
+        
+        assert [(r.done, r.total) for r in reports] == [(1000, 1000), (10, None)]
+    
+    def test_listener_removed(self):
+        """Test reporting without a listener does nothing."""
+        reports = []
+        app = CountingApp()
+        app.set_progress_listener(reports.append)
+        app.set_progress_listener(None)
+        
+        assert app.run() == 0
+        assert reports == []
+    
+    def test_report_without_listener(self):
+        """Test report_progress() is a no-op by default."""
+        SkeletonApp().report_progress(1, 2)
+
+
+class TestRunAsync:
+    """Test cases for the asyncio run path."""
+    
+    def test_run_async_default_hook(self):
+        """Test run_async falls back to _execute_main_logic."""
+        app = SkeletonApp()
+        
+        with patch.object(SkeletonApp, '_execute_main_logic', return_value="ok") as mock_logic:
+            result = asyncio.run(app.run_async())
+        
+        assert result == 0
+        mock_logic.assert_called_once()
+    
+    def test_run_async_exception_normal_mode(self):
+        """Test run_async returns 1 on failure."""
+        app = SleepingApp({"fail": True})
+        
+        assert asyncio.run(app.run_async()) == 1
+    
+    def test_run_async_exception_debug_mode(self):
+        """Test run_async re-raises in debug mode."""
+        app = SleepingApp({"fail": True, "debug": True})
+        
+        with pytest.raises(ValueError, match="async job failed"):
+            asyncio.run(app.run_async())
+    
+    def test_gather_runs_order_and_limit(self):
+        """Test gather_runs keeps input order and bounds concurrency."""
+        SleepingApp.peak = 0
+        apps = [SleepingApp({"fail": i % 3 == 0}) for i in range(30)]
+        
+        exit_codes = asyncio.run(gather_runs(apps, limit=5))
+        
+        assert exit_codes == [1 if i % 3 == 0 else 0 for i in range(30)]
+        assert SleepingApp.peak == 5
+    
+    def test_gather_runs_invalid_limit(self):
+        """Test gather_runs rejects a non-positive limit."""
+        with pytest.raises(ValueError, match="Invalid concurrency limit"):
+            asyncio.run(gather_runs([], limit=0))
+
+
+class TestResultCaching:
+    """Test cases for result caching in SkeletonApp."""
+    
+    def test_run_uses_cached_result(self, tmp_path):
+        """Test identical configs reuse the cached result."""
+        cache = ResultCache(directory=tmp_path)
+        first = SkeletonApp({"value": 1}, result_cache=cache)
+        second = SkeletonApp({"value": 1}, result_cache=cache)
+        
+        with patch.object(SkeletonApp, '_execute_main_logic', return_value="computed"):
+            assert first._run_with_result() == (0, "computed")
+        with patch.object(SkeletonApp, '_execute_main_logic') as mock_logic:
+            assert second._run_with_result() == (0, "computed")
+        
+        mock_logic.assert_not_called()
+        status = second.get_status()
+        assert status["result_cache"]["hits"] == 1
+        assert status["result_cache"]["misses"] == 1
+    
+    def test_run_failure_not_cached(self, tmp_path):
+        """Test failed runs do not populate the cache."""
+        cache = ResultCache(directory=tmp_path)
+        app = SkeletonApp({"debug": False}, result_cache=cache)
+        
+        with patch.object(SkeletonApp, '_execute_main_logic', side_effect=Exception("Test error")):
+            assert app.run() == 1
+        with patch.object(SkeletonApp, '_execute_main_logic', return_value="ok") as mock_logic:
+            assert app.run() == 0
+        
+        mock_logic.assert_called_once()
+    
+    def test_same_class_name_in_other_module(self, tmp_path):
+        """Test classes sharing a name in different modules don't share results."""
+        cache = ResultCache(directory=tmp_path)
+        other = type("SkeletonApp", (SkeletonApp,), {"__module__": "other.app"})
+        
+        assert SkeletonApp({"value": 1}, result_cache=cache).run() == 0
+        assert other({"value": 1}, result_cache=cache).run() == 0
+        
+        assert cache.stats()["misses"] == 2
+    
+    def test_status_without_cache(self):
+        """Test status omits cache statistics when caching is off."""
+        assert "result_cache" not in SkeletonApp().get_status()
 
 
 @pytest.fixture
@@ -101,7 +591,7 @@ def test_app_lifecycle(sample_app):
     assert status["app_name"] == "Test Application"
     
     # Run application
-    with patch.object(sample_app, '_execute_main_logic', return_value="test result"):
+    with patch.object(SkeletonApp, '_execute_main_logic', return_value="test result"):
         result = sample_app.run()
     
     assert result == 0 
\ No newline at end of file
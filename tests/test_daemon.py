@@ -0,0 +1,272 @@
+"""
+Tests for the daemon and client modules.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import shutil
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from skeleton.client import run_remote
+from skeleton.core import SkeletonApp
+from skeleton.daemon import SkeletonDaemon
+from skeleton.pipeline import Pipeline
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available"
+)
+
+
+class PipelineApp(SkeletonApp):
+    """App logging at DEBUG level from a threaded pipeline stage."""
+    
+    def build_pipeline(self):
+        def stage(item):
+            logging.getLogger("skeleton.stage").debug("Stage saw %d", item)
+            return item
+        
+        return Pipeline(range(3)).map(stage, threaded=True)
+
+
+class WaitingApp(SkeletonApp):
+    """App running until cancelled, tracking concurrent runs."""
+    
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+    stopped = threading.Event()
+    
+    def _execute_main_logic(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            self.logger.info("Waiting")
+            while not self.cancel_token.wait(0.01):
+                pass
+            self.check_cancelled()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+            cls.stopped.set()
+
+
+@contextlib.contextmanager
+def start_daemon(**kwargs):
+    """Run a daemon listening on a temporary socket."""
+    # Unix socket paths are short; avoid pytest's long tmp_path
+    directory = Path(tempfile.mkdtemp(prefix="skd-"))
+    daemon = SkeletonDaemon(directory / "d.sock", env={}, **kwargs)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    
+    root = logging.getLogger()
+    old_level = root.level
+    root.setLevel(logging.INFO)
+    thread.start()
+    assert daemon.wait_until_ready(5)
+    try:
+        yield daemon
+    finally:
+        daemon.shutdown()
+        thread.join(5)
+        root.setLevel(old_level)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running_daemon():
+    """Fixture providing a daemon listening on a temporary socket."""
+    with start_daemon() as daemon:
+        yield daemon
+
+
+def submit(daemon, argv):
+    """Send a job without waiting for it; return the connected socket."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(str(daemon.socket_path))
+    sock.sendall(json.dumps({"argv": argv}).encode("utf-8") + b"\n")
+    return sock
+
+
+class TestDaemon:
+    """Test cases for SkeletonDaemon and run_remote."""
+    
+    def test_run_job_streams_logs(self, running_daemon):
+        """Test a job runs remotely and its log lines are streamed back."""
+        out = io.StringIO()
+        
+        exit_code = run_remote(running_daemon.socket_path, [], stdout=out)
+        
+        assert exit_code == 0
+        lines = out.getvalue()
+        assert "Starting Skeleton Project v0.1.0" in lines
+        assert "Application completed successfully" in lines
+    
+    def test_job_log_level(self, running_daemon):
+        """Test the job's --log-level filters streamed lines."""
+        out = io.StringIO()
+        
+        exit_code = run_remote(
+            running_daemon.socket_path, ["--log-level", "ERROR"], stdout=out
+        )
+        
+        assert exit_code == 0
+        assert out.getvalue() == ""
+    
+    def test_debug_lines_from_pipeline_threads(self, running_daemon, monkeypatch):
+        """Test DEBUG records of the job's own threads reach the client."""
+        monkeypatch.setattr("skeleton.daemon.SkeletonApp", PipelineApp)
+        out = io.StringIO()
+        
+        exit_code = run_remote(
+            running_daemon.socket_path, ["--log-level", "DEBUG"], stdout=out
+        )
+        
+        assert exit_code == 0
+        assert out.getvalue().count("Stage saw") == 3
+        assert logging.getLogger().level == logging.INFO
+    
+    def test_rejects_unsupported_options(self, running_daemon):
+        """Test options the daemon cannot apply per job are refused."""
+        err = io.StringIO()
+        
+        exit_code = run_remote(
+            running_daemon.socket_path,
+            ["--log-file", "job.log", "--log-async"],
+            stderr=err,
+        )
+        
+        assert exit_code == 2
+        assert "--log-file, --log-async are not supported" in err.getvalue()
+    
+    def test_invalid_arguments(self, running_daemon):
+        """Test argument errors are reported without stopping the daemon."""
+        err = io.StringIO()
+        
+        exit_code = run_remote(
+            running_daemon.socket_path, ["--log-level", "NOPE"], stderr=err
+        )
+        
+        assert exit_code == 2
+        assert "invalid choice" in err.getvalue()
+        assert run_remote(running_daemon.socket_path, [], stdout=io.StringIO()) == 0
+    
+    def test_version_is_output(self, running_daemon):
+        """Test --version is printed to stdout with exit code 0."""
+        out = io.StringIO()
+        
+        exit_code = run_remote(running_daemon.socket_path, ["--version"], stdout=out)
+        
+        assert exit_code == 0
+        assert "0.1.0" in out.getvalue()
+    
+    @pytest.mark.parametrize("argv", [
+        ["serve"],
+        ["--connect"],
+        ["--daemon-socket", "/tmp/s.sock"],
+    ])
+    def test_rejects_subcommands(self, running_daemon, argv):
+        """Test jobs cannot start another daemon or connect to one."""
+        err = io.StringIO()
+        
+        exit_code = run_remote(running_daemon.socket_path, argv, stderr=err)
+        
+        assert exit_code == 2
+        assert "cannot be sent to the daemon" in err.getvalue()
+    
+    def test_disconnect_cancels_job(self, running_daemon, monkeypatch):
+        """Test a job stops when its client goes away."""
+        monkeypatch.setattr("skeleton.daemon.SkeletonApp", WaitingApp)
+        WaitingApp.stopped.clear()
+        
+        with submit(running_daemon, []) as sock:
+            # Wait until the job runs
+            for line in sock.makefile("rb"):
+                if b"Waiting" in line:
+                    break
+        
+        assert WaitingApp.stopped.wait(5)
+    
+    def test_config_file_reloaded(self, tmp_path):
+        """Test jobs pick up changes to the daemon's config file."""
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({"app_name": "Before"}))
+        
+        with start_daemon(config_file=path, config_interval=60) as daemon:
+            before = io.StringIO()
+            run_remote(daemon.socket_path, [], stdout=before)
+            path.write_text(json.dumps({"app_name": "After"}))
+            assert daemon.config_watcher.check()
+            after = io.StringIO()
+            run_remote(daemon.socket_path, [], stdout=after)
+        
+        assert "Starting Before" in before.getvalue()
+        assert "Starting After" in after.getvalue()
+    
+    def test_relative_config_file(self, running_daemon, tmp_path):
+        """Test a job's config file is resolved in the client's directory."""
+        (tmp_path / "job.json").write_text(json.dumps({"app_name": "Job"}))
+        messages = []
+        
+        exit_code = running_daemon.run_job(
+            ["--config-file", "job.json"], messages.append, cwd=str(tmp_path)
+        )
+        
+        assert exit_code == 0
+        assert any(
+            "Starting Job" in message.get("line", "") for message in messages
+        )
+    
+    def test_missing_config_file(self, running_daemon, tmp_path, monkeypatch):
+        """Test a job naming a missing config file is refused."""
+        monkeypatch.chdir(tmp_path)
+        err = io.StringIO()
+        
+        exit_code = run_remote(
+            running_daemon.socket_path, ["--config-file", "nope.json"], stderr=err
+        )
+        
+        assert exit_code == 2
+        assert f"Config file not found: {tmp_path / 'nope.json'}" in err.getvalue()
+    
+    def test_max_jobs(self, monkeypatch):
+        """Test jobs beyond max_jobs wait for a slot."""
+        monkeypatch.setattr("skeleton.daemon.SkeletonApp", WaitingApp)
+        WaitingApp.peak = 0
+        
+        with start_daemon(max_jobs=1) as daemon:
+            socks = [submit(daemon, ["--timeout", "0.2"]) for _ in range(3)]
+            try:
+                codes = [
+                    json.loads(sock.makefile("rb").readlines()[-1])["code"]
+                    for sock in socks
+                ]
+            finally:
+                for sock in socks:
+                    sock.close()
+        
+        assert codes == [124, 124, 124]
+        assert WaitingApp.peak == 1
+    
+    def test_second_daemon_refused(self, running_daemon):
+        """Test a second daemon cannot take over a live socket."""
+        with pytest.raises(RuntimeError, match="already listening"):
+            SkeletonDaemon(running_daemon.socket_path, env={}).serve_forever()
+
+
+def test_run_remote_without_daemon(tmp_path):
+    """Test the client reports an unreachable daemon."""
+    err = io.StringIO()
+    
+    exit_code = run_remote(tmp_path / "missing.sock", [], stderr=err)
+    
+    assert exit_code == 1
+    assert "cannot connect to daemon" in err.getvalue()
@@ -0,0 +1,197 @@
+"""
+Tests for the flight_recorder module.
+"""
+
+import logging
+import os
+
+import pytest
+
+from skeleton.flight_recorder import (
+    FlightRecorder,
+    dump_flight_recorders,
+    find_flight_buffers,
+    find_flight_dumps,
+    read_flight_records,
+)
+
+
+def log(recorder, message, levelno=logging.DEBUG, name="skeleton.test"):
+    recorder.handle(logging.LogRecord(name, levelno, __file__, 1, message, None, None))
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    recorder = FlightRecorder(tmp_path / "flight-recorder.bin", capacity=4)
+    yield recorder
+    recorder.close()
+
+
+class TestFlightRecorder:
+    """Test cases for FlightRecorder class."""
+    
+    def test_records_in_order(self, recorder):
+        """Test records are decoded in the order they were logged."""
+        log(recorder, "first")
+        log(recorder, "second", logging.WARNING, "skeleton.other")
+        
+        records = read_flight_records(recorder.path)
+        
+        assert [(r.levelno, r.name, r.message) for r in records] == [
+            (logging.DEBUG, "skeleton.test", "first"),
+            (logging.WARNING, "skeleton.other", "second"),
+        ]
+    
+    def test_ring_keeps_last_records(self, recorder):
+        """Test only the last ``capacity`` records are kept."""
+        for i in range(10):
+            log(recorder, f"record {i}")
+        
+        records = read_flight_records(recorder.path)
+        
+        assert [r.message for r in records] == [f"record {i}" for i in range(6, 10)]
+        assert [r.seq for r in records] == [7, 8, 9, 10]
+    
+    def test_long_message_truncated(self, tmp_path):
+        """Test messages longer than a slot are cut to fit."""
+        recorder = FlightRecorder(tmp_path / "ring.bin", capacity=2, slot_size=64)
+        try:
+            log(recorder, "x" * 1000, name="n")
+        finally:
+            recorder.close()
+        
+        (record,) = read_flight_records(tmp_path / "ring.bin")
+        
+        assert record.message == "x" * (64 - 22 - 1)
+    
+    def test_long_name_fits_small_slot(self, tmp_path):
+        """Test a long logger name is cut so the record stays in its slot."""
+        recorder = FlightRecorder(tmp_path / "ring.bin", capacity=2, slot_size=54)
+        try:
+            log(recorder, "first", name="n" * 200)
+            log(recorder, "second", name="short")
+        finally:
+            recorder.close()
+        
+        records = read_flight_records(tmp_path / "ring.bin")
+        
+        assert [(r.name, r.message) for r in records] == [
+            ("n" * 16, "first"), ("short", "second"),
+        ]
+    
+    def test_reopen_keeps_records(self, tmp_path):
+        """Test a new recorder on the same file continues the ring."""
+        path = tmp_path / "ring.bin"
+        first = FlightRecorder(path, capacity=4)
+        log(first, "before")
+        first.close()
+        
+        second = FlightRecorder(path, capacity=4)
+        log(second, "after")
+        second.close()
+        
+        assert [r.message for r in read_flight_records(path)] == ["before", "after"]
+    
+    def test_reopen_other_capacity_resets(self, tmp_path):
+        """Test a file with a different layout starts empty."""
+        path = tmp_path / "ring.bin"
+        first = FlightRecorder(path, capacity=4)
+        log(first, "before")
+        first.close()
+        
+        second = FlightRecorder(path, capacity=8)
+        second.close()
+        
+        assert read_flight_records(path) == []
+    
+    @pytest.mark.skipif(os.name != "posix", reason="uses flock")
+    def test_file_in_use(self, recorder, tmp_path):
+        """Test a second recorder on a locked file uses its own file."""
+        other = FlightRecorder(tmp_path / "flight-recorder.bin", capacity=4)
+        try:
+            assert other.path != recorder.path
+            assert str(os.getpid()) in other.path.name
+            assert find_flight_buffers(tmp_path) == [recorder.path, other.path]
+        finally:
+            other.close()
+        
+        assert not other.path.exists()
+        assert recorder.path.exists()
+    
+    @pytest.mark.skipif(os.name != "posix", reason="uses flock")
+    def test_stale_process_files_pruned(self, recorder, tmp_path):
+        """Test only the newest files of dead processes are kept."""
+        stale = []
+        for age, pid in enumerate([11, 12, 13]):
+            path = tmp_path / f"flight-recorder.{pid}.bin"
+            path.write_bytes(b"")
+            os.utime(path, (0, 1000 - age))
+            stale.append(path)
+        
+        other = FlightRecorder(tmp_path / "flight-recorder.bin", max_dumps=1)
+        other.close()
+        
+        assert [path.exists() for path in stale] == [True, False, False]
+    
+    def test_dump(self, recorder):
+        """Test dump() snapshots the ring with the error traceback."""
+        log(recorder, "context")
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError as e:
+            path = recorder.dump(e)
+        log(recorder, "later")
+        
+        records = read_flight_records(path)
+        
+        assert find_flight_dumps(path.parent) == [path]
+        assert [r.message for r in records][0] == "context"
+        assert records[-1].levelno == logging.ERROR
+        assert records[-1].message.startswith("Traceback")
+        assert records[-1].message.endswith("RuntimeError: boom")
+    
+    def test_dump_prunes_old_dumps(self, tmp_path):
+        """Test only ``max_dumps`` dumps are kept."""
+        recorder = FlightRecorder(tmp_path / "flight-recorder.bin", max_dumps=2)
+        try:
+            paths = [recorder.dump() for _ in range(4)]
+        finally:
+            recorder.close()
+        
+        assert find_flight_dumps(tmp_path) == paths[2:]
+    
+    def test_dump_flight_recorders(self, recorder):
+        """Test open recorders are dumped and closed ones are not."""
+        log(recorder, "context")
+        
+        paths = dump_flight_recorders()
+        recorder.close()
+        
+        assert len(paths) == 1
+        assert dump_flight_recorders() == []
+    
+    def test_to_log_record(self, recorder):
+        """Test decoded records format like live ones."""
+        log(recorder, "hello", logging.INFO)
+        (record,) = read_flight_records(recorder.path)
+        
+        formatted = logging.Formatter("%(levelname)s %(name)s %(message)s").format(
+            record.to_log_record()
+        )
+        
+        assert formatted == "INFO skeleton.test hello"
+    
+    def test_read_invalid_file(self, tmp_path):
+        """Test decoding a file that is not a ring buffer fails."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"not a flight recorder")
+        
+        with pytest.raises(ValueError, match="Not a flight recorder file"):
+            read_flight_records(path)
+    
+    def test_invalid_arguments(self, tmp_path):
+        """Test invalid sizes are rejected."""
+        with pytest.raises(ValueError, match="capacity"):
+            FlightRecorder(tmp_path / "ring.bin", capacity=0)
+        with pytest.raises(ValueError, match="slot size"):
+            FlightRecorder(tmp_path / "ring.bin", slot_size=16)
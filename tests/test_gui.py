@@ -0,0 +1,410 @@
+"""
+Tests for the gui module.
+
+The wxPython frame needs a display, so these tests cover the parts of
+the module that work without wxPython.
+"""
+
+import threading
+import time
+
+import pytest
+
+from skeleton.cancellation import CancellationToken, RunCancelled
+from skeleton.core import SkeletonApp
+from skeleton.gui import (
+    JOB_CANCELLED,
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    DashboardSample,
+    DashboardSampler,
+    LineStore,
+    OutputBuffer,
+    RunExecutor,
+    RunJob,
+    format_dashboard_sample,
+    plot_points,
+    read_process_usage,
+)
+from skeleton.metrics import Counter, Histogram
+
+
+class BlockingApp(SkeletonApp):
+    """App whose runs wait until released or cancelled."""
+    
+    release = threading.Event()
+    
+    def _execute_main_logic(self):
+        while not self.release.is_set():
+            self.check_cancelled()
+            self.cancel_token.wait(0.01)
+        return "done"
+
+
+class ProgressApp(SkeletonApp):
+    """App reporting progress through a fixed amount of work."""
+    
+    def _execute_main_logic(self):
+        for done in range(1, 101):
+            self.report_progress(done, 100)
+
+
+class FailingApp(SkeletonApp):
+    """App whose runs raise."""
+    
+    def run(self, token=None, timeout=None):
+        raise RuntimeError("broken")
+
+
+class TestOutputBuffer:
+    """Test cases for OutputBuffer class."""
+    
+    def test_drain_returns_lines_in_order(self):
+        """Test queued lines come out in order, once."""
+        buffer = OutputBuffer()
+        buffer.append("first")
+        buffer.append("second\nthird")
+        
+        assert buffer.drain() == (["first", "second", "third"], 0)
+        assert buffer.drain() == ([], 0)
+    
+    def test_oldest_lines_dropped(self):
+        """Test a full buffer drops its oldest lines and counts them."""
+        buffer = OutputBuffer(max_lines=3)
+        for i in range(5):
+            buffer.append(str(i))
+        
+        assert buffer.drain() == (["2", "3", "4"], 2)
+        buffer.append("5")
+        assert buffer.drain() == (["5"], 0)
+    
+    def test_concurrent_appends(self):
+        """Test appends from several threads are all kept."""
+        buffer = OutputBuffer(max_lines=10000)
+        
+        def worker(n):
+            for i in range(1000):
+                buffer.append(f"{n}:{i}")
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        lines, dropped = buffer.drain()
+        assert len(lines) == 4000
+        assert dropped == 0
+        assert [line for line in lines if line.startswith("0:")] == [
+            f"0:{i}" for i in range(1000)
+        ]
+    
+    def test_invalid_size(self):
+        """Test a buffer must hold at least one line."""
+        with pytest.raises(ValueError, match="Invalid output buffer size"):
+            OutputBuffer(max_lines=0)
+
+
+class TestLineStore:
+    """Test cases for LineStore class."""
+    
+    def test_get_lines(self):
+        """Test lines are found by absolute number."""
+        store = LineStore()
+        store.extend(["first", "zweite Zeile \u00e4", ""])
+        
+        assert len(store) == 3
+        assert (store.first, store.end) == (0, 3)
+        assert [store.get(i) for i in range(4)] == [
+            "first", "zweite Zeile \u00e4", "", None,
+        ]
+    
+    def test_newlines_replaced(self):
+        """Test a line never turns into several."""
+        store = LineStore()
+        store.extend(["a\nb"])
+        
+        assert len(store) == 1
+        assert store.get(0) == "a b"
+    
+    def test_oldest_lines_dropped(self):
+        """Test the store keeps max_lines and numbers stay stable."""
+        store = LineStore(max_lines=3)
+        for i in range(10):
+            store.extend([f"line {i}"])
+        
+        assert len(store) == 3
+        assert store.first == 7
+        assert store.get(6) is None
+        assert [store.get(i) for i in range(7, 10)] == [
+            "line 7", "line 8", "line 9",
+        ]
+    
+    def test_search(self):
+        """Test search finds lines case-insensitively by absolute number."""
+        store = LineStore()
+        store.extend(["Error: one", "ok", "another ERROR", "fine"])
+        
+        assert list(store.search("error")) == [0, 2]
+        assert list(store.search("error", start=1)) == [2]
+        assert list(store.search("error", stop=2)) == [0]
+        assert list(store.search("missing")) == []
+    
+    def test_search_across_chunks_and_drops(self):
+        """Test search covers many chunks of a store that dropped lines."""
+        store = LineStore(max_lines=25000)
+        store.extend(f"line {i}" for i in range(30000))
+        
+        matches = store.search("9999")
+        
+        assert list(matches) == [9999, 19999, 29999]
+        assert store.first == 5000
+    
+    def test_search_cancelled(self):
+        """Test a cancelled token stops the search."""
+        store = LineStore()
+        store.extend(["a"])
+        token = CancellationToken()
+        token.cancel()
+        
+        with pytest.raises(RunCancelled):
+            store.search("a", token=token)
+    
+    def test_invalid_size(self):
+        """Test a store must hold at least one line."""
+        with pytest.raises(ValueError, match="Invalid line store size"):
+            LineStore(max_lines=0)
+
+
+class TestRunExecutor:
+    """Test cases for RunExecutor class."""
+    
+    def setup_method(self):
+        BlockingApp.release.clear()
+        self.changes = []
+        self.lock = threading.Lock()
+    
+    def record(self, job):
+        with self.lock:
+            self.changes.append((job.job_id, job.state))
+    
+    def wait_for(self, job_id, state):
+        for _ in range(500):
+            with self.lock:
+                if (job_id, state) in self.changes:
+                    return
+            time.sleep(0.01)
+        raise AssertionError(f"job {job_id} never reached {state}")
+    
+    def test_runs_job(self):
+        """Test a submitted job runs and reports each state."""
+        executor = RunExecutor(SkeletonApp, on_change=self.record)
+        try:
+            job = executor.submit()
+            self.wait_for(job.job_id, JOB_DONE)
+        finally:
+            executor.shutdown()
+        
+        assert [state for _, state in self.changes] == [
+            JOB_QUEUED, JOB_RUNNING, JOB_DONE,
+        ]
+        assert job.exit_code == 0
+        assert executor.jobs() == []
+    
+    def test_progress_per_job(self):
+        """Test progress reports are attributed to the job of the run."""
+        reports = []
+        executor = RunExecutor(
+            ProgressApp,
+            max_workers=1,
+            on_change=self.record,
+            on_progress=lambda job: reports.append((job.job_id, job.progress)),
+        )
+        try:
+            jobs = [executor.submit() for _ in range(2)]
+            self.wait_for(jobs[1].job_id, JOB_DONE)
+        finally:
+            executor.shutdown()
+        
+        assert {job_id for job_id, _ in reports} == {1, 2}
+        for job in jobs:
+            assert job.progress.done == 100
+            assert job.progress.total == 100
+    
+    def test_bounded_workers_queue_jobs(self):
+        """Test jobs beyond max_workers wait and can be cancelled queued."""
+        executor = RunExecutor(BlockingApp, max_workers=1, on_change=self.record)
+        try:
+            first = executor.submit()
+            second = executor.submit()
+            self.wait_for(first.job_id, JOB_RUNNING)
+            
+            assert [job.state for job in executor.jobs()] == [JOB_RUNNING, JOB_QUEUED]
+            assert executor.cancel(second.job_id) is True
+            assert second.state == JOB_CANCELLED
+            assert (second.job_id, JOB_RUNNING) not in self.changes
+            
+            BlockingApp.release.set()
+            self.wait_for(first.job_id, JOB_DONE)
+        finally:
+            executor.shutdown()
+    
+    def test_cancel_running_job(self):
+        """Test a running job stops through its token."""
+        executor = RunExecutor(BlockingApp, on_change=self.record)
+        try:
+            job = executor.submit()
+            self.wait_for(job.job_id, JOB_RUNNING)
+            executor.cancel(job.job_id)
+            self.wait_for(job.job_id, JOB_CANCELLED)
+        finally:
+            executor.shutdown()
+        
+        assert executor.cancel(job.job_id) is False
+    
+    def test_workers_do_not_share_apps(self):
+        """Test concurrent runs use separate application instances."""
+        apps = []
+        
+        def factory():
+            app = BlockingApp()
+            apps.append(app)
+            return app
+        
+        executor = RunExecutor(factory, max_workers=2, on_change=self.record)
+        try:
+            jobs = [executor.submit() for _ in range(2)]
+            for job in jobs:
+                self.wait_for(job.job_id, JOB_RUNNING)
+            BlockingApp.release.set()
+            for job in jobs:
+                self.wait_for(job.job_id, JOB_DONE)
+        finally:
+            executor.shutdown()
+        
+        assert len(apps) == 2
+        assert apps[0] is not apps[1]
+    
+    def test_discard_apps(self):
+        """Test runs after discard_apps() get an app with the new config."""
+        configs = [{"name": "before"}]
+        created = []
+        
+        def factory():
+            created.append(configs[-1]["name"])
+            return SkeletonApp(configs[-1])
+        
+        executor = RunExecutor(factory, max_workers=1, on_change=self.record)
+        try:
+            for name in ("before", "after", "after"):
+                if name != configs[-1]["name"]:
+                    configs.append({"name": name})
+                    executor.discard_apps()
+                job = executor.submit()
+                self.wait_for(job.job_id, JOB_DONE)
+        finally:
+            executor.shutdown()
+        
+        assert created == ["before", "after"]
+    
+    def test_failing_job(self):
+        """Test an exception in a run marks the job failed."""
+        executor = RunExecutor(FailingApp, on_change=self.record)
+        try:
+            job = executor.submit()
+            self.wait_for(job.job_id, JOB_FAILED)
+        finally:
+            executor.shutdown()
+        
+        assert job.error == "broken"
+    
+    def test_invalid_workers(self):
+        """Test at least one worker is required."""
+        with pytest.raises(ValueError, match="Invalid number of workers"):
+            RunExecutor(max_workers=0)
+
+
+class TestDashboardSampler:
+    """Test cases for DashboardSampler class."""
+    
+    def make_job(self, state):
+        job = RunJob(1)
+        job.state = state
+        return job
+    
+    def test_sample_covers_interval(self, clock):
+        """Test rates and percentiles cover only the last interval."""
+        runs = Counter("runs_total")
+        latency = Histogram("run_seconds", buckets=(0.1, 1.0))
+        runs.inc(100)
+        for _ in range(100):
+            latency.observe(0.05)
+        jobs = [self.make_job(JOB_RUNNING), self.make_job(JOB_QUEUED)]
+        sampler = DashboardSampler(lambda: jobs, runs=runs, latency=latency)
+        
+        clock.now += 2
+        runs.inc(10)
+        for _ in range(10):
+            latency.observe(0.5)
+        sample = sampler.sample()
+        
+        assert sample.runs_per_second == pytest.approx(5.0)
+        assert all(0.1 <= value <= 1.0 for value in sample.latencies)
+        assert (sample.running, sample.queued) == (1, 1)
+        assert list(sampler.samples) == [sample]
+    
+    def test_idle_interval(self, clock):
+        """Test an interval without runs has no latencies."""
+        sampler = DashboardSampler(
+            runs=Counter("runs_total"), latency=Histogram("run_seconds")
+        )
+        clock.now += 1
+        
+        sample = sampler.sample()
+        
+        assert sample.runs_per_second == 0
+        assert sample.latencies == (None, None, None)
+    
+    def test_ring_buffer(self, clock):
+        """Test only the last ``capacity`` samples are kept."""
+        sampler = DashboardSampler(capacity=3)
+        for _ in range(5):
+            clock.now += 1
+            sampler.sample()
+        
+        assert len(sampler.samples) == 3
+    
+    def test_invalid_capacity(self):
+        """Test at least one sample must be kept."""
+        with pytest.raises(ValueError, match="Invalid number of dashboard samples"):
+            DashboardSampler(capacity=0)
+
+
+class TestDashboardHelpers:
+    """Test cases for the dashboard helper functions."""
+    
+    def test_read_process_usage(self):
+        """Test CPU time and memory of this process are read."""
+        cpu, rss = read_process_usage()
+        
+        assert cpu > 0
+        assert rss is None or rss > 1024 * 1024
+    
+    def test_format_dashboard_sample(self):
+        """Test a sample is formatted as one line."""
+        sample = DashboardSample(2.0, (0.012, 0.0004, None), 35.2, 3 * 2**20, 2, 5)
+        
+        assert format_dashboard_sample(sample) == (
+            "2.0 runs/s  p50 12ms p90 400us p99 -  CPU 35%  RSS 3.0 MiB  "
+            "running 2, queued 5"
+        )
+    
+    def test_plot_points(self):
+        """Test values are scaled and right-aligned, split at gaps."""
+        values = [0.0, 5.0, None, 20.0]
+        
+        lines = plot_points(values, width=100, height=11, top=10.0, slots=5)
+        
+        assert lines == [[(25, 10), (50, 5)], [(100, 0)]]
@@ -0,0 +1,178 @@
+"""
+Tests for the log_limits module.
+"""
+
+import io
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from skeleton.log_limits import RateLimitFilter, gate_log_calls
+
+
+class TestRateLimitFilter:
+    """Test cases for RateLimitFilter class."""
+    
+    def test_sampling(self, make_record):
+        """Test only every Nth record of a call site passes."""
+        rate_filter = RateLimitFilter(sample_every=3)
+        
+        results = [rate_filter.filter(make_record("tick %d", (i,))) for i in range(7)]
+        
+        assert results == [True, False, False, True, False, False, True]
+        assert rate_filter.suppressed() == 0
+    
+    def test_summary_in_next_record(self, make_record):
+        """Test the next record that passes reports the suppressed ones."""
+        rate_filter = RateLimitFilter(sample_every=3)
+        records = [make_record("tick %d", (i,)) for i in range(4)]
+        
+        for record in records:
+            rate_filter.filter(record)
+        
+        assert records[0].getMessage() == "tick 0"
+        assert records[3].getMessage() == "tick 3 (2 similar messages suppressed)"
+        assert records[3].suppressed == 2
+    
+    def test_token_bucket(self, make_record):
+        """Test a burst passes, then records pass at the given rate."""
+        rate_filter = RateLimitFilter(rate=2, burst=2)
+        
+        with patch("time.monotonic", return_value=100.0):
+            burst = [rate_filter.filter(make_record()) for _ in range(4)]
+        with patch("time.monotonic", return_value=100.5):
+            refilled = [rate_filter.filter(make_record()) for _ in range(2)]
+        
+        assert burst == [True, True, False, False]
+        assert refilled == [True, False]
+        assert rate_filter.suppressed() == 1
+    
+    def test_call_sites_independent(self, make_record):
+        """Test each call site has its own limit."""
+        rate_filter = RateLimitFilter(sample_every=2)
+        
+        assert rate_filter.filter(make_record(lineno=1)) is True
+        assert rate_filter.filter(make_record(lineno=2)) is True
+        assert rate_filter.filter(make_record(lineno=1)) is False
+    
+    def test_warnings_not_limited(self, make_record):
+        """Test records above max_level always pass."""
+        rate_filter = RateLimitFilter(sample_every=100)
+        
+        assert all(
+            rate_filter.filter(make_record(levelno=logging.WARNING))
+            for _ in range(5)
+        )
+    
+    def test_same_record_decided_once(self, make_record):
+        """Test a record seen by several handlers counts once."""
+        rate_filter = RateLimitFilter(sample_every=2)
+        first, second = make_record(), make_record()
+        
+        assert rate_filter.filter(first) and rate_filter.filter(first)
+        assert not rate_filter.filter(second) and not rate_filter.filter(second)
+        assert rate_filter.suppressed() == 1
+    
+    def test_invalid_arguments(self):
+        """Test invalid limits are rejected."""
+        with pytest.raises(ValueError, match="Invalid log rate limit"):
+            RateLimitFilter(rate=0)
+        with pytest.raises(ValueError, match="Invalid log burst size"):
+            RateLimitFilter(rate=1, burst=0)
+        with pytest.raises(ValueError, match="Invalid log sampling interval"):
+            RateLimitFilter(sample_every=0)
+
+
+class TestGateLogCalls:
+    """Test cases for gate_log_calls function."""
+    
+    @pytest.fixture
+    def logger(self):
+        logger = logging.getLogger("skeleton.test.gate")
+        handler = logging.StreamHandler(io.StringIO())
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        yield logger
+        gate_log_calls(None)
+        logger.removeHandler(handler)
+        logger.propagate = True
+        logger.setLevel(logging.NOTSET)
+    
+    def gate(self, logger, **kwargs):
+        rate_filter = RateLimitFilter(**kwargs)
+        logger.handlers[0].addFilter(rate_filter)
+        gate_log_calls(rate_filter)
+        return logger.handlers[0].stream
+    
+    def test_suppressed_calls_build_no_record(self, logger):
+        """Test suppressed calls return before a record is made."""
+        stream = self.gate(logger, sample_every=3)
+        
+        with patch.object(
+            logging.Logger, "makeRecord", autospec=True,
+            side_effect=logging.Logger.makeRecord,
+        ) as mock_make:
+            for i in range(4):
+                logger.info("tick %d", i)
+        
+        assert mock_make.call_count == 2
+        assert stream.getvalue().splitlines() == [
+            "tick 0", "tick 3 (2 similar messages suppressed)",
+        ]
+    
+    def test_call_sites_independent(self, logger):
+        """Test calls are limited per line, also through exception()."""
+        stream = self.gate(logger, sample_every=2, max_level=logging.ERROR)
+        
+        for i in range(2):
+            logger.info("first %d", i)
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("second %d", i)
+        
+        assert [
+            line for line in stream.getvalue().splitlines()
+            if not line.startswith((" ", "Traceback", "ValueError"))
+        ] == ["first 0", "second 0"]
+    
+    def test_two_handlers(self, logger):
+        """Test every handler gets the same records and one summary."""
+        stream = self.gate(logger, sample_every=2)
+        second = logging.StreamHandler(io.StringIO())
+        second.setFormatter(logging.Formatter("%(message)s"))
+        second.addFilter(logger.handlers[0].filters[0])
+        logger.addHandler(second)
+        
+        try:
+            for i in range(4):
+                logger.info("tick %d", i)
+        finally:
+            logger.removeHandler(second)
+        
+        expected = ["tick 0", "tick 2 (1 similar messages suppressed)"]
+        assert stream.getvalue().splitlines() == expected
+        assert second.stream.getvalue().splitlines() == expected
+    
+    def test_warnings_not_limited(self, logger):
+        """Test calls above max_level are never gated."""
+        stream = self.gate(logger, sample_every=100)
+        
+        for _ in range(3):
+            logger.warning("careful")
+        
+        assert stream.getvalue().count("careful") == 3
+    
+    def test_removed(self, logger):
+        """Test passing None stops gating calls."""
+        stream = self.gate(logger, sample_every=100)
+        gate_log_calls(None)
+        logger.handlers[0].filters.clear()
+        
+        for i in range(3):
+            logger.info("tick %d", i)
+        
+        assert stream.getvalue().splitlines() == ["tick 0", "tick 1", "tick 2"]
@@ -0,0 +1,109 @@
+"""
+Tests for the log_rotation module.
+"""
+
+import gzip
+import os
+import time
+
+import pytest
+
+from skeleton.log_rotation import RotatingLogHandler
+
+
+class TestRotatingLogHandler:
+    """Test cases for RotatingLogHandler class."""
+    
+    def test_rotate_by_size(self, tmp_path, make_record):
+        """Test a new segment starts before the size limit is passed."""
+        log_file = tmp_path / "debug.log"
+        handler = RotatingLogHandler(log_file, max_bytes=100, backup_count=10)
+        try:
+            for i in range(10):
+                handler.emit(make_record(f"line {i:02d} " + "x" * 30))
+        finally:
+            handler.close()
+        
+        segments = handler.segments()
+        assert len(segments) == 4
+        assert all(path.stat().st_size <= 100 for path in segments)
+        text = "".join(path.read_text() for path in segments)
+        text += log_file.read_text()
+        assert [line[:7] for line in text.splitlines()] == [
+            f"line {i:02d}" for i in range(10)
+        ]
+    
+    def test_rotate_by_age(self, tmp_path, make_record):
+        """Test a new segment starts once the current one is too old."""
+        log_file = tmp_path / "debug.log"
+        handler = RotatingLogHandler(log_file, max_age=0.05)
+        try:
+            handler.emit(make_record("old"))
+            time.sleep(0.1)
+            handler.emit(make_record("new"))
+        finally:
+            handler.close()
+        
+        assert [path.read_text() for path in handler.segments()] == ["old\n"]
+        assert log_file.read_text() == "new\n"
+    
+    def test_rotate_existing_old_file(self, tmp_path, make_record):
+        """Test a file older than max_age is rotated by the next record."""
+        log_file = tmp_path / "debug.log"
+        log_file.write_text("old\n")
+        three_days_ago = time.time() - 3 * 24 * 3600
+        os.utime(log_file, (three_days_ago, three_days_ago))
+        handler = RotatingLogHandler(log_file, max_age=3600)
+        try:
+            handler.emit(make_record("new"))
+        finally:
+            handler.close()
+        
+        assert [path.read_text() for path in handler.segments()] == ["old\n"]
+        assert log_file.read_text() == "new\n"
+    
+    def test_gzip_and_retention(self, tmp_path, make_record):
+        """Test rotated segments are compressed and capped in number."""
+        log_file = tmp_path / "debug.log"
+        handler = RotatingLogHandler(
+            log_file, max_bytes=10, backup_count=2, compression="gzip"
+        )
+        try:
+            for i in range(6):
+                handler.emit(make_record(f"entry {i}"))
+        finally:
+            handler.close()
+        
+        segments = handler.segments()
+        assert len(segments) == 2
+        assert all(path.suffix == ".gz" for path in segments)
+        assert [gzip.decompress(path.read_bytes()) for path in segments] == [
+            b"entry 3\n", b"entry 4\n",
+        ]
+        assert log_file.read_text() == "entry 5\n"
+    
+    def test_unrelated_files_kept(self, tmp_path, make_record):
+        """Test retention only touches rotated segments."""
+        log_file = tmp_path / "debug.log"
+        other = tmp_path / "debug.log.bak"
+        other.write_text("keep")
+        handler = RotatingLogHandler(log_file, max_bytes=5, backup_count=0)
+        try:
+            handler.emit(make_record("first"))
+            handler.emit(make_record("second"))
+        finally:
+            handler.close()
+        
+        assert handler.segments() == []
+        assert other.read_text() == "keep"
+    
+    def test_invalid_arguments(self, tmp_path):
+        """Test invalid limits and compression are rejected."""
+        log_file = tmp_path / "debug.log"
+        
+        with pytest.raises(ValueError, match="Invalid maximum log size"):
+            RotatingLogHandler(log_file, max_bytes=-1)
+        with pytest.raises(ValueError, match="Invalid maximum log age"):
+            RotatingLogHandler(log_file, max_age=0)
+        with pytest.raises(ValueError, match="Invalid log compression"):
+            RotatingLogHandler(log_file, compression="bz2")
@@ -0,0 +1,139 @@
+"""
+Tests for the metrics module.
+"""
+
+import pytest
+
+from skeleton.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    PrometheusFileExporter,
+    estimate_percentile,
+)
+
+
+class TestMetricTypes:
+    """Test cases for counters, gauges and histograms."""
+    
+    def test_counter(self):
+        """Test counter increments."""
+        counter = Counter("jobs_total")
+        counter.inc()
+        counter.inc(2)
+        
+        assert counter.value == 3
+    
+    def test_gauge(self):
+        """Test gauge updates."""
+        gauge = Gauge("queue_depth")
+        gauge.inc(5)
+        gauge.dec(2)
+        assert gauge.value == 3
+        
+        gauge.set(10)
+        assert gauge.value == 10
+    
+    def test_histogram_buckets(self):
+        """Test observations land in cumulative buckets."""
+        histogram = Histogram("latency_seconds", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        
+        snapshot = histogram.snapshot()
+        
+        assert snapshot["count"] == 4
+        assert snapshot["sum"] == pytest.approx(2.65)
+        assert snapshot["buckets"] == {"0.1": 2, "1": 3, "+Inf": 4}
+    
+    def test_histogram_percentile(self):
+        """Test percentile estimation from buckets."""
+        histogram = Histogram("latency_seconds", buckets=(1.0, 2.0))
+        assert histogram.percentile(50) is None
+        
+        for _ in range(10):
+            histogram.observe(1.5)
+        
+        assert 1.0 <= histogram.percentile(50) <= 2.0
+        assert histogram.percentile(100) == pytest.approx(2.0)
+    
+    def test_histogram_bucket_counts_window(self):
+        """Test percentiles of the observations between two readings."""
+        histogram = Histogram("latency_seconds", buckets=(1.0, 2.0))
+        for _ in range(10):
+            histogram.observe(0.5)
+        before = histogram.bucket_counts()
+        for _ in range(10):
+            histogram.observe(1.5)
+        
+        window = [new - old for new, old in zip(histogram.bucket_counts(), before)]
+        
+        assert before == [10, 0, 0]
+        assert window == [0, 10, 0]
+        assert 1.0 <= estimate_percentile(histogram.buckets, window, 50) <= 2.0
+        assert estimate_percentile(histogram.buckets, [0, 0, 0], 50) is None
+    
+    def test_histogram_time(self):
+        """Test timing a block records one observation."""
+        histogram = Histogram("block_seconds")
+        
+        with histogram.time():
+            pass
+        
+        assert histogram.count == 1
+    
+    def test_histogram_unsorted_buckets(self):
+        """Test unsorted buckets are rejected."""
+        with pytest.raises(ValueError, match="must be sorted"):
+            Histogram("bad", buckets=(1.0, 0.5))
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry class."""
+    
+    def test_get_or_create(self):
+        """Test metrics are registered once by name."""
+        registry = MetricsRegistry()
+        
+        assert registry.counter("a") is registry.counter("a")
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("a")
+    
+    def test_snapshot(self):
+        """Test snapshot contains every metric."""
+        registry = MetricsRegistry()
+        registry.counter("runs").inc()
+        registry.gauge("depth").set(4)
+        
+        snapshot = registry.snapshot()
+        
+        assert snapshot["runs"] == 1
+        assert snapshot["depth"] == 4
+    
+    def test_render_prometheus(self):
+        """Test the Prometheus text format."""
+        registry = MetricsRegistry()
+        registry.counter("runs_total", "Runs").inc(3)
+        registry.histogram("run_seconds", buckets=(0.5,)).observe(0.25)
+        
+        text = registry.render_prometheus()
+        
+        assert "# HELP runs_total Runs\n" in text
+        assert "# TYPE runs_total counter\nruns_total 3\n" in text
+        assert "# TYPE run_seconds histogram\n" in text
+        assert 'run_seconds_bucket{le="0.5"} 1\n' in text
+        assert 'run_seconds_bucket{le="+Inf"} 1\n' in text
+        assert "run_seconds_count 1\n" in text
+
+
+def test_exporter_writes_file(tmp_path):
+    """Test the exporter writes the registry on stop."""
+    registry = MetricsRegistry()
+    registry.counter("runs_total").inc()
+    path = tmp_path / "metrics.prom"
+    
+    exporter = PrometheusFileExporter(registry, path=path, interval=60).start()
+    exporter.stop()
+    
+    assert path.read_text() == registry.render_prometheus()
@@ -0,0 +1,130 @@
+"""
+Tests for the pipeline module.
+"""
+
+import threading
+import time
+
+import pytest
+
+from skeleton.cancellation import CancellationToken, RunCancelled
+from skeleton.core import SkeletonApp
+from skeleton.pipeline import Pipeline
+
+
+class TestPipeline:
+    """Test cases for Pipeline class."""
+    
+    def test_map_filter_sink(self):
+        """Test chaining map, filter and sink stages."""
+        result = (
+            Pipeline(range(10))
+            .map(lambda x: x * 3)
+            .filter(lambda x: x % 2 == 0)
+            .sink(list)
+            .run()
+        )
+        
+        assert result == [0, 6, 12, 18, 24]
+    
+    def test_run_without_sink_counts_items(self):
+        """Test run returns the item count without a sink."""
+        assert Pipeline(range(7)).map(str).run() == 7
+    
+    def test_batch(self):
+        """Test grouping items into chunks."""
+        result = Pipeline(range(7)).batch(3).sink(list).run()
+        
+        assert result == [[0, 1, 2], [3, 4, 5], [6]]
+    
+    def test_source_is_consumed_lazily(self):
+        """Test that the source is never materialized."""
+        def endless():
+            n = 0
+            while True:
+                yield n
+                n += 1
+        
+        first = next(iter(Pipeline(endless()).map(lambda x: x + 1)))
+        
+        assert first == 1
+    
+    def test_threaded_stage(self):
+        """Test a stage running on its own thread."""
+        main_thread = threading.get_ident()
+        
+        result = (
+            Pipeline(range(100))
+            .map(lambda x: (x, threading.get_ident()), threaded=True)
+            .sink(list)
+            .run()
+        )
+        
+        assert [x for x, _ in result] == list(range(100))
+        assert all(ident != main_thread for _, ident in result)
+    
+    def test_threaded_stage_backpressure(self):
+        """Test a threaded stage cannot run far ahead of its consumer."""
+        produced = []
+        
+        def source():
+            for n in range(1000):
+                produced.append(n)
+                yield n
+        
+        items = iter(Pipeline(source(), queue_size=4).map(lambda x: x, threaded=True))
+        next(items)
+        time.sleep(0.2)
+        
+        # Queue capacity plus the items held by producer and consumer
+        assert len(produced) <= 4 + 2
+    
+    def test_threaded_stage_error_propagates(self):
+        """Test exceptions in a threaded stage reach the consumer."""
+        def explode(x):
+            if x == 5:
+                raise ValueError("bad item")
+            return x
+        
+        pipeline = Pipeline(range(10)).map(explode, threaded=True)
+        
+        with pytest.raises(ValueError, match="bad item"):
+            pipeline.run()
+    
+    def test_run_cancelled(self):
+        """Test a cancelled token stops the source."""
+        token = CancellationToken()
+        seen = []
+        
+        def consume(items):
+            for item in items:
+                seen.append(item)
+                if item == 3:
+                    token.cancel()
+        
+        with pytest.raises(RunCancelled):
+            Pipeline(range(100)).sink(consume).run(token=token)
+        
+        assert seen == [0, 1, 2, 3]
+    
+    def test_invalid_sizes(self):
+        """Test invalid queue and batch sizes."""
+        with pytest.raises(ValueError, match="Invalid queue size"):
+            Pipeline([], queue_size=0)
+        with pytest.raises(ValueError, match="Invalid batch size"):
+            Pipeline([]).batch(0)
+
+
+class PipelineApp(SkeletonApp):
+    """Subclass implementing its logic as a pipeline."""
+    
+    def build_pipeline(self):
+        return Pipeline(range(5)).map(lambda x: x * x).sink(sum)
+
+
+def test_app_runs_pipeline():
+    """Test SkeletonApp runs the pipeline from build_pipeline."""
+    app = PipelineApp()
+    
+    assert app._execute_main_logic() == 30
+    assert app.run() == 0
@@ -0,0 +1,63 @@
+"""
+Tests for the profiling module.
+"""
+
+import pstats
+import tracemalloc
+
+import pytest
+
+from skeleton.profiling import RunProfiler
+
+
+def busy_work():
+    """Allocate and compute something worth profiling."""
+    data = [str(i) * 10 for i in range(20000)]
+    return sum(len(item) for item in data)
+
+
+class TestRunProfiler:
+    """Test cases for RunProfiler class."""
+    
+    def test_invalid_mode(self, tmp_path):
+        """Test unknown modes are rejected."""
+        with pytest.raises(ValueError, match="Invalid profile mode"):
+            RunProfiler("gpu", tmp_path)
+    
+    def test_cpu_mode(self, tmp_path):
+        """Test CPU profiling writes a loadable pstats file."""
+        with RunProfiler("cpu", tmp_path) as profiler:
+            busy_work()
+        
+        assert profiler.stats_path.exists()
+        assert profiler.allocations_path is None
+        stats = pstats.Stats(str(profiler.stats_path))
+        assert any(func[2] == "busy_work" for func in stats.stats)
+        assert "busy_work" in profiler.summary()
+    
+    def test_mem_mode(self, tmp_path):
+        """Test memory profiling writes an allocation report."""
+        with RunProfiler("mem", tmp_path, top_n=5) as profiler:
+            busy_work()
+        
+        assert profiler.stats_path is None
+        report = profiler.allocations_path.read_text()
+        assert report.startswith("Top 5 allocation sites")
+        assert not tracemalloc.is_tracing()
+        assert "Allocation report" in profiler.summary()
+    
+    def test_both_mode(self, tmp_path):
+        """Test both reports are written."""
+        with RunProfiler("both", tmp_path) as profiler:
+            busy_work()
+        
+        assert profiler.stats_path.exists()
+        assert profiler.allocations_path.exists()
+    
+    def test_reports_written_on_exception(self, tmp_path):
+        """Test reports are still written when the block fails."""
+        with pytest.raises(RuntimeError):
+            with RunProfiler("cpu", tmp_path) as profiler:
+                raise RuntimeError("boom")
+        
+        assert profiler.stats_path.exists()
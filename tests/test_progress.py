@@ -0,0 +1,176 @@
+"""
+Tests for the progress module.
+"""
+
+import io
+import logging
+
+import pytest
+
+from skeleton.progress import (
+    Progress,
+    ProgressReporter,
+    TerminalProgressLine,
+    format_progress,
+)
+
+
+class TestProgress:
+    """Test cases for Progress class."""
+    
+    def test_fraction_and_remaining(self):
+        """Test derived values with a known total."""
+        progress = Progress(done=25, total=100, rate=5.0, elapsed=5.0)
+        
+        assert progress.fraction == 0.25
+        assert progress.remaining == 15.0
+    
+    def test_unknown_total(self):
+        """Test derived values without a total."""
+        progress = Progress(done=25, total=None, rate=5.0, elapsed=5.0)
+        
+        assert progress.fraction is None
+        assert progress.remaining is None
+
+
+class TestProgressReporter:
+    """Test cases for ProgressReporter class."""
+    
+    def test_updates_coalesced(self, clock):
+        """Test at most one report per interval is made."""
+        reports = []
+        reporter = ProgressReporter(reports.append, interval=0.1)
+        
+        for done in range(1, 50):
+            reporter.update(done, 100)
+        clock.now += 0.1
+        reporter.update(50, 100)
+        
+        assert [report.done for report in reports] == [50]
+        assert reports[0].rate == pytest.approx(500.0)
+        assert reports[0].elapsed == pytest.approx(0.1)
+    
+    def test_total_always_reported(self, clock):
+        """Test reaching the total is reported right away."""
+        reports = []
+        reporter = ProgressReporter(reports.append, interval=10)
+        
+        reporter.update(10, 10)
+        
+        assert [(report.done, report.total) for report in reports] == [(10, 10)]
+    
+    def test_finish_reports_held_back_values(self, clock):
+        """Test finish() reports the last update, once."""
+        reports = []
+        reporter = ProgressReporter(reports.append, interval=10)
+        reporter.update(3)
+        
+        reporter.finish()
+        reporter.finish()
+        
+        assert [report.done for report in reports] == [3]
+    
+    def test_rate_smoothed(self, clock):
+        """Test the rate follows changes gradually."""
+        reports = []
+        reporter = ProgressReporter(reports.append, interval=1)
+        clock.now += 1
+        reporter.update(100)
+        clock.now += 1
+        reporter.update(100)
+        
+        assert reports[0].rate == pytest.approx(100.0)
+        assert reports[1].rate == pytest.approx(70.0)
+    
+    def test_reset(self, clock):
+        """Test reset() starts a new measurement."""
+        reports = []
+        reporter = ProgressReporter(reports.append, interval=1)
+        clock.now += 1
+        reporter.update(100)
+        reporter.reset()
+        clock.now += 2
+        reporter.update(10)
+        
+        assert reports[-1].rate == pytest.approx(5.0)
+        assert reports[-1].elapsed == pytest.approx(2.0)
+    
+    def test_invalid_interval(self):
+        """Test a negative interval is rejected."""
+        with pytest.raises(ValueError, match="Invalid progress interval"):
+            ProgressReporter(print, interval=-1)
+
+
+class TestFormatProgress:
+    """Test cases for format_progress function."""
+    
+    def test_with_total(self):
+        """Test a bar, counts, rate and remaining time are shown."""
+        line = format_progress(Progress(50, 100, 25.0, 2.0), width=10)
+        
+        assert line == "[#####.....]  50/100  25.0/s  ETA 2s"
+    
+    def test_without_bar(self):
+        """Test width 0 leaves out the bar."""
+        assert format_progress(Progress(50, 100, 25.0, 2.0), width=0) == (
+            "50/100  25.0/s  ETA 2s"
+        )
+    
+    def test_without_total(self):
+        """Test only the count and rate are shown without a total."""
+        assert format_progress(Progress(7, None, 1.5, 2.0)) == "7  1.5/s"
+
+
+class FakeTerminal(io.StringIO):
+    """StringIO claiming to be a terminal."""
+    
+    def isatty(self):
+        return True
+
+
+class TestTerminalProgressLine:
+    """Test cases for TerminalProgressLine class."""
+    
+    def test_redraws_one_line(self):
+        """Test each report overwrites the previous one."""
+        stream = FakeTerminal()
+        line = TerminalProgressLine(stream, width=4)
+        
+        line(Progress(2, 4, 1.0, 1.0))
+        line(Progress(10, None, 1.0, 1.0))
+        line.close()
+        
+        assert stream.getvalue() == (
+            "\r[##..]  2/4  1.0/s  ETA 2s"
+            "\r10  1.0/s                 "
+            "\r" + " " * 9 + "\r"
+        )
+    
+    def test_cleared_before_log_lines(self):
+        """Test log lines on the same terminal start on a clean line."""
+        stream = FakeTerminal()
+        line = TerminalProgressLine(stream, width=4)
+        handler = logging.StreamHandler(stream)
+        handler.addFilter(line)
+        
+        line(Progress(2, 4, 1.0, 1.0))
+        handler.handle(logging.makeLogRecord({"msg": "hello"}))
+        line(Progress(3, 4, 1.0, 1.0))
+        
+        assert stream.getvalue() == (
+            "\r[##..]  2/4  1.0/s  ETA 2s"
+            "\r" + " " * 26 + "\r"
+            "hello\n"
+            "\r[###.]  3/4  1.0/s  ETA 1s"
+        )
+    
+    def test_silent_when_not_a_terminal(self):
+        """Test nothing is written to redirected output."""
+        stream = io.StringIO()
+        line = TerminalProgressLine(stream)
+        
+        line(Progress(1, 2, 1.0, 1.0))
+        line.close()
+        
+        assert line.enabled is False
+        assert stream.getvalue() == ""
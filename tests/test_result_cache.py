@@ -0,0 +1,146 @@
+"""
+Tests for the result_cache module.
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+from skeleton.result_cache import ResultCache, make_cache_key
+
+
+class TestMakeCacheKey:
+    """Test cases for make_cache_key function."""
+    
+    def test_key_ignores_insertion_order(self):
+        """Test equal configs produce equal keys."""
+        a = make_cache_key("App", {"x": 1, "y": [1, 2]})
+        b = make_cache_key("App", {"y": [1, 2], "x": 1})
+        
+        assert a == b
+    
+    def test_key_depends_on_namespace_and_values(self):
+        """Test differing namespaces or values produce different keys."""
+        base = make_cache_key("App", {"x": 1})
+        
+        assert make_cache_key("Other", {"x": 1}) != base
+        assert make_cache_key("App", {"x": 2}) != base
+
+
+class TestResultCache:
+    """Test cases for ResultCache class."""
+    
+    def test_miss_then_hit(self, tmp_path):
+        """Test a stored value is found again."""
+        cache = ResultCache(directory=tmp_path)
+        
+        assert cache.get("k") == (False, None)
+        cache.put("k", {"answer": 42})
+        
+        assert cache.get("k") == (True, {"answer": 42})
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Test values persist on disk across cache instances."""
+        ResultCache(directory=tmp_path).put("k", "value")
+        
+        cache = ResultCache(directory=tmp_path)
+        
+        assert cache.get("k") == (True, "value")
+        assert cache.stats()["disk_hits"] == 1
+        assert cache.get("k") == (True, "value")
+        assert cache.stats()["memory_hits"] == 1
+    
+    def test_memory_lru_bound(self, tmp_path):
+        """Test the memory tier keeps at most max_entries."""
+        cache = ResultCache(directory=tmp_path, max_entries=2)
+        for key in "abc":
+            cache.put(key, key)
+        
+        assert cache.stats()["memory_entries"] == 2
+        # Evicted from memory but still served from disk
+        assert cache.get("a") == (True, "a")
+        assert cache.stats()["disk_hits"] == 1
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Test expired entries are misses in both tiers."""
+        cache = ResultCache(directory=tmp_path, ttl=60)
+        cache.put("k", "value")
+        
+        old = time.time() - 120
+        os.utime(tmp_path / "k.pickle", (old, old))
+        with cache._lock:
+            cache._memory["k"] = (old, "value")
+        
+        assert cache.get("k") == (False, None)
+        assert not (tmp_path / "k.pickle").exists()
+    
+    def test_disk_hit_keeps_age(self, tmp_path):
+        """Test an entry read from disk still expires at its write time + ttl."""
+        ResultCache(directory=tmp_path).put("k", "value")
+        written = time.time() - 50
+        os.utime(tmp_path / "k.pickle", (written, written))
+        cache = ResultCache(directory=tmp_path, ttl=60)
+        
+        assert cache.get("k") == (True, "value")
+        with patch("time.time", return_value=written + 61):
+            assert cache.get("k") == (False, None)
+    
+    def test_max_bytes_eviction(self, tmp_path):
+        """Test the disk tier evicts least recently used entries."""
+        cache = ResultCache(directory=tmp_path, max_bytes=3500)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.put(key, b"x" * 1000)
+            stamp = time.time() - 100 + i
+            os.utime(tmp_path / f"{key}.pickle", (stamp, stamp))
+        
+        cache.put("d", b"x" * 1000)
+        
+        assert not (tmp_path / "a.pickle").exists()
+        assert (tmp_path / "d.pickle").exists()
+        assert cache.stats()["evictions"] == 1
+    
+    def test_hits_do_not_share_values(self, tmp_path):
+        """Test changing a returned value does not change the cache."""
+        cache = ResultCache(directory=tmp_path)
+        cache.put("k", {"items": [1]})
+        
+        cache.get("k")[1]["items"].append(2)
+        
+        assert cache.get("k") == (True, {"items": [1]})
+        assert cache.stats()["memory_hits"] == 2
+    
+    def test_overwrite_counted_once(self, tmp_path):
+        """Test replacing an entry does not grow the disk tier size."""
+        cache = ResultCache(directory=tmp_path)
+        cache.put("first", "value")
+        
+        cache.put("k", b"x" * 1000)
+        cache.put("k", b"y" * 1000)
+        
+        assert cache._disk_bytes == sum(
+            path.stat().st_size for path in tmp_path.glob("*.pickle")
+        )
+    
+    def test_unpicklable_value_kept_in_memory(self, tmp_path):
+        """Test values that cannot be pickled are cached in memory only."""
+        cache = ResultCache(directory=tmp_path)
+        value = lambda: None
+        
+        cache.put("k", value)
+        
+        assert cache.get("k") == (True, value)
+        assert not (tmp_path / "k.pickle").exists()
+    
+    def test_clear(self, tmp_path):
+        """Test clearing both tiers."""
+        cache = ResultCache(directory=tmp_path)
+        cache.put("k", "value")
+        
+        cache.clear()
+        
+        assert cache.get("k") == (False, None)
+        assert list(tmp_path.glob("*.pickle")) == []
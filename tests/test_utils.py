@@ -2,18 +2,30 @@
 Tests for the utils module.
 """
 
+import io
+import json
 import logging
+import queue
 import sys
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
 import pytest
 
+from skeleton.flight_recorder import read_flight_records
+from skeleton.log_limits import gate_log_calls
+from skeleton.log_rotation import RotatingLogHandler
 from skeleton.utils import (
+    BoundedQueueHandler,
+    JsonFormatter,
     get_version,
+    log_context,
     setup_logging,
     get_app_data_dir,
     get_config_dir,
+    get_console_handlers,
+    stop_logging_listener,
+    write_atomic,
 )
 
 
@@ -47,6 +59,58 @@ class TestSetupLogging:
             
             assert kwargs['level'] == logging.DEBUG
     
+    def test_setup_logging_rotation(self, tmp_path):
+        """Test a size or age limit selects the rotating file handler."""
+        log_file = tmp_path / "app.log"
+        try:
+            setup_logging(log_file=log_file, max_bytes=1000, backup_count=3)
+            handler = logging.getLogger().handlers[1]
+        finally:
+            for handler_ in logging.getLogger().handlers:
+                handler_.close()
+            logging.getLogger().handlers.clear()
+        
+        assert isinstance(handler, RotatingLogHandler)
+        assert handler.max_bytes == 1000
+        assert handler.backup_count == 3
+    
+    def test_setup_logging_rate_limit(self):
+        """Test sampling is applied to records from child loggers."""
+        stream = io.StringIO()
+        try:
+            setup_logging(stream=stream, sample_every=2, format_string="%(message)s")
+            logger = logging.getLogger("skeleton.test.loop")
+            for i in range(4):
+                logger.info("tick %d", i)
+        finally:
+            gate_log_calls(None)
+            logging.getLogger().handlers.clear()
+        
+        assert stream.getvalue().splitlines() == [
+            "tick 0", "tick 2 (1 similar messages suppressed)",
+        ]
+    
+    def test_setup_logging_flight_recorder(self, tmp_path):
+        """Test the flight recorder keeps DEBUG records the console hides."""
+        stream = io.StringIO()
+        path = tmp_path / "flight-recorder.bin"
+        try:
+            setup_logging(
+                level="WARNING", stream=stream, format_string="%(message)s",
+                flight_recorder=path, flight_records=16,
+            )
+            logger = logging.getLogger("skeleton.test.flight")
+            logger.debug("details")
+            logger.warning("problem")
+        finally:
+            for handler in logging.getLogger().handlers:
+                handler.close()
+            logging.getLogger().handlers.clear()
+            logging.getLogger().setLevel(logging.WARNING)
+        
+        assert stream.getvalue() == "problem\n"
+        assert [r.message for r in read_flight_records(path)] == ["details", "problem"]
+    
     def test_setup_logging_invalid_level(self):
         """Test logging setup with invalid level."""
         with pytest.raises(ValueError, match="Invalid log level"):
@@ -68,6 +132,248 @@ class TestSetupLogging:
             mock_file_handler.assert_called_once_with(log_file)
 
 
+class TestAsyncLogging:
+    """Test cases for queued logging."""
+    
+    @pytest.fixture(autouse=True)
+    def reset_logging(self):
+        yield
+        stop_logging_listener()
+        logging.getLogger().handlers.clear()
+    
+    def test_records_written_by_listener(self):
+        """Test queued records are formatted once and flushed on stop."""
+        stream = io.StringIO()
+        setup_logging(
+            stream=stream,
+            async_mode=True,
+            format_string="%(levelname)s:%(message)s",
+        )
+        
+        root = logging.getLogger()
+        assert isinstance(root.handlers[0], BoundedQueueHandler)
+        logging.getLogger("test").info("hello %s", "world")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("test").exception("failed")
+        stop_logging_listener()
+        
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "INFO:hello world"
+        assert lines[1] == "ERROR:failed"
+        assert stream.getvalue().count("ValueError: boom") == 1
+    
+    def test_handler_levels_respected(self):
+        """Test the log level still applies behind the queue."""
+        stream = io.StringIO()
+        setup_logging(level="WARNING", stream=stream, async_mode=True)
+        
+        logging.getLogger("test").info("hidden")
+        logging.getLogger("test").warning("shown")
+        stop_logging_listener()
+        
+        assert "hidden" not in stream.getvalue()
+        assert "shown" in stream.getvalue()
+    
+    def test_drop_policy(self):
+        """Test a full queue drops records without blocking."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), overflow="drop")
+        record = logging.makeLogRecord({"msg": "x"})
+        
+        handler.enqueue(record)
+        handler.enqueue(record)
+        handler.enqueue(record)
+        
+        assert handler.dropped == 2
+    
+    def test_block_policy(self):
+        """Test a full queue makes the caller wait for room."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), overflow="block")
+        handler.enqueue(logging.makeLogRecord({"msg": "x"}))
+        
+        with patch.object(handler.queue, "put") as mock_put:
+            handler.enqueue(logging.makeLogRecord({"msg": "y"}))
+        
+        mock_put.assert_called_once()
+        assert handler.dropped == 0
+    
+    def test_dropped_records_reported(self):
+        """Test the number of dropped records is logged on stop."""
+        stream = io.StringIO()
+        setup_logging(stream=stream, async_mode=True, overflow="drop")
+        handler = logging.getLogger().handlers[0]
+        handler.dropped = 5
+        
+        stop_logging_listener()
+        
+        assert "Dropped 5 log records" in stream.getvalue()
+    
+    def test_context_kept_across_queue(self):
+        """Test context fields survive formatting on the listener thread."""
+        stream = io.StringIO()
+        setup_logging(stream=stream, fmt="json", async_mode=True)
+        
+        with log_context(run_id=3):
+            logging.getLogger("test").info("queued")
+        stop_logging_listener()
+        
+        assert json.loads(stream.getvalue())["run_id"] == 3
+    
+    def test_stop_closes_handlers(self, tmp_path):
+        """Test stopping the listener closes files and rotation threads."""
+        setup_logging(
+            stream=io.StringIO(),
+            log_file=tmp_path / "app.log",
+            max_bytes=1024,
+            async_mode=True,
+        )
+        logging.getLogger("test").info("written")
+        with patch.object(
+            RotatingLogHandler, "close", autospec=True,
+            side_effect=RotatingLogHandler.close,
+        ) as mock_close:
+            setup_logging(stream=io.StringIO(), async_mode=True)
+        
+        mock_close.assert_called_once()
+        file_handler = mock_close.call_args[0][0]
+        assert file_handler.stream is None
+        assert not file_handler._worker.is_alive()
+        assert "written" in (tmp_path / "app.log").read_text()
+    
+    def test_console_handlers(self, tmp_path):
+        """Test the console handlers are found behind the queue."""
+        stream = io.StringIO()
+        setup_logging(stream=stream, log_file=tmp_path / "app.log")
+        sync_handlers = get_console_handlers()
+        setup_logging(stream=stream, log_file=tmp_path / "app.log", async_mode=True)
+        async_handlers = get_console_handlers()
+        
+        for handlers in (sync_handlers, async_handlers):
+            assert len(handlers) == 1
+            assert handlers[0].stream is stream
+        assert async_handlers[0] not in logging.getLogger().handlers
+    
+    def test_json_matches_sync_logging(self):
+        """Test async JSON records keep the same fields as sync ones."""
+        def log_failure(async_mode):
+            stream = io.StringIO()
+            setup_logging(stream=stream, fmt="json", async_mode=async_mode)
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logging.getLogger("test").exception("failed %d", 1)
+            stop_logging_listener()
+            record = json.loads(stream.getvalue())
+            del record["ts"]
+            return record
+        
+        sync_record = log_failure(False)
+        async_record = log_failure(True)
+        
+        assert async_record == sync_record
+        assert async_record["message"] == "failed 1"
+        assert "ValueError: boom" in async_record["exc_info"]
+    
+    def test_invalid_options(self):
+        """Test invalid queue settings are rejected."""
+        with pytest.raises(ValueError, match="Invalid log overflow policy"):
+            setup_logging(async_mode=True, overflow="spill")
+        with pytest.raises(ValueError, match="Invalid log queue size"):
+            setup_logging(async_mode=True, queue_size=0)
+
+
+class TestJsonFormatter:
+    """Test cases for JsonFormatter class."""
+    
+    def test_format(self, make_record):
+        """Test records become one JSON object with the standard fields."""
+        record = make_record()
+        
+        line = JsonFormatter({"host": "h1"}).format(record)
+        
+        assert "\n" not in line
+        assert json.loads(line) == {
+            "ts": round(record.created, 3),
+            "level": "INFO",
+            "logger": "skeleton.test",
+            "message": "hello world",
+            "host": "h1",
+        }
+    
+    def test_escaping_and_exceptions(self, make_record):
+        """Test special characters and tracebacks stay valid JSON."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record('quote " and\nnewline', (), sys.exc_info())
+        
+        data = json.loads(JsonFormatter().format(record))
+        
+        assert data["message"] == 'quote " and\nnewline'
+        assert "ValueError: boom" in data["exc_info"]
+    
+    def test_log_context(self, make_record):
+        """Test context fields apply inside their block and nest."""
+        formatter = JsonFormatter()
+        
+        with log_context(run_id=1, app="A"):
+            with log_context(step="load"):
+                inner = json.loads(formatter.format(make_record()))
+            outer = json.loads(formatter.format(make_record()))
+        after = json.loads(formatter.format(make_record()))
+        
+        assert inner["run_id"] == 1 and inner["step"] == "load"
+        assert outer["app"] == "A" and "step" not in outer
+        assert "run_id" not in after
+    
+    def test_setup_logging_json(self):
+        """Test the json format is used for console output."""
+        stream = io.StringIO()
+        try:
+            setup_logging(stream=stream, fmt="json", static_fields={"host": "h"})
+            with log_context(run_id=7):
+                logging.getLogger("skeleton.test").info("ready")
+        finally:
+            logging.getLogger().handlers.clear()
+        
+        data = json.loads(stream.getvalue())
+        assert data["message"] == "ready"
+        assert data["run_id"] == 7
+        assert data["host"] == "h"
+    
+    def test_invalid_format(self):
+        """Test unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Invalid log format"):
+            setup_logging(fmt="xml")
+
+
+class TestWriteAtomic:
+    """Test cases for write_atomic function."""
+    
+    def test_replaces_file(self, tmp_path):
+        """Test the file is replaced and no temporary file is left."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"old")
+        
+        write_atomic(path, b"new")
+        
+        assert path.read_bytes() == b"new"
+        assert list(tmp_path.iterdir()) == [path]
+    
+    def test_failure_keeps_old_contents(self, tmp_path):
+        """Test a failed write leaves the file and no temporary file."""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"old")
+        
+        with patch("os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                write_atomic(path, b"new")
+        
+        assert path.read_bytes() == b"old"
+        assert list(tmp_path.iterdir()) == [path]
+
+
 class TestDirectoryFunctions:
     """Test cases for directory utility functions."""
     